@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for md_to_docx.py.
+
+Generates synthetic AVATAR-style specs (numbered ## sections, feature tables,
+generic 2-7 column tables, callouts, JSON code blocks), then times parse,
+build and save separately and records peak RSS and tracemalloc peaks. Each
+case runs in a fresh worker process so peaks are not polluted by earlier cases.
+
+Results are appended to a JSON history file; a case that got slower than the
+last comparable run (same parameters, backend, --repeat, Python and platform)
+by more than --max-slowdown makes the run exit non-zero.
+
+Usage:
+    python scripts/bench_md_to_docx.py                      # small/medium/large
+    python scripts/bench_md_to_docx.py --case large --repeat 5
+    python scripts/bench_md_to_docx.py --sections 30 --feature-rows 500
+    python scripts/bench_md_to_docx.py --backend stream --max-slowdown 1.2
+    python scripts/bench_md_to_docx.py --table-scaling      # 1k..10k-row tables
+"""
+
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import md_to_docx
+
+DEFAULT_HISTORY = md_to_docx.BASE_DIR / ".cache/md_to_docx_bench.json"
+
+# name -> generator parameters
+CASES = {
+    "small": dict(sections=6, feature_rows=10, generic_tables=1, generic_rows=5,
+                  callouts=1, code_blocks=1),
+    "medium": dict(sections=12, feature_rows=40, generic_tables=2, generic_rows=12,
+                   callouts=2, code_blocks=1),
+    "large": dict(sections=24, feature_rows=200, generic_tables=4, generic_rows=40,
+                  callouts=3, code_blocks=2),
+}
+
+# Table-scaling series: one feature and one generic table of N rows each
+TABLE_SCALING_ROWS = (1000, 2500, 5000, 10000)
+
+# ===== Synthetic spec generator =============================================
+
+_PHASES = ("Phase 1", "Phase 2", "Phase 3")
+_PRIORITIES = ("P0", "P0", "P1", "P2")
+_LEVELS = ("높음", "중간", "낮음")
+_WORDS = (
+    "워크로드", "승인", "리소스", "할당",
+    "테스트", "스케줄러", "GPU", "App", "Task", "Component",
+    "파라미터", "대기열", "우선순위",
+    "모델", "저장소", "관리자", "사용자",
+)
+_CALLOUTS = (
+    "### 핵심 개념",
+    "### 운영 범위",
+    "### RL 학습 파라미터",
+    "#### 프로세스 개요",
+)
+
+
+def _sentence(rng, n_words):
+    words = " ".join(rng.choice(_WORDS) for _ in range(n_words))
+    return f"{words}를 처리한다."
+
+
+def _table(header, rows):
+    lines = ["| " + " | ".join(header) + " |", "|" + "|".join("---" for _ in header) + "|"]
+    lines.extend("| " + " | ".join(r) + " |" for r in rows)
+    return "\n".join(lines)
+
+
+def generate_spec(sections=12, feature_rows=40, generic_tables=2, generic_rows=12,
+                  callouts=2, code_blocks=1, seed=0):
+    """Return synthetic spec markdown with the layout of the AVATAR OnE specs."""
+    rng = random.Random(seed)
+    out = [
+        "# AVATAR OnE 플랫폼 기능 명세서",
+        "",
+        _table(["항목", "내용"], [["버전", "9.9"],
+                                                  ["대상", "벤치마크"]]),
+        "",
+        "---",
+        "",
+        "## 1. 전체 워크플로우",
+        "",
+        _sentence(rng, 8),
+        "",
+        _table(["단계", "이름", "설명"],
+               [[str(i), f"단계 {i}", _sentence(rng, 12)] for i in range(1, 7)]),
+        "",
+    ]
+    for sec in range(2, sections + 1):
+        prefix = f"S{sec:02d}"
+        out += ["---", "", f"## {sec}. 섹션 {sec}", ""]
+        for ci in range(callouts):
+            out += [_CALLOUTS[(sec + ci) % len(_CALLOUTS)], "",
+                    f"{_sentence(rng, 10)} **{rng.choice(_WORDS)}** {_sentence(rng, 6)}",
+                    f"- **{rng.choice(_WORDS)}**: {_sentence(rng, 8)}",
+                    f"- {_sentence(rng, 6)}", ""]
+        out += [f"### {sec}.1 기능 명세", "",
+                _table(["ID", "기능명", "설명", "우선순위",
+                        "구현 단계"],
+                       [[f"{prefix}-{r + 1:03d}", f"{rng.choice(_WORDS)} {rng.choice(_WORDS)}",
+                         _sentence(rng, rng.randint(6, 30)), rng.choice(_PRIORITIES),
+                         rng.choice(_PHASES)] for r in range(feature_rows)]),
+                ""]
+        for ti in range(generic_tables):
+            ncols = 2 + (sec + ti) % 6  # 2..7 columns
+            header = [f"항목{c + 1}" for c in range(ncols)]
+            rows = [[rng.choice(_LEVELS) if c == ncols - 1 else _sentence(rng, rng.randint(1, 8))
+                     for c in range(ncols)] for _ in range(generic_rows)]
+            out += [f"### {sec}.{ti + 2} 구성 (예시)", "", _table(header, rows), ""]
+        for ki in range(code_blocks):
+            payload = {"app_id": f"{prefix}-{ki}",
+                       "tasks": [{"id": f"t{t}", "gpu": rng.randint(1, 8),
+                                  "components": [f"c{c}" for c in range(4)]} for t in range(5)]}
+            out += ["```json", json.dumps(payload, indent=2, ensure_ascii=False), "```", ""]
+    return "\n".join(out)
+
+
+# ===== Measurement ==========================================================
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def _run_phases(md_text, backend):
+    """Parse, build and save once. Returns per-phase seconds and output size."""
+    t0 = time.perf_counter()
+    blocks = md_to_docx._parse_markdown(md_text)
+    t1 = time.perf_counter()
+    out = io.BytesIO()
+    if backend == "stream":
+        # Build and save are interleaved in the streaming backend
+        md_to_docx._build_streaming(md_text, out, blocks=blocks)
+        t2 = t3 = time.perf_counter()
+    else:
+        doc = md_to_docx._build_document(md_text, blocks=blocks)
+        t2 = time.perf_counter()
+        md_to_docx._save_document(doc, out)
+        t3 = time.perf_counter()
+    return {"parse": t1 - t0, "build": t2 - t1, "save": t3 - t2,
+            "blocks": len(blocks), "docx_bytes": out.tell()}
+
+
+def _bench_case(name, params, repeat, backend):
+    """Worker entry point: benchmark one case in this (fresh) process."""
+    md_text = generate_spec(**params)
+    rss_before = _peak_rss_kb()
+
+    runs = [_run_phases(md_text, backend) for _ in range(repeat)]
+    # Before tracemalloc, whose own bookkeeping would raise the peak
+    peak_rss = _peak_rss_kb()
+
+    # Separate pass for allocation peaks; tracemalloc skews timings
+    tracemalloc_peaks = {}
+    tracemalloc.start()
+    blocks = md_to_docx._parse_markdown(md_text)
+    tracemalloc_peaks["parse"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    if backend == "stream":
+        md_to_docx._build_streaming(md_text, io.BytesIO(), blocks=blocks)
+        tracemalloc_peaks["build"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc_peaks["save"] = 0
+    else:
+        doc = md_to_docx._build_document(md_text, blocks=blocks)
+        tracemalloc_peaks["build"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        md_to_docx._save_document(doc, io.BytesIO())
+        tracemalloc_peaks["save"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        "case": name,
+        "backend": backend,
+        "params": params,
+        "md_bytes": len(md_text.encode("utf-8")),
+        "blocks": runs[0]["blocks"],
+        "docx_bytes": runs[0]["docx_bytes"],
+        "repeat": repeat,
+        "peak_rss_kb": peak_rss,
+        "rss_before_kb": rss_before,
+        "tracemalloc_peak_kb": {k: v // 1024 for k, v in tracemalloc_peaks.items()},
+    }
+    for phase in ("parse", "build", "save"):
+        times = [r[phase] for r in runs]
+        result[f"{phase}_s"] = min(times)
+        result[f"{phase}_median_s"] = statistics.median(times)
+    result["total_s"] = result["parse_s"] + result["build_s"] + result["save_s"]
+    return result
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=md_to_docx.BASE_DIR,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def _load_history(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+
+
+def _previous_result(history, res):
+    """
+    The latest recorded result comparable to ``res``: same case, parameters,
+    backend and --repeat, measured on the same Python and platform.
+    """
+    python, system = platform.python_version(), platform.platform()
+    for entry in reversed(history):
+        if entry.get("python") != python or entry.get("platform") != system:
+            continue
+        for prev in entry["results"]:
+            if all(prev.get(k) == res[k] for k in ("case", "params", "backend", "repeat")):
+                return prev
+    return None
+
+
+# ===== Entry point ==========================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark md_to_docx.py on synthetic specs.")
+    parser.add_argument("--case", action="append", choices=sorted(CASES),
+                        help="predefined case to run (repeatable; default: all)")
+    parser.add_argument("--table-scaling", action="store_true",
+                        help="run the table-scaling series (%s rows) instead of the presets"
+                             % "/".join(map(str, TABLE_SCALING_ROWS)))
+    parser.add_argument("--sections", type=int, help="custom case: number of ## sections")
+    parser.add_argument("--feature-rows", type=int, default=40,
+                        help="custom case: rows per feature table (default: %(default)s)")
+    parser.add_argument("--generic-tables", type=int, default=2,
+                        help="custom case: generic tables per section (default: %(default)s)")
+    parser.add_argument("--generic-rows", type=int, default=12,
+                        help="custom case: rows per generic table (default: %(default)s)")
+    parser.add_argument("--callouts", type=int, default=2,
+                        help="custom case: callouts per section (default: %(default)s)")
+    parser.add_argument("--code-blocks", type=int, default=1,
+                        help="custom case: code blocks per section (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per case; the fastest is recorded (default: %(default)s)")
+    parser.add_argument("--backend", choices=("docx", "stream"), default="docx")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY,
+                        help="JSON history file to append to (default: %(default)s)")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="fail if a case's total time exceeds the last comparable run "
+                             "by this factor (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if args.table_scaling:
+        cases = {f"table-{n}": dict(sections=2, feature_rows=n, generic_tables=1, generic_rows=n,
+                                    callouts=0, code_blocks=0)
+                 for n in TABLE_SCALING_ROWS}
+    elif args.sections is not None:
+        cases = {"custom": dict(sections=args.sections, feature_rows=args.feature_rows,
+                                generic_tables=args.generic_tables,
+                                generic_rows=args.generic_rows, callouts=args.callouts,
+                                code_blocks=args.code_blocks)}
+    else:
+        cases = {name: CASES[name] for name in (args.case or CASES)}
+
+    history = _load_history(args.history)
+    results = []
+    regressions = []
+    print(f"{'case':<12} {'blocks':>7} {'parse':>8} {'build':>8} {'save':>8} {'total':>8} "
+          f"{'rss MB':>8} {'docx KB':>8}")
+    for name, params in cases.items():
+        # One fresh process per case so peak RSS belongs to that case alone
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            res = pool.submit(_bench_case, name, params, args.repeat, args.backend).result()
+        results.append(res)
+        rss = f"{res['peak_rss_kb'] / 1024:.1f}" if res["peak_rss_kb"] is not None else "-"
+        print(f"{name:<12} {res['blocks']:>7} {res['parse_s']:>8.3f} {res['build_s']:>8.3f} "
+              f"{res['save_s']:>8.3f} {res['total_s']:>8.3f} {rss:>8} "
+              f"{res['docx_bytes'] / 1024:>8.1f}")
+
+        prev = _previous_result(history, res)
+        if prev is not None:
+            ratio = res["total_s"] / prev["total_s"] if prev["total_s"] else 1.0
+            if ratio > args.max_slowdown:
+                regressions.append((name, prev["total_s"], res["total_s"], ratio))
+
+    if args.table_scaling:
+        # Linear scaling keeps build time per table row flat across the series
+        per_row = [res["build_s"] / (2 * res["params"]["feature_rows"]) for res in results]
+        print("build per row (us): " + ", ".join(f"{t * 1e6:.1f}" for t in per_row)
+              + f"  (largest/smallest: {per_row[-1] / per_row[0]:.2f}x)")
+
+    if not args.no_history:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_rev": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        })
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        args.history.write_text(json.dumps(history, indent=1, ensure_ascii=False),
+                                encoding="utf-8")
+        print(f"History: {args.history}")
+
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION: {name}: {before:.3f}s -> {after:.3f}s ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    exit(main())
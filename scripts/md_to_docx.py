@@ -7,19 +7,70 @@ Replicates the exact layout/design system of the v1.2 docx file:
 - Section cards (numbered blue/light-blue 1x2 tables)
 - Feature tables with dark navy headers
 - Callout boxes (yellow/blue backgrounds)
-- JSON code block in light gray box
+- Code blocks in light gray boxes (JSON/YAML/shell highlighting)
 - Footer page numbers
+
+Usage:
+    python scripts/md_to_docx.py                       # v1.5 spec (default)
+    python scripts/md_to_docx.py docs/ -j 8            # every docs/*.md in parallel
+    python scripts/md_to_docx.py "docs/*_v*.md" -o out/
+    python scripts/md_to_docx.py big_spec.md --section-jobs 8
+    python scripts/md_to_docx.py docs/ --check             # structure only, fast
+    python scripts/md_to_docx.py lint --strict             # + feature IDs, for pre-commit
+    python scripts/md_to_docx.py docs/ --rules rules.json  # custom callouts / widths
+    python scripts/md_to_docx.py diff docs/*_v1_5.md docs/*_v1_6.md -o /tmp/changes.md
+    python scripts/md_to_docx.py index && python scripts/md_to_docx.py search 우선순위
+    python scripts/md_to_docx.py features --changed phase --from 1.4 --to 1.6 --priority P0
+    python scripts/md_to_docx.py features --count-by priority --export features.xlsx
+    python scripts/md_to_docx.py docs/ --watch             # rebuild on every save
+    python scripts/md_to_docx.py serve --port 8765 -j 4    # POST markdown to /render
+    python scripts/md_to_docx.py docs/ --export-ir public/spec  # + JSON for the demo app
+    python scripts/md_to_docx.py --profile profile.json --profile-tracemalloc
+
+Fenced blocks written as ```json include=apps/app_spec.json render that file
+(relative to the markdown file) instead of a pasted copy.
+
+As a library, convert(md_text, cover={"metadata": {"버전": "1.6"}}) returns
+the .docx as bytes (or writes it to a file object) without touching disk.
 """
 
+import argparse
+import collections
+import contextlib
+import functools
+import glob
+import hashlib
+import io
+import json
+import os
 import re
+import sys
+import threading
+import time
+from copy import deepcopy
 from pathlib import Path
 
-from docx import Document
-from docx.shared import Pt, Emu, RGBColor, Twips
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_TABLE_ALIGNMENT
-from docx.oxml.ns import qn
-from docx.oxml import OxmlElement
+
+@functools.lru_cache(maxsize=None)
+def _import_docx():
+    """
+    Import python-docx and lxml into module globals on first use.
+    Parse-only paths (``--check``) never call this and so start fast.
+    """
+    global docx, Document, Pt, Emu, RGBColor, Twips, WD_STYLE_TYPE, WD_ALIGN_PARAGRAPH
+    global WD_TABLE_ALIGNMENT, nsdecls, qn, OxmlElement, parse_xml, Paragraph, Run, etree
+    import docx
+    from docx import Document
+    from docx.shared import Pt, Emu, RGBColor, Twips
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.table import WD_TABLE_ALIGNMENT
+    from docx.oxml.ns import nsdecls, qn
+    from docx.oxml import OxmlElement, parse_xml
+    from docx.text.paragraph import Paragraph
+    from docx.text.run import Run
+    from lxml import etree
+
 
 # ---------------------------------------------------------------------------
 # Color palette (v1.2 design system)
@@ -34,94 +85,115 @@ CLR_WHITE = "FFFFFF"
 CLR_LIGHT_BLUE = "EAF2F8"
 CLR_LIGHT_YELLOW = "FEF5E7"
 CLR_VERY_LIGHT_GRAY = "F4F6F7"
-
-# RGB helpers
-RGB_DARK_NAVY = RGBColor(0x1A, 0x3C, 0x5E)
-RGB_MED_BLUE = RGBColor(0x28, 0x74, 0xA6)
-RGB_DARK_BLUEGRAY = RGBColor(0x2C, 0x3E, 0x50)
-RGB_RED = RGBColor(0xC0, 0x39, 0x2B)
-RGB_ORANGE = RGBColor(0xD4, 0x74, 0x0A)
-RGB_GREEN = RGBColor(0x27, 0xAE, 0x60)
-RGB_WHITE = RGBColor(0xFF, 0xFF, 0xFF)
+CLR_GRAY = "7F8C8D"
 
 # Font
 FONT_MAIN = "Arial Unicode MS"
 FONT_CODE = "Courier New"
 
+# Bump when rendering changes in a way the source digest would not capture
+# (e.g. a python-docx upgrade); invalidates every cached section fragment.
+RENDERER_VERSION = "1"
+
 
 # ===== Low-level helpers ====================================================
 
-def _set_cell_shading(cell, color_hex):
-    """Set cell background fill colour."""
-    tc_pr = cell._element.get_or_add_tcPr()
-    shd = OxmlElement("w:shd")
-    shd.set(qn("w:fill"), color_hex)
-    shd.set(qn("w:val"), "clear")
-    tc_pr.append(shd)
-
-
-def _set_cell_width(cell, width_twips):
-    """Set preferred cell width in twips."""
-    tc_pr = cell._element.get_or_add_tcPr()
-    tc_w = OxmlElement("w:tcW")
-    tc_w.set(qn("w:w"), str(width_twips))
-    tc_w.set(qn("w:type"), "dxa")
-    tc_pr.append(tc_w)
-
-
-def _set_cell_vertical_alignment(cell, val="center"):
-    tc_pr = cell._element.get_or_add_tcPr()
-    v_align = OxmlElement("w:vAlign")
-    v_align.set(qn("w:val"), val)
-    tc_pr.append(v_align)
-
-
-def _set_cell_margins(cell, top=0, bottom=0, left=80, right=80):
-    tc_pr = cell._element.get_or_add_tcPr()
-    tc_mar = OxmlElement("w:tcMar")
-    for side, val in [("top", top), ("bottom", bottom), ("start", left), ("end", right)]:
-        el = OxmlElement(f"w:{side}")
-        el.set(qn("w:w"), str(val))
+# Formatting is applied by cloning prebuilt property prototypes: each distinct
+# shd/tcW/vAlign/tcMar, cell-property sequence, rPr and pPr combination is built
+# once (with the same construction code as a direct build, so output is
+# unchanged) and deep-copied into place afterwards.
+
+@functools.lru_cache(maxsize=None)
+def _tc_prop_proto(kind, value):
+    """Prototype tcPr child: ("shd", fill) / ("tcW", twips) / ("vAlign", val) / ("tcMar", (t, b, l, r))."""
+    if kind == "shd":
+        el = OxmlElement("w:shd")
+        el.set(qn("w:fill"), value)
+        el.set(qn("w:val"), "clear")
+    elif kind == "tcW":
+        el = OxmlElement("w:tcW")
+        el.set(qn("w:w"), str(value))
         el.set(qn("w:type"), "dxa")
-        tc_mar.append(el)
-    tc_pr.append(tc_mar)
+    elif kind == "vAlign":
+        el = OxmlElement("w:vAlign")
+        el.set(qn("w:val"), value)
+    elif kind == "tcMar":
+        el = OxmlElement("w:tcMar")
+        for side, val in zip(("top", "bottom", "start", "end"), value):
+            side_el = OxmlElement(f"w:{side}")
+            side_el.set(qn("w:w"), str(val))
+            side_el.set(qn("w:type"), "dxa")
+            el.append(side_el)
+    else:
+        raise ValueError(f"unknown cell property: {kind}")
+    return el
 
 
-def _set_paragraph_spacing(para, before=None, after=None, line=None):
-    pPr = para._element.get_or_add_pPr()
-    spacing = pPr.find(qn("w:spacing"))
-    if spacing is None:
-        spacing = OxmlElement("w:spacing")
-        pPr.append(spacing)
-    if before is not None:
-        spacing.set(qn("w:before"), str(before))
-    if after is not None:
-        spacing.set(qn("w:after"), str(after))
-    if line is not None:
-        spacing.set(qn("w:line"), str(line))
-
-
-def _make_run(para, text, font_name=FONT_MAIN, size_pt=None, bold=None,
-              color_rgb=None, italic=None):
-    """Add a run with explicit formatting."""
-    run = para.add_run(text)
-    run.font.name = font_name
-    # East-Asian font fallback
-    rPr = run._element.get_or_add_rPr()
-    rFonts = rPr.find(qn("w:rFonts"))
-    if rFonts is None:
-        rFonts = OxmlElement("w:rFonts")
-        rPr.insert(0, rFonts)
-    rFonts.set(qn("w:eastAsia"), font_name)
+@functools.lru_cache(maxsize=None)
+def _cell_format(*props):
+    """
+    Prototype for a sequence of cell properties, e.g.
+    ``_cell_format(("shd", CLR_DARK_NAVY), ("tcW", 700), ("vAlign", "center"))``.
+    Apply with :func:`_apply_cell_format`; children keep the given order.
+    """
+    holder = OxmlElement("w:tcPr")
+    for kind, value in props:
+        holder.append(deepcopy(_tc_prop_proto(kind, value)))
+    return holder
 
-    if size_pt is not None:
-        run.font.size = Pt(size_pt)
+
+def _apply_cell_format(cell, fmt):
+    cell._element.get_or_add_tcPr().extend(deepcopy(fmt))
+
+
+@functools.lru_cache(maxsize=None)
+def _ppr_proto(style=None, alignment=None, before=None, after=None, line=None):
+    """Prototype pPr: paragraph style, alignment, then spacing."""
+    para = Paragraph(OxmlElement("w:p"), None)
+    if style is not None:
+        para._p.get_or_add_pPr().style = style
+    if alignment is not None:
+        para.alignment = alignment
+    if before is not None or after is not None or line is not None:
+        spacing = OxmlElement("w:spacing")
+        para._p.get_or_add_pPr().append(spacing)
+        if before is not None:
+            spacing.set(qn("w:before"), str(before))
+        if after is not None:
+            spacing.set(qn("w:after"), str(after))
+        if line is not None:
+            spacing.set(qn("w:line"), str(line))
+    return para._p.pPr
+
+
+def _set_paragraph_format(para, style=None, alignment=None, before=None, after=None,
+                          line=None):
+    """Give a paragraph without properties its style, alignment and spacing in one clone."""
+    para._p.insert(0, deepcopy(_ppr_proto(style, alignment, before, after, line)))
+
+
+@functools.lru_cache(maxsize=None)
+def _rpr_proto(style, bold, italic):
+    """Prototype rPr: character style plus bold/italic overrides."""
+    run = Run(OxmlElement("w:r"), None)
+    rPr = run._r.get_or_add_rPr()
+    if style is not None:
+        rPr.style = style
     if bold is not None:
         run.bold = bold
-    if color_rgb is not None:
-        run.font.color.rgb = color_rgb
     if italic is not None:
         run.italic = italic
+    return rPr
+
+
+def _make_run(para, text, style=None, bold=None, italic=None):
+    """
+    Add a run. Font, size and colour come from the paragraph style; ``style``
+    is an optional character style ID, ``bold``/``italic`` direct overrides.
+    """
+    run = para.add_run(text)
+    if style is not None or bold is not None or italic is not None:
+        run._r.insert(0, deepcopy(_rpr_proto(style, bold, italic)))
     return run
 
 
@@ -153,17 +225,6 @@ def _set_table_width(table, width_twips):
     tbl_pr.insert(0, tbl_w)
 
 
-def _set_table_alignment(table, alignment="center"):
-    tbl = table._tbl
-    tbl_pr = tbl.tblPr if tbl.tblPr is not None else OxmlElement("w:tblPr")
-    jc = OxmlElement("w:jc")
-    jc.set(qn("w:val"), alignment)
-    existing = tbl_pr.find(qn("w:jc"))
-    if existing is not None:
-        tbl_pr.remove(existing)
-    tbl_pr.append(jc)
-
-
 def _set_table_grid(table, col_widths_twips):
     """Set tblGrid with explicit column widths."""
     tbl = table._tbl
@@ -199,111 +260,499 @@ def _add_page_number_footer(section):
     run.font.name = FONT_MAIN
 
 
+# ===== Style registry =======================================================
+# The v1.2 design system as named styles in styles.xml. Renderers reference
+# these IDs (pStyle/rStyle) instead of writing font, size and colour per run.
+
+STYLE_BODY = "AvatarBody"
+STYLE_BODY_CENTER = "AvatarBodyCenter"
+STYLE_TABLE_HEADER = "AvatarTableHeader"
+STYLE_CALLOUT_TITLE = "AvatarCalloutTitle"
+STYLE_CODE = "AvatarCode"
+STYLE_CARD_NUMBER = "AvatarCardNumber"
+STYLE_CARD_TITLE = "AvatarCardTitle"
+STYLE_COVER_TITLE = "AvatarCoverTitle"
+STYLE_COVER_SUBTITLE = "AvatarCoverSubtitle"
+STYLE_COVER_TEXT = "AvatarCoverText"
+STYLE_P0 = "AvatarP0"
+STYLE_P1 = "AvatarP1"
+STYLE_HIGH = "AvatarHigh"
+STYLE_LOW = "AvatarLow"
+STYLE_INLINE_CODE = "AvatarInlineCode"
+STYLE_LINK = "AvatarLink"
+STYLE_CODE_KEY = "AvatarCodeKey"
+STYLE_CODE_STRING = "AvatarCodeString"
+STYLE_CODE_NUMBER = "AvatarCodeNumber"
+STYLE_CODE_LITERAL = "AvatarCodeLiteral"
+STYLE_CODE_COMMENT = "AvatarCodeComment"
+
+# (style id, type, based on, font, size pt, bold, colour, alignment, space before/after)
+_STYLE_DEFS = (
+    (STYLE_BODY, "paragraph", None, FONT_MAIN, 9, None, CLR_DARK_BLUEGRAY, None, None),
+    (STYLE_BODY_CENTER, "paragraph", STYLE_BODY, None, None, None, None, "center", None),
+    (STYLE_TABLE_HEADER, "paragraph", STYLE_BODY, None, None, True, CLR_WHITE, "center", None),
+    (STYLE_CALLOUT_TITLE, "paragraph", STYLE_BODY, None, 10, True, None, None, (None, 60)),
+    (STYLE_CODE, "paragraph", STYLE_BODY, FONT_CODE, None, None, None, None, (0, 0)),
+    (STYLE_CARD_NUMBER, "paragraph", STYLE_BODY, None, 11, True, CLR_WHITE, "center", None),
+    (STYLE_CARD_TITLE, "paragraph", STYLE_BODY, None, 11, True, None, None, None),
+    (STYLE_COVER_TITLE, "paragraph", STYLE_BODY, None, 28, True, CLR_DARK_NAVY, "center", (None, 120)),
+    (STYLE_COVER_SUBTITLE, "paragraph", STYLE_BODY, None, 18, False, CLR_MED_BLUE, "center", (None, 500)),
+    (STYLE_COVER_TEXT, "paragraph", STYLE_BODY, None, 11, None, None, "center", None),
+    (STYLE_P0, "character", None, FONT_MAIN, 9, True, CLR_RED, None, None),
+    (STYLE_P1, "character", None, FONT_MAIN, 9, True, CLR_ORANGE, None, None),
+    (STYLE_HIGH, "character", None, FONT_MAIN, 9, True, CLR_RED, None, None),
+    (STYLE_LOW, "character", None, FONT_MAIN, 9, True, CLR_GREEN, None, None),
+    (STYLE_INLINE_CODE, "character", None, FONT_CODE, None, None, None, None, None),
+    (STYLE_LINK, "character", None, None, None, None, CLR_MED_BLUE, None, None),
+    (STYLE_CODE_KEY, "character", None, None, None, None, CLR_MED_BLUE, None, None),
+    (STYLE_CODE_STRING, "character", None, None, None, None, CLR_GREEN, None, None),
+    (STYLE_CODE_NUMBER, "character", None, None, None, None, CLR_ORANGE, None, None),
+    (STYLE_CODE_LITERAL, "character", None, None, None, True, CLR_DARK_NAVY, None, None),
+    (STYLE_CODE_COMMENT, "character", None, None, None, None, CLR_GRAY, None, None),
+)
+
+# Built-in heading styles restyled once instead of per run:
+# Heading 1 is the invisible TOC anchor above each section card.
+_HEADING_STYLE_DEFS = (
+    ("Heading 1", FONT_MAIN, 1, CLR_WHITE),
+    ("Heading 2", FONT_MAIN, 12, CLR_DARK_BLUEGRAY),
+)
+
+def _set_style_font(style, font_name=None, size_pt=None, bold=None, color_hex=None):
+    if font_name is not None:
+        rFonts = style.element.get_or_add_rPr().get_or_add_rFonts()
+        # Explicit fonts replace the template's theme fonts (asciiTheme etc.)
+        rFonts.attrib.clear()
+        for attr in ("w:ascii", "w:hAnsi", "w:eastAsia"):
+            rFonts.set(qn(attr), font_name)
+    if size_pt is not None:
+        style.font.size = Pt(size_pt)
+    if bold is not None:
+        style.font.bold = bold
+    if color_hex is not None:
+        style.font.color.rgb = RGBColor.from_string(color_hex)
+
+
+def _register_styles(doc):
+    """Add the design-system styles to ``doc`` and restyle the headings."""
+    styles = doc.styles
+    for (style_id, kind, base, font_name, size_pt, bold, color_hex,
+         align, spacing) in _STYLE_DEFS:
+        if kind == "paragraph":
+            style = styles.add_style(style_id, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles[base] if base else styles["Normal"]
+            if align is not None:
+                style.paragraph_format.alignment = getattr(WD_ALIGN_PARAGRAPH, align.upper())
+            if spacing is not None:
+                before, after = spacing
+                if before is not None:
+                    style.paragraph_format.space_before = Twips(before)
+                if after is not None:
+                    style.paragraph_format.space_after = Twips(after)
+        else:
+            style = styles.add_style(style_id, WD_STYLE_TYPE.CHARACTER)
+            style.base_style = styles["Default Paragraph Font"]
+        _set_style_font(style, font_name, size_pt, bold, color_hex)
+    styles[STYLE_LINK].font.underline = True
+    for name, font_name, size_pt, color_hex in _HEADING_STYLE_DEFS:
+        _set_style_font(styles[name], font_name, size_pt, None, color_hex)
+
+
 # ===== Markdown parsing =====================================================
 
+# Block-start classifier, applied once to every stripped line. Alternatives are
+# tried in the same precedence the renderer relies on: fence, table, heading,
+# rule, list item.
+_BLOCK_START_RE = re.compile(
+    r"```(?P<lang>.*)"
+    r"|(?P<table>\|.*\|)"
+    r"|(?P<hashes>#{1,4}) (?P<heading>.*)"
+    r"|(?P<hr>---\Z)"
+    r"|- (?P<item>.*)",
+    re.DOTALL,
+)
+# Lines that terminate a running paragraph (checked on non-empty lines only).
+_PARA_BREAK_RE = re.compile(r"[#|]|```|- |---\Z")
+_TABLE_SEP_RE = re.compile(r"\|---|\|[\s\-:]+\|\Z")
+_CELL_SPLIT_RE = re.compile(r"(?<!\\)\|")
+_HEADING_TYPES = {1: "h1", 2: "h2", 3: "h3", 4: "h4"}
+
+
+class Block:
+    """
+    One parsed markdown block.
+
+    ``start``/``end`` are the 1-based first and last source lines of the block.
+    Table cells are kept row-major in the flat ``cells`` tuple; ``row_ends[r]``
+    is the offset in ``cells`` just past row ``r`` (rows may be ragged).
+    """
+
+    __slots__ = ("type", "text", "lang", "start", "end", "cells", "row_ends")
+
+    def __init__(self, type, start, end, text="", lang="", cells=(), row_ends=()):
+        self.type = type
+        self.text = text
+        self.lang = lang
+        self.start = start
+        self.end = end
+        self.cells = cells
+        self.row_ends = row_ends
+
+    @property
+    def nrows(self):
+        return len(self.row_ends)
+
+    def row(self, ri):
+        """Return the cells of table row ``ri`` as a list."""
+        lo = self.row_ends[ri - 1] if ri else 0
+        return list(self.cells[lo:self.row_ends[ri]])
+
+    @property
+    def rows(self):
+        """Table rows as fresh lists (callers may pad/mutate them)."""
+        cells = self.cells
+        out = []
+        lo = 0
+        for hi in self.row_ends:
+            out.append(list(cells[lo:hi]))
+            lo = hi
+        return out
+
+    def content(self):
+        """Hashable block content without source positions."""
+        return (self.type, self.text, self.lang, self.cells, self.row_ends)
+
+    def to_dict(self):
+        """Legacy dict form (``type`` + data keys) of this block."""
+        t = self.type
+        if t == "code":
+            return {"type": t, "lang": self.lang, "text": self.text}
+        if t == "table":
+            return {"type": t, "rows": self.rows}
+        if t == "hr":
+            return {"type": t}
+        return {"type": t, "text": self.text}
+
+    def __repr__(self):
+        return f"Block({self.type!r}, lines {self.start}-{self.end})"
+
+
 def _parse_md_table(lines):
-    """Parse markdown table lines into list of row-lists."""
-    rows = []
+    """
+    Parse stripped markdown table lines into flat cells. ``\\|`` is a literal
+    pipe inside a cell, as in GFM.
+    Returns: (cells, row_ends) as described on :class:`Block`.
+    """
+    cells = []
+    row_ends = []
     for line in lines:
-        line = line.strip()
-        if not line or line.startswith("|---") or re.match(r"^\|[\s\-:]+\|$", line):
+        if _TABLE_SEP_RE.match(line):
             continue
-        # Handle escaped pipes
-        cells = [c.strip() for c in line.split("|")[1:-1]]
-        rows.append(cells)
-    return rows
+        if "\\|" in line:
+            cells.extend(c.strip().replace("\\|", "|")
+                         for c in _CELL_SPLIT_RE.split(line)[1:-1])
+        else:
+            cells.extend(c.strip() for c in line.split("|")[1:-1])
+        row_ends.append(len(cells))
+    return tuple(cells), tuple(row_ends)
 
 
 def _parse_markdown(md_text):
     """
-    Parse the v1.3 markdown into a structured list of blocks.
-    Returns: list of dicts with type + data keys.
+    Parse spec markdown into a structured list of blocks in a single pass.
+    Returns: list of :class:`Block` (code/table/h1-h4/hr/list_item/paragraph).
     """
     lines = md_text.split("\n")
+    stripped = [line.strip() for line in lines]
+    n = len(lines)
     blocks = []
+    append = blocks.append
+    match_start = _BLOCK_START_RE.match
+    match_break = _PARA_BREAK_RE.match
     i = 0
 
-    while i < len(lines):
-        line = lines[i]
-        stripped = line.strip()
-
-        # --- Code block ---
-        if stripped.startswith("```"):
-            lang = stripped[3:].strip()
-            code_lines = []
-            i += 1
-            while i < len(lines) and not lines[i].strip().startswith("```"):
-                code_lines.append(lines[i])
-                i += 1
-            blocks.append({"type": "code", "lang": lang, "text": "\n".join(code_lines)})
+    while i < n:
+        s = stripped[i]
+        if not s:
             i += 1
             continue
 
-        # --- Table ---
-        if stripped.startswith("|") and "|" in stripped[1:]:
-            table_lines = []
-            while i < len(lines) and lines[i].strip().startswith("|"):
-                table_lines.append(lines[i])
-                i += 1
-            rows = _parse_md_table(table_lines)
-            blocks.append({"type": "table", "rows": rows})
+        m = match_start(s)
+        if m is None:
+            # --- Paragraph text: consecutive non-empty, non-block lines ---
+            j = i + 1
+            while j < n:
+                t = stripped[j]
+                if not t or match_break(t):
+                    break
+                j += 1
+            append(Block("paragraph", i + 1, j, text=" ".join(stripped[i:j])))
+            i = j
             continue
 
-        # --- Headings ---
-        if stripped.startswith("#### "):
-            blocks.append({"type": "h4", "text": stripped[5:]})
+        kind = m.lastgroup
+        if kind == "lang":
+            # --- Code block (an unclosed fence runs to end of file) ---
+            j = i + 1
+            while j < n and not stripped[j].startswith("```"):
+                j += 1
+            append(Block("code", i + 1, min(j + 1, n), lang=m.group("lang").strip(),
+                         text="\n".join(lines[i + 1:j])))
+            i = j + 1
+        elif kind == "table":
+            j = i + 1
+            while j < n and stripped[j].startswith("|"):
+                j += 1
+            cells, row_ends = _parse_md_table(stripped[i:j])
+            append(Block("table", i + 1, j, cells=cells, row_ends=row_ends))
+            i = j
+        elif kind == "heading":
+            append(Block(_HEADING_TYPES[len(m.group("hashes"))], i + 1, i + 1,
+                         text=m.group("heading")))
             i += 1
-            continue
-        if stripped.startswith("### "):
-            blocks.append({"type": "h3", "text": stripped[4:]})
+        elif kind == "hr":
+            append(Block("hr", i + 1, i + 1))
             i += 1
-            continue
-        if stripped.startswith("## "):
-            blocks.append({"type": "h2", "text": stripped[3:]})
+        else:
+            append(Block("list_item", i + 1, i + 1, text=m.group("item")))
             i += 1
+
+    return blocks
+
+
+def _is_feature_header(header, rules=None):
+    """Detect a feature table (ID/기능명/...) by its header cells."""
+    return (rules or _load_rules()).is_feature_header(header)
+
+
+def _check_structure(md_text, blocks, rules=None, base_dir=None):
+    """
+    Structural problems that would render wrongly or silently. With
+    ``base_dir``, include fences must name existing files under it.
+    Returns: list of (line, severity, message) in line order; severity is
+    ``"error"`` where content is lost or swallowed, else ``"warning"``.
+    """
+    problems = []
+    lines = md_text.split("\n")
+    if not any(b.type == "h1" for b in blocks):
+        problems.append((1, "warning", "no '# ' title for the cover page"))
+    seen_sections = {}
+    for b in blocks:
+        if b.type == "h2":
+            m = _SECTION_NUM_RE.match(b.text)
+            if m is None:
+                problems.append((b.start, "warning",
+                                 f"'## {b.text}' has no section number; no section card"))
+            else:
+                num = int(m.group(1))
+                if num in seen_sections:
+                    problems.append((b.start, "warning", f"section {num} already started "
+                                                         f"on line {seen_sections[num]}"))
+                seen_sections.setdefault(num, b.start)
+        elif b.type == "code":
+            closed = b.end > b.start and lines[b.end - 1].strip().startswith("```")
+            if not closed:
+                problems.append((b.start, "error", "unclosed code fence runs to end of file"))
+            target = _include_target(b.lang) if base_dir is not None else None
+            if target is not None and not (Path(base_dir) / target).is_file():
+                problems.append((b.start, "error", f"included file not found: {target}"))
+        elif b.type == "table" and b.nrows > 1:
+            ends = b.row_ends
+            width = ends[0]
+            # Feature tables are cut/padded to five columns; generic ones padded
+            severity = "error" if _is_feature_header(b.cells[:width], rules) else "warning"
+            for ri in range(1, b.nrows):
+                n = ends[ri] - ends[ri - 1]
+                if n != width:
+                    problems.append((b.start + ri + 1, severity,
+                                     f"table row has {n} cells, header has {width}"))
+    return sorted(problems)
+
+
+# Feature IDs such as BL-07 or TR-10 (not CL-REF-001 or UTF-8)
+_FEATURE_REF_RE = re.compile(r"(?<![\w-])([A-Z]{2,4})-\d{2,3}(?![\w-])")
+# Columns of a rendered feature table (see _add_feature_table)
+_FEATURE_TABLE_COLUMNS = 5
+
+
+def _lint_features(blocks, rules=None):
+    """
+    Feature checks on top of :func:`_check_structure`: feature table widths,
+    empty and duplicate IDs and, in specs (documents with a cover version),
+    references to IDs that no feature table defines. Defined IDs live in a
+    dict and references are checked by lookup, so the pass stays linear.
+    Returns: list of (line, severity, message) in line order.
+    """
+    rules = rules or _load_rules()
+    problems = []
+    defined = {}
+    refs = []
+    for b in blocks:
+        if b.type == "code":
             continue
-        if stripped.startswith("# "):
-            blocks.append({"type": "h1", "text": stripped[2:]})
-            i += 1
+        if b.type != "table":
+            if b.text and "-" in b.text:
+                refs.extend((b.start, m) for m in _FEATURE_REF_RE.finditer(b.text))
             continue
-
-        # --- HR ---
-        if stripped == "---":
-            blocks.append({"type": "hr"})
-            i += 1
+        ends = b.row_ends
+        if not ends:
             continue
-
-        # --- List item ---
-        if stripped.startswith("- "):
-            blocks.append({"type": "list_item", "text": stripped[2:]})
-            i += 1
+        header = [c.strip() for c in b.cells[:ends[0]]]
+        feature = rules.is_feature_header(header)
+        # Rows of a mis-sized feature table still define their IDs
+        labelled = rules.has_feature_labels(header)
+        if labelled and len(header) != _FEATURE_TABLE_COLUMNS:
+            if not feature:
+                problems.append((b.start, "warning", f"feature table has {len(header)} columns, "
+                                 f"expected {_FEATURE_TABLE_COLUMNS}; rendered as a plain table"))
+            elif len(header) > _FEATURE_TABLE_COLUMNS:
+                problems.append((b.start, "error", f"feature table has {len(header)} columns; "
+                                 f"columns after {_FEATURE_TABLE_COLUMNS} are dropped"))
+            else:
+                problems.append((b.start, "warning", f"feature table has {len(header)} columns; "
+                                 f"padded to {_FEATURE_TABLE_COLUMNS} with empty cells"))
+        for ri in range(b.nrows):
+            # Row ri >= 1 sits below the header and separator lines
+            line = b.start + ri + 1 if ri else b.start
+            row = b.row(ri)
+            if labelled and ri:
+                fid = row[0].replace("*", "").replace("`", "").strip()
+                if not fid:
+                    problems.append((line, "warning", "feature row has no ID"))
+                elif fid in defined:
+                    problems.append((line, "error", f"duplicate feature ID {fid} "
+                                                    f"(first defined on line {defined[fid]})"))
+                else:
+                    defined[fid] = line
+                row = row[1:]
+            text = "\n".join(row)
+            if "-" in text:
+                refs.extend((line, m) for m in _FEATURE_REF_RE.finditer(text))
+
+    # Only prefixes this spec defines: other ID schemes are not features
+    if defined and _cover_version(blocks) is not None:
+        prefixes = {fid.split("-", 1)[0] for fid in defined}
+        for line, m in refs:
+            if m.group(0) not in defined and m.group(1) in prefixes:
+                problems.append((line, "warning",
+                                 f"reference to undefined feature ID {m.group(0)}"))
+    return sorted(problems)
+
+
+# ===== Includes =============================================================
+# A fence whose info string carries ``include=PATH`` renders the file at PATH,
+# relative to the markdown file, instead of its own body:
+#
+#     ```json include=../apps/app_spec.json
+#     ```
+#
+# JSON files are pretty-printed; files over the size limit are cut at a line
+# break. Files are read through mmap, and results are cached by path, mtime
+# and size, so the same file included by many specs is read once.
+
+_FENCE_LINE_RE = re.compile(r"^[ \t]*```(.*)$", re.MULTILINE)
+_INCLUDE_RE = re.compile(r"(?:^|\s)include=(\"[^\"]*\"|\S+)")
+
+
+def _include_target(info):
+    """The include path in a fence info string, or None."""
+    m = _INCLUDE_RE.search(info) if "include=" in info else None
+    return m.group(1).strip('"') if m else None
+
+
+def _first_include(md_text):
+    """The include path of the first include fence in ``md_text``, or None."""
+    for m in _FENCE_LINE_RE.finditer(md_text):
+        target = _include_target(m.group(1))
+        if target is not None:
+            return target
+    return None
+
+
+def _include_stamps(md_text, base_dir):
+    """
+    (path, mtime_ns, size) of every file ``md_text`` includes, without a full
+    parse; missing files stamp as (path, None, None). Used in build keys.
+    """
+    stamps = []
+    for m in _FENCE_LINE_RE.finditer(md_text):
+        target = _include_target(m.group(1))
+        if target is None:
             continue
+        path = Path(base_dir) / target
+        try:
+            st = path.stat()
+        except OSError:
+            stamps.append((str(path), None, None))
+        else:
+            stamps.append((str(path), st.st_mtime_ns, st.st_size))
+    return stamps
 
-        # --- Paragraph text ---
-        if stripped:
-            # Collect consecutive non-empty lines into a paragraph
-            para_lines = [stripped]
-            i += 1
-            while i < len(lines):
-                s = lines[i].strip()
-                if (not s or s.startswith("#") or s.startswith("|") or
-                        s.startswith("```") or s.startswith("- ") or s == "---"):
-                    break
-                para_lines.append(s)
-                i += 1
-            blocks.append({"type": "paragraph", "text": " ".join(para_lines)})
-            continue
 
-        # Empty line
-        i += 1
+@functools.lru_cache(maxsize=32)
+def _read_include(path, mtime_ns, size, max_bytes):
+    """
+    Text of an include file: pretty-printed if it is JSON within ``max_bytes``,
+    else its first ``max_bytes`` cut at a line break plus a note. ``mtime_ns``
+    and ``size`` only key the cache.
+    """
+    import mmap
 
-    return blocks
+    if size == 0:
+        return ""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if size <= max_bytes:
+            data = mm[:]
+        else:
+            # Only the pages up to the cut are read
+            cut = mm.rfind(b"\n", 0, max_bytes)
+            data = mm[:cut if cut > 0 else max_bytes]
+    if size > max_bytes:
+        text = data.decode("utf-8", errors="ignore")
+        return text + f"\n\u2026 (\uc774\ud558 \uc0dd\ub7b5: \uc804\uccb4 {size:,} bytes)"
+    if path.endswith(".json"):
+        try:
+            return json.dumps(json.loads(data), indent=2, ensure_ascii=False)
+        except ValueError:
+            pass  # not valid JSON: show it as written
+    return data.decode("utf-8", errors="replace")
+
+
+def _resolve_includes(blocks, base_dir, max_bytes):
+    """
+    ``blocks`` with each include fence's body replaced by its file (the
+    ``include=`` option dropped from ``lang``). Resolved blocks are what the
+    section cache hashes, so editing an included file invalidates its section.
+    Raises ValueError naming the line when a file cannot be read.
+    """
+    out = blocks
+    for bi, b in enumerate(blocks):
+        if b.type != "code":
+            continue
+        target = _include_target(b.lang)
+        if target is None:
+            continue
+        path = Path(base_dir) / target
+        try:
+            st = path.stat()
+            text = _read_include(str(path), st.st_mtime_ns, st.st_size, max_bytes)
+        except OSError as exc:
+            raise ValueError(f"line {b.start}: include {target}: {exc.strerror}") from None
+        lang = _INCLUDE_RE.sub("", b.lang).strip()
+        if not lang and path.suffix == ".json":
+            lang = "json"
+        if out is blocks:
+            out = list(blocks)
+        out[bi] = Block("code", b.start, b.end, text=text, lang=lang)
+    return out
 
 
 # ===== Document construction ================================================
 
-def _add_cover_page(doc):
-    """Build the cover page (section 0)."""
+def _add_cover_page(doc, cover=None):
+    """Build the cover page (section 0) from ``cover`` (``RenderRules.cover``)."""
+    if cover is None:
+        cover = _load_rules().cover
     section = doc.sections[0]
     section.top_margin = Twips(1440)     # 1 inch
     section.bottom_margin = Twips(1440)
@@ -312,97 +761,70 @@ def _add_cover_page(doc):
 
     # P[0]: Top spacer
     p0 = doc.add_paragraph()
-    _set_paragraph_spacing(p0, before=2800)
+    _set_paragraph_format(p0, before=2800)
 
     # P[1]: Main title
     p1 = doc.add_paragraph()
-    p1.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    _make_run(p1, "AVATAR OnE \ud50c\ub7ab\ud3fc", size_pt=28, bold=True, color_rgb=RGB_DARK_NAVY)
-    _set_paragraph_spacing(p1, after=120)
+    _set_paragraph_format(p1, STYLE_COVER_TITLE)
+    _make_run(p1, cover["title"])
 
     # P[2]: Subtitle
     p2 = doc.add_paragraph()
-    p2.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    _make_run(p2, "\uae30\ub2a5 \uba85\uc138\uc11c", size_pt=18, bold=False, color_rgb=RGB_MED_BLUE)
-    _set_paragraph_spacing(p2, after=500)
+    _set_paragraph_format(p2, STYLE_COVER_SUBTITLE)
+    _make_run(p2, cover["subtitle"])
 
     # P[3]: Spacer
     p3 = doc.add_paragraph()
-    _set_paragraph_spacing(p3, before=80, after=80)
+    _set_paragraph_format(p3, before=80, after=80)
 
     # P[4]: Spacer
     p4 = doc.add_paragraph()
-    _set_paragraph_spacing(p4, before=200)
+    _set_paragraph_format(p4, before=200)
 
     # P[5]: Workflow line
     p5 = doc.add_paragraph()
-    p5.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    _make_run(p5, "Builder \u2192 Trainer \u2192 \ud14c\uc2a4\ud2b8/\uc2b9\uc778 \u2192 \uc2a4\ucf00\uc904\ub9c1 \u2192 \uacb0\uacfc \uc870\ud68c",
-              size_pt=11, color_rgb=RGB_DARK_BLUEGRAY)
-    _set_paragraph_spacing(p5, after=80)
+    _set_paragraph_format(p5, STYLE_COVER_TEXT, after=80)
+    _make_run(p5, cover["workflow"])
 
     # P[6]: Sub-description
     p6 = doc.add_paragraph()
-    p6.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    _make_run(p6, "\uc804\uccb4 \uc6cc\ud06c\ud50c\ub85c\uc6b0 \uae30\ubc18 \uae30\ub2a5 \uba85\uc138", size_pt=11,
-              color_rgb=RGB_DARK_BLUEGRAY)
-    _set_paragraph_spacing(p6, after=400)
+    _set_paragraph_format(p6, STYLE_COVER_TEXT, after=400)
+    _make_run(p6, cover["description"])
 
     # P[7]: Spacer
     p7 = doc.add_paragraph()
-    _set_paragraph_spacing(p7, before=400)
-
-    # Metadata table (4 x 2)
-    meta_data = [
-        ("\ubc84\uc804", "1.5"),
-        ("\uc791\uc131\uc77c", "2025-02-02"),
-        ("\uc218\uc815\uc77c", "2026-02-09"),
-        ("\ub300\uc0c1", "\uace0\uac1d \uc804\ub2ec\uc6a9"),
-    ]
+    _set_paragraph_format(p7, before=400)
+
+    # Metadata table (label/value rows)
+    meta_data = cover["metadata"]
     tbl = doc.add_table(rows=len(meta_data), cols=2)
     tbl.alignment = WD_TABLE_ALIGNMENT.CENTER
     _set_table_borders(tbl, sz=4, color="000000")
     _set_table_grid(tbl, [1600, 3000])
     _set_table_width(tbl, 4600)
 
+    left_fmt = _cell_format(("tcW", 1600), ("shd", CLR_LIGHT_BLUE), ("vAlign", "center"))
+    right_fmt = _cell_format(("tcW", 3000), ("vAlign", "center"))
     for idx, (label, value) in enumerate(meta_data):
         left = tbl.rows[idx].cells[0]
         right = tbl.rows[idx].cells[1]
 
-        _set_cell_width(left, 1600)
-        _set_cell_width(right, 3000)
-
-        _set_cell_shading(left, CLR_LIGHT_BLUE)
-        _set_cell_vertical_alignment(left, "center")
-        _set_cell_vertical_alignment(right, "center")
+        _apply_cell_format(left, left_fmt)
+        _apply_cell_format(right, right_fmt)
 
         lp = left.paragraphs[0]
-        lp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        _make_run(lp, label, size_pt=9, bold=True, color_rgb=RGB_DARK_BLUEGRAY)
+        _set_paragraph_format(lp, STYLE_BODY_CENTER)
+        _make_run(lp, label, bold=True)
 
         rp = right.paragraphs[0]
-        rp.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        _make_run(rp, value, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
+        _set_paragraph_format(rp, STYLE_BODY)
+        _make_run(rp, value)
 
 
 def _add_section_card(doc, number, title, description):
     """Add a section card table: 1x2 with number on the left, title/desc on the right."""
-    # Add Heading 1 (invisible bookmark target for TOC)
-    h1 = doc.add_heading(title, level=1)
-    for run in h1.runs:
-        run.font.size = Pt(14)
-        run.font.color.rgb = RGB_DARK_NAVY
-        run.font.name = FONT_MAIN
-        rPr = run._element.get_or_add_rPr()
-        rFonts = rPr.find(qn("w:rFonts"))
-        if rFonts is None:
-            rFonts = OxmlElement("w:rFonts")
-            rPr.insert(0, rFonts)
-        rFonts.set(qn("w:eastAsia"), FONT_MAIN)
-    # Make the heading invisible (font size 1) to avoid duplicate display
-    for run in h1.runs:
-        run.font.size = Pt(1)
-        run.font.color.rgb = RGB_WHITE
+    # Add Heading 1 (invisible bookmark target for TOC; styled 1pt white)
+    doc.add_heading(title, level=1)
 
     tbl = doc.add_table(rows=1, cols=2)
     _set_table_borders(tbl, sz=4, color="000000")
@@ -411,29 +833,29 @@ def _add_section_card(doc, number, title, description):
 
     # Left cell: section number
     left = tbl.rows[0].cells[0]
-    _set_cell_shading(left, CLR_MED_BLUE)
-    _set_cell_width(left, 700)
-    _set_cell_vertical_alignment(left, "center")
+    _apply_cell_format(left, _cell_format(
+        ("shd", CLR_MED_BLUE), ("tcW", 700), ("vAlign", "center")))
     lp = left.paragraphs[0]
-    lp.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    _make_run(lp, str(number), size_pt=11, bold=True, color_rgb=RGB_WHITE)
+    _set_paragraph_format(lp, STYLE_CARD_NUMBER)
+    _make_run(lp, str(number))
 
     # Right cell: title + description
     right = tbl.rows[0].cells[1]
-    _set_cell_shading(right, CLR_LIGHT_BLUE)
-    _set_cell_width(right, 8660)
-    _set_cell_vertical_alignment(right, "center")
-    _set_cell_margins(right, top=60, bottom=60, left=120, right=80)
+    _apply_cell_format(right, _cell_format(
+        ("shd", CLR_LIGHT_BLUE), ("tcW", 8660), ("vAlign", "center"),
+        ("tcMar", (60, 60, 120, 80))))
 
     rp0 = right.paragraphs[0]
-    _make_run(rp0, title, size_pt=11, bold=True, color_rgb=RGB_DARK_BLUEGRAY)
+    _set_paragraph_format(rp0, STYLE_CARD_TITLE)
+    _make_run(rp0, title)
 
     rp1 = right.add_paragraph()
-    _make_run(rp1, description, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
+    _set_paragraph_format(rp1, STYLE_BODY)
+    _make_run(rp1, description)
 
     # Small spacing after card
     spacer = doc.add_paragraph()
-    _set_paragraph_spacing(spacer, before=60, after=60)
+    _set_paragraph_format(spacer, before=60, after=60)
 
 
 def _add_callout_box(doc, title, body_text, fill_color):
@@ -442,13 +864,12 @@ def _add_callout_box(doc, title, body_text, fill_color):
     _set_table_borders(tbl, sz=4, color="000000")
     _set_table_width(tbl, 9360)
     cell = tbl.rows[0].cells[0]
-    _set_cell_shading(cell, fill_color)
-    _set_cell_margins(cell, top=80, bottom=80, left=120, right=120)
+    _apply_cell_format(cell, _cell_format(("shd", fill_color), ("tcMar", (80, 80, 120, 120))))
 
     if title:
         tp = cell.paragraphs[0]
-        _make_run(tp, title, size_pt=10, bold=True, color_rgb=RGB_DARK_BLUEGRAY)
-        _set_paragraph_spacing(tp, after=60)
+        _set_paragraph_format(tp, STYLE_CALLOUT_TITLE)
+        _make_run(tp, title)
 
         bp = cell.add_paragraph()
     else:
@@ -459,27 +880,105 @@ def _add_callout_box(doc, title, body_text, fill_color):
     first = True
     for part in parts:
         if first:
-            _add_rich_text(bp, part.strip(), size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
+            _set_paragraph_format(bp, STYLE_BODY)
+            _add_rich_text(bp, part.strip())
             first = False
         else:
             np = cell.add_paragraph()
-            _add_rich_text(np, part.strip(), size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
+            _set_paragraph_format(np, STYLE_BODY)
+            _add_rich_text(np, part.strip())
 
     # Spacer after box
     spacer = doc.add_paragraph()
-    _set_paragraph_spacing(spacer, before=40, after=40)
+    _set_paragraph_format(spacer, before=40, after=40)
 
 
-def _add_rich_text(para, text, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY):
-    """Add text with **bold** markdown support."""
-    parts = re.split(r"(\*\*.*?\*\*)", text)
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith("**") and part.endswith("**"):
-            _make_run(para, part[2:-2], size_pt=size_pt, bold=True, color_rgb=color_rgb)
+# Inline markup; at each position the first alternative wins. Code spans and
+# link labels are literal, bold/italic content is tokenized again.
+_INLINE_RE = re.compile(
+    r"`(?P<code>[^`]+)`"
+    r"|\[(?P<label>[^\]]+)\]\((?P<url>[^)\s]+)\)"
+    r"|\*\*(?P<bold>.*?)\*\*"
+    r"|\*(?P<italic>[^*\s](?:[^*]*?[^*\s])?)\*"
+)
+
+
+@functools.lru_cache(maxsize=8192)
+def _inline_tokens(text, bold=False, italic=False):
+    """
+    Tokenize inline markdown (``**bold**``, ``*italic*``, ```code```, ``[label](url)``).
+    Memoized: table cells such as P0 or phase names repeat thousands of times.
+    Returns: tuple of (text, bold, italic, code, url) segments, empty ones dropped.
+    """
+    out = []
+    pos = 0
+    for m in _INLINE_RE.finditer(text):
+        if m.start() > pos:
+            out.append((text[pos:m.start()], bold, italic, False, None))
+        kind = m.lastgroup
+        if kind == "code":
+            out.append((m.group("code"), bold, italic, True, None))
+        elif kind == "url":
+            out.append((m.group("label"), bold, italic, False, m.group("url")))
+        elif kind == "bold":
+            out.extend(_inline_tokens(m.group("bold"), True, italic))
+        else:
+            out.extend(_inline_tokens(m.group("italic"), bold, True))
+        pos = m.end()
+    if pos < len(text):
+        out.append((text[pos:], bold, italic, False, None))
+    return tuple(out)
+
+
+def _add_rich_text(para, text, bold=None):
+    """
+    Add ``text`` as runs with inline markdown applied (formatting otherwise
+    from the paragraph style). ``bold`` is the base weight for unmarked text.
+    """
+    for seg, seg_bold, seg_italic, code, url in _inline_tokens(text):
+        run_bold = True if seg_bold else bold
+        run_italic = True if seg_italic else None
+        if url is not None:
+            # A HYPERLINK field needs no part relationship, so it stays valid
+            # when the paragraph is spliced in from the section cache.
+            run = _make_run(para, seg, STYLE_LINK, run_bold, run_italic)
+            fld = OxmlElement("w:fldSimple",
+                              {qn("w:instr"): f' HYPERLINK "{url.replace(chr(34), "%22")}" '})
+            run._r.addprevious(fld)
+            fld.append(run._r)
         else:
-            _make_run(para, part, size_pt=size_pt, color_rgb=color_rgb)
+            _make_run(para, seg, STYLE_INLINE_CODE if code else None, run_bold, run_italic)
+
+
+def _add_bulk_table(doc, nrows, col_widths, header_fmts, data_fmts, data_styles):
+    """
+    Add a bordered ``nrows`` x ``len(col_widths)`` table in one linear pass.
+
+    The header row and one data row are formatted, then the remaining data
+    rows are cloned from that prototype ``w:tr``. Going through
+    ``tbl.rows[ri].cells[ci]`` instead rebuilds every row proxy per access,
+    which makes large tables quadratic. ``data_styles`` is the paragraph
+    style of each data column.
+    Returns: per row, the cell paragraphs (header row first), still empty.
+    """
+    tbl = doc.add_table(rows=min(nrows, 2), cols=len(col_widths))
+    _set_table_borders(tbl, sz=4, color="000000")
+    _set_table_grid(tbl, col_widths)
+    _set_table_width(tbl, sum(col_widths))
+
+    tbl_el = tbl._tbl
+    trs = tbl_el.tr_lst
+    for tc, fmt in zip(trs[0].tc_lst, header_fmts):
+        tc.get_or_add_tcPr().extend(deepcopy(fmt))
+        _set_paragraph_format(Paragraph(tc.p_lst[0], tbl), STYLE_TABLE_HEADER)
+    if nrows > 1:
+        proto = trs[1]
+        for tc, fmt, style in zip(proto.tc_lst, data_fmts, data_styles):
+            tc.get_or_add_tcPr().extend(deepcopy(fmt))
+            _set_paragraph_format(Paragraph(tc.p_lst[0], tbl), style)
+        for _ in range(nrows - 2):
+            tbl_el.append(deepcopy(proto))
+    return [[Paragraph(tc.p_lst[0], tbl) for tc in tr.tc_lst] for tr in tbl_el.tr_lst]
 
 
 def _add_feature_table(doc, rows):
@@ -490,47 +989,38 @@ def _add_feature_table(doc, rows):
     col_widths = [700, 2000, 4360, 700, 1600]
     num_cols = len(col_widths)
 
-    tbl = doc.add_table(rows=len(rows), cols=num_cols)
-    _set_table_borders(tbl, sz=4, color="000000")
-    _set_table_grid(tbl, col_widths)
-    _set_table_width(tbl, sum(col_widths))
+    header_fmts = [_cell_format(("shd", CLR_DARK_NAVY), ("tcW", w), ("vAlign", "center"))
+                   for w in col_widths]
+    data_fmts = [_cell_format(("tcW", w), ("vAlign", "center")) for w in col_widths]
+    # ID, Name, Description, Priority, Phase
+    data_styles = [STYLE_BODY_CENTER, STYLE_BODY, STYLE_BODY, STYLE_BODY_CENTER,
+                   STYLE_BODY_CENTER]
+    table = _add_bulk_table(doc, len(rows), col_widths, header_fmts, data_fmts, data_styles)
 
     # Header row
-    for ci in range(num_cols):
-        cell = tbl.rows[0].cells[ci]
-        _set_cell_shading(cell, CLR_DARK_NAVY)
-        _set_cell_width(cell, col_widths[ci])
-        _set_cell_vertical_alignment(cell, "center")
-        p = cell.paragraphs[0]
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        text = rows[0][ci] if ci < len(rows[0]) else ""
-        _make_run(p, text, size_pt=9, bold=True, color_rgb=RGB_WHITE)
+    header = rows[0]
+    for ci, p in enumerate(table[0]):
+        _add_rich_text(p, header[ci] if ci < len(header) else "")
 
     # Data rows
-    for ri in range(1, len(rows)):
-        for ci in range(num_cols):
-            cell = tbl.rows[ri].cells[ci]
-            _set_cell_width(cell, col_widths[ci])
-            _set_cell_vertical_alignment(cell, "center")
-            text = rows[ri][ci] if ci < len(rows[ri]) else ""
-            p = cell.paragraphs[0]
-
+    for row, paras in zip(rows[1:], table[1:]):
+        for ci, p in enumerate(paras):
+            text = row[ci] if ci < len(row) else ""
             if ci == 0:  # ID
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                _make_run(p, text, size_pt=9, bold=True, color_rgb=RGB_DARK_BLUEGRAY)
+                _add_rich_text(p, text, bold=True)
             elif ci == 3:  # Priority
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                clr = RGB_RED if text.strip() == "P0" else RGB_ORANGE if text.strip() == "P1" else RGB_DARK_BLUEGRAY
-                _make_run(p, text, size_pt=9, bold=True, color_rgb=clr)
-            elif ci == 4:  # Phase
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                _make_run(p, text, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
-            else:  # Name, Description
-                p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-                _make_run(p, text, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
+                t = text.strip()
+                if t == "P0":
+                    _make_run(p, text, STYLE_P0)
+                elif t == "P1":
+                    _make_run(p, text, STYLE_P1)
+                else:
+                    _add_rich_text(p, text, bold=True)
+            else:  # Name, Description, Phase
+                _add_rich_text(p, text)
 
     spacer = doc.add_paragraph()
-    _set_paragraph_spacing(spacer, before=40, after=40)
+    _set_paragraph_format(spacer, before=40, after=40)
 
 
 def _add_generic_table(doc, rows, col_widths=None):
@@ -559,143 +1049,687 @@ def _add_generic_table(doc, rows, col_widths=None):
     elif len(col_widths) > num_cols:
         col_widths = col_widths[:num_cols]
 
-    tbl = doc.add_table(rows=len(rows), cols=num_cols)
-    _set_table_borders(tbl, sz=4, color="000000")
-    _set_table_grid(tbl, col_widths)
-    _set_table_width(tbl, sum(col_widths))
+    header_fmts = [_cell_format(("shd", CLR_DARK_NAVY), ("tcW", w), ("vAlign", "center"))
+                   for w in col_widths]
+    data_fmts = [_cell_format(("tcW", w), ("vAlign", "center")) for w in col_widths]
+    # First column centered and bold
+    data_styles = [STYLE_BODY_CENTER] + [STYLE_BODY] * (num_cols - 1)
+    table = _add_bulk_table(doc, len(rows), col_widths, header_fmts, data_fmts, data_styles)
 
     # Header row
-    for ci in range(num_cols):
-        cell = tbl.rows[0].cells[ci]
-        _set_cell_shading(cell, CLR_DARK_NAVY)
-        _set_cell_width(cell, col_widths[ci])
-        _set_cell_vertical_alignment(cell, "center")
-        p = cell.paragraphs[0]
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        _make_run(p, rows[0][ci], size_pt=9, bold=True, color_rgb=RGB_WHITE)
+    for text, p in zip(rows[0], table[0]):
+        _add_rich_text(p, text)
 
     # Data rows
-    for ri in range(1, len(rows)):
-        for ci in range(num_cols):
-            cell = tbl.rows[ri].cells[ci]
-            _set_cell_width(cell, col_widths[ci])
-            _set_cell_vertical_alignment(cell, "center")
-            text = rows[ri][ci]
-            p = cell.paragraphs[0]
-
-            # First column bold
-            is_bold = (ci == 0)
-
+    for row, paras in zip(rows[1:], table[1:]):
+        for ci, (text, p) in enumerate(zip(row, paras)):
             # Special colour for priority values
-            clr = RGB_DARK_BLUEGRAY
             t = text.strip()
             if t == "\ub192\uc74c":
-                clr = RGB_RED
-                is_bold = True
+                _make_run(p, text, STYLE_HIGH)
             elif t == "\ub0ae\uc74c":
-                clr = RGB_GREEN
-                is_bold = True
-
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER if ci == 0 else WD_ALIGN_PARAGRAPH.LEFT
-            _make_run(p, text, size_pt=9, bold=is_bold, color_rgb=clr)
+                _make_run(p, text, STYLE_LOW)
+            else:
+                _add_rich_text(p, text, bold=True if ci == 0 else None)
 
     spacer = doc.add_paragraph()
-    _set_paragraph_spacing(spacer, before=40, after=40)
-
-
-def _add_json_code_block(doc, code_text):
-    """Add JSON code as a light-gray 1x1 table box."""
+    _set_paragraph_format(spacer, before=40, after=40)
+
+
+# Fenced code is rendered line by line (w:br between lines) with lightweight
+# highlighting for JSON, YAML and shell. The cell paragraph XML is built as
+# text, cached by content hash, and parsed once per use; long blocks are
+# split across rows of the box and capped (see "code_blocks" rules).
+
+_CODE_LANGS = {"json": "json", "jsonc": "json", "yaml": "yaml", "yml": "yaml",
+               "bash": "bash", "sh": "bash", "shell": "bash", "console": "bash"}
+_CODE_TOKEN_RES = {
+    "json": re.compile(
+        r'(?P<key>"(?:[^"\\]|\\.)*")(?=\s*:)'
+        r'|(?P<string>"(?:[^"\\]|\\.)*")'
+        r"|(?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)"
+        r"|(?P<literal>\b(?:true|false|null)\b)"),
+    "yaml": re.compile(
+        r"(?P<comment>(?<!\S)#.*)"
+        r"|(?P<key>[\w.-]+)(?=:(?:\s|\Z))"
+        r"|(?P<string>\"(?:[^\"\\]|\\.)*\"|'[^']*')"
+        r"|(?P<number>(?<![\w.])-?\d+(?:\.\d+)?(?![\w.]))"
+        r"|(?P<literal>\b(?:true|false|null|yes|no)\b)"),
+    "bash": re.compile(
+        r"(?P<comment>(?<!\S)#.*)"
+        r"|(?P<command>\A\s*[\w./-]+)"
+        r"|(?P<string>\"(?:[^\"\\]|\\.)*\"|'[^']*')"
+        r"|(?P<var>\$(?:\{[^}]*\}|\w+))"
+        r"|(?P<option>(?<!\S)--?[\w-]+)"),
+}
+_CODE_TOKEN_STYLES = {
+    "key": STYLE_CODE_KEY, "command": STYLE_CODE_KEY, "var": STYLE_CODE_KEY,
+    "string": STYLE_CODE_STRING, "number": STYLE_CODE_NUMBER,
+    "literal": STYLE_CODE_LITERAL, "option": STYLE_CODE_LITERAL,
+    "comment": STYLE_CODE_COMMENT,
+}
+_CODE_CACHE_SIZE = 64
+_code_cache = collections.OrderedDict()  # (lang, limits, blake2b) -> cell paragraph XML
+_code_cache_lock = threading.Lock()
+
+
+def _xml_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _code_run_xml(text, style=None):
+    """``w:r`` XML for ``text``; tabs become ``w:tab``."""
+    rpr = f'<w:rPr><w:rStyle w:val="{style}"/></w:rPr>' if style else ""
+    content = []
+    for ti, part in enumerate(text.split("\t")):
+        if ti:
+            content.append("<w:tab/>")
+        if part:
+            content.append(f'<w:t xml:space="preserve">{_xml_text(part)}</w:t>')
+    return f"<w:r>{rpr}{''.join(content)}</w:r>"
+
+
+def _code_line_xml(line, token_re):
+    """Runs for one code line, highlighted by ``token_re`` (None: plain)."""
+    if token_re is None:
+        return _code_run_xml(line) if line else ""
+    out = []
+    pos = 0
+    for m in token_re.finditer(line):
+        if m.start() > pos:
+            out.append(_code_run_xml(line[pos:m.start()]))
+        out.append(_code_run_xml(m.group(), _CODE_TOKEN_STYLES[m.lastgroup]))
+        pos = m.end()
+    if pos < len(line):
+        out.append(_code_run_xml(line[pos:]))
+    return "".join(out)
+
+
+def _code_cells_xml(lang, code_text, limits):
+    """
+    Cell paragraph XML for each row of a code box. ``limits`` is
+    (lines per cell, max lines, max line chars, max chars to highlight).
+    """
+    lines_per_cell, max_lines, max_line_chars, highlight_max_chars = limits
+    key = (lang, limits, hashlib.blake2b(code_text.encode("utf-8"), digest_size=16).digest())
+    with _code_cache_lock:
+        cached = _code_cache.get(key)
+        if cached is not None:
+            _code_cache.move_to_end(key)
+            return cached
+
+    lang = _CODE_LANGS.get(lang.split()[0].lower() if lang else "")
+    token_re = _CODE_TOKEN_RES.get(lang) if len(code_text) <= highlight_max_chars else None
+    lines = code_text.split("\n")
+    omitted = len(lines) - max_lines
+    if omitted > 0:
+        lines = lines[:max_lines]
+    open_p = (f'<w:p {nsdecls("w")}><w:pPr><w:pStyle w:val="{STYLE_CODE}"/></w:pPr>')
+    br = "<w:r><w:br/></w:r>"
+    cells = []
+    for start in range(0, len(lines), lines_per_cell):
+        runs = []
+        for line in lines[start:start + lines_per_cell]:
+            if len(line) > max_line_chars:
+                line = line[:max_line_chars] + " \u2026"
+            runs.append(_code_line_xml(line, token_re))
+        cells.append(open_p + br.join(runs))
+    if omitted > 0:
+        note = f"\u2026 (\uc774\ud558 {omitted}\uc904 \uc0dd\ub7b5)"
+        cells[-1] += br + _code_run_xml(note, STYLE_CODE_COMMENT)
+    cells = tuple(c + "</w:p>" for c in cells)
+
+    with _code_cache_lock:
+        _code_cache[key] = cells
+        if len(_code_cache) > _CODE_CACHE_SIZE:
+            _code_cache.popitem(last=False)
+    return cells
+
+
+def _add_code_block(doc, code_text, lang="", limits=None):
+    """Add fenced code as a light-gray box: one row per chunk of lines."""
+    if limits is None:
+        limits = _load_rules().code_limits
+    cells = _code_cells_xml(lang, code_text, limits)
     tbl = doc.add_table(rows=1, cols=1)
     _set_table_borders(tbl, sz=4, color="000000")
     _set_table_width(tbl, 9360)
     cell = tbl.rows[0].cells[0]
-    _set_cell_shading(cell, CLR_VERY_LIGHT_GRAY)
-    _set_cell_margins(cell, top=80, bottom=80, left=120, right=120)
+    _apply_cell_format(cell, _cell_format(
+        ("shd", CLR_VERY_LIGHT_GRAY), ("tcMar", (80, 80, 120, 120))))
 
-    p = cell.paragraphs[0]
-    _make_run(p, code_text, font_name=FONT_CODE, size_pt=9, color_rgb=RGB_DARK_BLUEGRAY)
-    _set_paragraph_spacing(p, before=0, after=0)
+    tbl_el = tbl._tbl
+    proto = tbl_el.tr_lst[0]
+    for _ in cells[1:]:
+        tbl_el.append(deepcopy(proto))
+    for tr, xml in zip(tbl_el.tr_lst, cells):
+        tc = tr.tc_lst[0]
+        tc.replace(tc.p_lst[0], parse_xml(xml))
 
     spacer = doc.add_paragraph()
-    _set_paragraph_spacing(spacer, before=40, after=40)
+    _set_paragraph_format(spacer, before=40, after=40)
 
 
 def _add_heading2(doc, text):
-    h = doc.add_heading(text, level=2)
-    for run in h.runs:
-        run.font.size = Pt(12)
-        run.font.color.rgb = RGB_DARK_BLUEGRAY
-        run.font.name = FONT_MAIN
-        rPr = run._element.get_or_add_rPr()
-        rFonts = rPr.find(qn("w:rFonts"))
-        if rFonts is None:
-            rFonts = OxmlElement("w:rFonts")
-            rPr.insert(0, rFonts)
-        rFonts.set(qn("w:eastAsia"), FONT_MAIN)
-    return h
-
-
-def _add_normal_paragraph(doc, text, size_pt=9):
+    # Font, size and colour come from the restyled "Heading 2"
+    return doc.add_heading(text, level=2)
+
+
+def _add_normal_paragraph(doc, text):
     p = doc.add_paragraph()
-    _add_rich_text(p, text, size_pt=size_pt, color_rgb=RGB_DARK_BLUEGRAY)
+    _set_paragraph_format(p, STYLE_BODY)
+    _add_rich_text(p, text)
     return p
 
 
-def _add_list_item(doc, text, size_pt=9):
+def _add_list_item(doc, text):
     p = doc.add_paragraph()
-    _add_rich_text(p, "- " + text, size_pt=size_pt, color_rgb=RGB_DARK_BLUEGRAY)
+    _set_paragraph_format(p, STYLE_BODY)
+    _add_rich_text(p, "- " + text)
     return p
 
 
+# ===== Column widths ========================================================
+# Content-aware widths for generic tables. Each cell's display width is its
+# rendered text in half-width units, where East-Asian wide characters (Hangul,
+# CJK, fullwidth forms) count 2. With NumPy the whole table is measured in
+# one batch; without it a regex does the same per cell.
+
+_HALF_WIDTH_TWIPS = 90   # one half-width character of 9pt body text
+_CELL_PAD_TWIPS = 240    # default left/right cell margins plus slack
+_MIN_COL_TWIPS = 600
+
+# East-Asian Wide/Fullwidth code point ranges (inclusive, sorted); covers the
+# scripts and emoji blocks, not every wide symbol of UAX #11
+_WIDE_RANGES = (
+    (0x1100, 0x115F),    # Hangul Jamo
+    (0x231A, 0x231B),
+    (0x2329, 0x232A),
+    (0x2E80, 0x303E),    # CJK radicals, ideographic punctuation
+    (0x3041, 0x33FF),    # kana, Hangul compatibility Jamo, CJK symbols
+    (0x3400, 0x4DBF),    # CJK extension A
+    (0x4E00, 0x9FFF),    # CJK unified ideographs
+    (0xA000, 0xA4CF),    # Yi
+    (0xA960, 0xA97F),    # Hangul Jamo extended-A
+    (0xAC00, 0xD7A3),    # Hangul syllables
+    (0xF900, 0xFAFF),    # CJK compatibility ideographs
+    (0xFE10, 0xFE19),    # vertical forms
+    (0xFE30, 0xFE6F),    # CJK compatibility and small forms
+    (0xFF00, 0xFF60),    # fullwidth forms
+    (0xFFE0, 0xFFE6),
+    (0x16FE0, 0x18CFF),  # Tangut, Khitan
+    (0x1B000, 0x1B2FF),  # kana supplements, Nushu
+    (0x1F200, 0x1F2FF),  # enclosed ideographic supplement
+    (0x1F300, 0x1F64F),  # emoji
+    (0x1F680, 0x1F6FF),
+    (0x1F900, 0x1F9FF),
+    (0x1FA70, 0x1FAFF),
+    (0x20000, 0x3FFFD),  # CJK extensions B and later
+)
+_WIDE_RE = re.compile("[" + "".join(f"{chr(lo)}-{chr(hi)}" for lo, hi in _WIDE_RANGES) + "]")
+
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """NumPy if it is installed, else None."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=1)
+def _wide_bounds():
+    """Range starts and ends (exclusive) interleaved: odd searchsorted index = wide."""
+    np = _numpy()
+    return np.array([b for lo, hi in _WIDE_RANGES for b in (lo, hi + 1)], dtype=np.uint32)
+
+
+def _display_widths(texts):
+    """Display width of each string, in half-width units."""
+    np = _numpy()
+    if np is None:
+        return [len(t) + len(_WIDE_RE.findall(t)) for t in texts]
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32)
+    wide = np.searchsorted(_wide_bounds(), codes, side="right") & 1
+    # Per-string wide counts as differences of one running total
+    running = np.zeros(len(codes) + 1, dtype=np.int64)
+    np.cumsum(wide, out=running[1:])
+    ends = np.cumsum(lengths)
+    return lengths + running[ends] - running[ends - lengths]
+
+
+_LINK_TARGET_RE = re.compile(r"\[([^\]\n]*)\]\([^)\n]*\)")
+
+
+def _cells_display_text(texts):
+    """
+    Cell texts as rendered: inline markers and link targets take no width.
+    The whole table is stripped at once and split back into cells.
+    """
+    joined = "\n".join(texts).replace("*", "").replace("`", "")
+    if "](" in joined:
+        joined = _LINK_TARGET_RE.sub(r"\1", joined)
+    return joined.split("\n")
+
+
+def _content_column_widths(rows, total=9360):
+    """
+    Column widths (twips, summing to ``total``) fitted to the cells of ``rows``.
+
+    A column needs its longest cell on one line. If every column fits, the
+    spare width is shared in proportion to need. Otherwise each column keeps
+    its header unbroken (at least ``_MIN_COL_TWIPS``) and the rest goes to
+    the columns in proportion to how much more they need.
+    """
+    nc = max(len(r) for r in rows)
+    texts = [r[ci] if ci < len(r) else "" for r in rows for ci in range(nc)]
+    widths = _display_widths(_cells_display_text(texts))
+    np = _numpy()
+    if np is not None:
+        grid = widths.reshape(len(rows), nc)
+        header, longest = grid[0].tolist(), grid.max(axis=0).tolist()
+    else:
+        header = widths[:nc]
+        longest = [max(widths[ci::nc]) for ci in range(nc)]
+
+    floor = [max(_MIN_COL_TWIPS, h * _HALF_WIDTH_TWIPS + _CELL_PAD_TWIPS) for h in header]
+    if sum(floor) > total:
+        floor = [f * total // sum(floor) for f in floor]
+    need = [min(total, max(f, w * _HALF_WIDTH_TWIPS + _CELL_PAD_TWIPS))
+            for f, w in zip(floor, longest)]
+    if sum(need) <= total:
+        base, weights = [0] * nc, need
+    else:
+        base, weights = floor, [n - f for n, f in zip(need, floor)]
+    spare = total - sum(base)
+    weight_sum = sum(weights) or 1
+    cw = [b + spare * w // weight_sum for b, w in zip(base, weights)]
+    # Rounding remainder goes to the widest column
+    cw[cw.index(max(cw))] += total - sum(cw)
+    return cw
+
+
+# ===== Rendering rules ======================================================
+# Which headings become callout boxes, how section cards are described, how
+# feature tables are recognised and how generic tables are sized. A JSON file
+# with the same shape (``--rules``) replaces individual top-level keys; fills
+# are hex colours.
+
+DEFAULT_RULES = {
+    # ``heading`` matches the stripped heading text exactly; ``contains``
+    # matches any of the substrings. ``title`` defaults to the heading.
+    "callouts": [
+        {"block": "h3", "heading": "\ud575\uc2ec \uac1c\ub150", "fill": CLR_LIGHT_YELLOW},
+        {"block": "h3", "heading": "\uc6b4\uc601 \ubc94\uc704", "fill": CLR_LIGHT_BLUE},
+        {"block": "h3", "heading": "RL \ud559\uc2b5 \ud30c\ub77c\ubbf8\ud130", "fill": CLR_LIGHT_YELLOW},
+        {"block": "h4",
+         "contains": ["\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778 \ud504\ub85c\uc138\uc2a4 \uac1c\uc694",
+                      "\ud504\ub85c\uc138\uc2a4 \uac1c\uc694"],
+         "title": "\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778 \ud504\ub85c\uc138\uc2a4 \uac1c\uc694",
+         "fill": CLR_LIGHT_YELLOW},
+    ],
+    # Section cards: a fixed description, or the description column of the
+    # given step in the first table under ``## <workflow_section>.``
+    "workflow_section": 1,
+    "sections": {
+        "1": {"title": "\uc804\uccb4 \uc6cc\ud06c\ud50c\ub85c\uc6b0",
+              "description": "\ubcf8 \ud50c\ub7ab\ud3fc\uc758 \ud575\uc2ec \uc6cc\ud06c\ud50c\ub85c\uc6b0\ub97c \ub2e4\uc74c\uacfc \uac19\uc774 \uc815\uc758\ud55c\ub2e4."},
+        "2": {"title": "Builder (App \uac1c\ubc1c)", "workflow_step": "1"},
+        "3": {"title": "\ucef4\ud3ec\ub10c\ud2b8 \uae00\ub85c\ubc8c \ub77c\uc774\ube0c\ub7ec\ub9ac",
+              "description": "\uc2dc\uc2a4\ud15c \uc804\uc5ed\uc5d0\uc11c \uc7ac\uc0ac\uc6a9 \uac00\ub2a5\ud55c \ucef4\ud3ec\ub10c\ud2b8\ub97c \ub4f1\ub85d\u00b7\uad00\ub9ac\ud558\ub294 \uce74\ud0c8\ub85c\uadf8\uc774\ub2e4."},
+        "4": {"title": "Trainer (\ud559\uc2b5 \uc694\uccad)",
+              "description": "\uac1c\ubc1c \uc644\ub8cc\ub41c App\uc5d0 \ub300\ud574 \ud559\uc2b5 \ud30c\ub77c\ubbf8\ud130\uc640 \ub9ac\uc18c\uc2a4\ub97c \uc124\uc815\ud558\uc5ec \ud559\uc2b5 \uc694\uccad\uc744 \uc81c\ucd9c\ud558\ub294 \uc804\uc6a9 \ud654\uba74\uc774\ub2e4."},
+        "5": {"title": "\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778", "workflow_step": "3"},
+        "6": {"title": "\uc2e4\ud589 \ub300\uae30\uc5f4 \ubc0f \uc6b0\uc120\uc21c\uc704 \uad00\ub9ac", "workflow_step": "4"},
+        "7": {"title": "\ub9ac\uc18c\uc2a4 \uad00\ub9ac", "workflow_step": "5"},
+        "8": {"title": "\uacb0\uacfc \ubaa8\ub378 \uad00\ub9ac", "workflow_step": "6"},
+        "9": {"title": "\uc6cc\ud06c\ub85c\ub4dc \uc2a4\ucf00\uc904\ub9c1 (HPC)",
+              "description": "\uc2b9\uc778\ub41c \uc6cc\ud06c\ub85c\ub4dc\ub97c \uc2e4\uc81c HPC \uc778\ud504\ub77c\uc5d0\uc11c \uc2e4\ud589\ud558\ub294 \uacc4\uce35\uc774\ub2e4."},
+        "10": {"title": "\uc800\uc7a5\uc18c",
+               "description": "\uc2a4\ud399 \ud30c\uc77c, \ubaa8\ub378, \ud14c\uc2a4\ud2b8 \uc2e4\ud589 \uacb0\uacfc, \uc2e4\ud589 \ub85c\uadf8 \ub4f1\uc744 \uc800\uc7a5\ud558\uace0 \uad00\ub9ac\ud55c\ub2e4."},
+        "11": {"title": "\uad8c\ud55c \uad00\ub9ac \ubc0f \uc778\uc99d",
+               "description": "\uc5ed\ud560 \uae30\ubc18 \uc811\uadfc \uc81c\uc5b4\uc640 \uc0ac\uc6a9\uc790 \uacc4\uc815 \uad00\ub9ac\ub97c \uc81c\uacf5\ud55c\ub2e4."},
+        "12": {"title": "\uad8c\uc7a5 \uae30\uc220 \uc2a4\ud0dd \ubc0f \uad6c\ud604 \ub85c\ub4dc\ub9f5",
+               "description": "HPC/ML \uc6cc\ud06c\ub85c\ub4dc \uad00\ub9ac\ub97c \uc704\ud55c \uad8c\uc7a5 \uae30\uc220 \uc2a4\ud0dd\uacfc \uad6c\ud604 \ub85c\ub4dc\ub9f5\uc744 \uc815\uc758\ud55c\ub2e4."},
+    },
+    # Header cells that mark a feature table (ID/기능명/설명/우선순위/구현단계)
+    "feature_table": {"min_columns": 5, "id_contains": ["ID"],
+                      "name_contains": ["\uae30\ub2a5\uba85", "\uae30\ub2a5"]},
+    # Fixed generic table column widths (twips) by column count; the first
+    # entry whose ``first_header_contains`` matches wins. Other tables are
+    # fitted to their content, or split 9360 evenly without auto widths.
+    "column_widths": [
+        {"columns": 3, "first_header_contains": "\ub2e8\uacc4", "widths": [600, 1800, 6960]},
+        {"columns": 3, "first_header_contains": "\uacc4\uce35", "widths": [2200, 2200, 4960]},
+    ],
+    "auto_column_widths": True,
+    # Code boxes: lines per table row, lines and characters per line kept
+    # (the rest is cut with a note), and the largest block still highlighted
+    "code_blocks": {"lines_per_cell": 200, "max_lines": 5000, "max_line_chars": 2000,
+                    "highlight_max_chars": 200000},
+    # ``include=`` fences: larger files are cut at a line break before this size
+    "includes": {"max_bytes": 1048576},
+    # Cover page text; ``metadata`` rows fill the label/value table
+    "cover": {
+        "title": "AVATAR OnE \ud50c\ub7ab\ud3fc",
+        "subtitle": "\uae30\ub2a5 \uba85\uc138\uc11c",
+        "workflow": "Builder \u2192 Trainer \u2192 \ud14c\uc2a4\ud2b8/\uc2b9\uc778 \u2192 "
+                    "\uc2a4\ucf00\uc904\ub9c1 \u2192 \uacb0\uacfc \uc870\ud68c",
+        "description": "\uc804\uccb4 \uc6cc\ud06c\ud50c\ub85c\uc6b0 \uae30\ubc18 \uae30\ub2a5 \uba85\uc138",
+        "metadata": [
+            ["\ubc84\uc804", "1.5"],
+            ["\uc791\uc131\uc77c", "2025-02-02"],
+            ["\uc218\uc815\uc77c", "2026-02-09"],
+            ["\ub300\uc0c1", "\uace0\uac1d \uc804\ub2ec\uc6a9"],
+        ],
+    },
+}
+
+
+def _substring_re(needles):
+    """One compiled alternation matching any of ``needles`` literally."""
+    return re.compile("|".join(re.escape(n) for n in needles))
+
+
+class RenderRules:
+    """
+    A rule set compiled for per-block lookups.
+
+    Callouts are indexed by (block type, exact heading) with one precompiled
+    substring alternation per block type as the fallback; column-width rules
+    are indexed by column count. ``digest`` identifies the rule set in section
+    cache and build manifest keys.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.digest = hashlib.sha256(
+            json.dumps(spec, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:16]
+        try:
+            self._compile(spec)
+        except (KeyError, TypeError, ValueError, re.error) as exc:
+            raise ValueError(f"invalid rendering rules: {type(exc).__name__}: {exc}") from None
+
+    def _compile(self, spec):
+        self._callouts = {}
+        contains = {}
+        for rule in spec["callouts"]:
+            block = rule["block"]
+            if "heading" in rule:
+                target = (rule.get("title", rule["heading"]), rule["fill"])
+                self._callouts.setdefault((block, rule["heading"]), target)
+            else:
+                needles = rule["contains"]
+                target = (rule.get("title", needles[0]), rule["fill"])
+                for needle in needles:
+                    contains.setdefault(block, {}).setdefault(needle, target)
+        # block type -> (alternation, matched substring -> (title, fill))
+        self._contains = {block: (_substring_re(targets), targets)
+                          for block, targets in contains.items()}
+
+        feature = spec["feature_table"]
+        self._feature_min_columns = int(feature["min_columns"])
+        self._feature_id = _substring_re(feature["id_contains"])
+        self._feature_name = _substring_re(feature["name_contains"])
+
+        self._widths = {}
+        for rule in spec["column_widths"]:
+            widths = [int(w) for w in rule["widths"]]
+            if len(widths) != rule["columns"]:
+                raise ValueError(f"{rule['columns']}-column rule has {len(widths)} widths")
+            self._widths.setdefault(rule["columns"], []).append(
+                (rule.get("first_header_contains"), widths))
+
+        self._auto_widths = bool(spec["auto_column_widths"])
+        code = spec["code_blocks"]
+        self.code_limits = tuple(max(1, int(code[k])) for k in (
+            "lines_per_cell", "max_lines", "max_line_chars", "highlight_max_chars"))
+        self.include_max_bytes = max(1, int(spec["includes"]["max_bytes"]))
+        cover = spec["cover"]
+        self.cover = {key: str(cover[key])
+                      for key in ("title", "subtitle", "workflow", "description")}
+        self.cover["metadata"] = tuple((str(label), str(value))
+                                       for label, value in cover["metadata"])
+        self._workflow_section = f"{int(spec['workflow_section'])}."
+        self._sections = {int(num): entry for num, entry in spec["sections"].items()}
+
+    def callout(self, block_type, text):
+        """(title, fill) when the heading starts a callout box, else None."""
+        hit = self._callouts.get((block_type, text))
+        if hit is None and block_type in self._contains:
+            regex, targets = self._contains[block_type]
+            m = regex.search(text)
+            if m:
+                hit = targets[m.group(0)]
+        return hit
+
+    def has_feature_labels(self, header):
+        """True when the ID and name columns match, whatever the column count."""
+        return (
+            len(header) >= 2
+            and self._feature_id.search(header[0]) is not None
+            and self._feature_name.search(header[1]) is not None
+        )
+
+    def is_feature_header(self, header):
+        return len(header) >= self._feature_min_columns and self.has_feature_labels(header)
+
+    def column_widths(self, header, rows):
+        """Column widths (twips) for a generic table: ``rows`` with this header."""
+        nc = len(header)
+        for needle, widths in self._widths.get(nc, ()):
+            if needle is None or needle in header[0]:
+                return list(widths)
+        if self._auto_widths:
+            return _content_column_widths(rows)
+        total = 9360
+        cw = [total // nc] * nc
+        cw[-1] = total - sum(cw[:-1])
+        return cw
+
+    def section_map(self, blocks):
+        """
+        Section number -> (title, card description).
+        Workflow-step descriptions come from the first table under the
+        workflow section.
+        """
+        section_descriptions = {}
+        wf_table = None
+        for bi, b in enumerate(blocks):
+            if b.type == "h2" and b.text.startswith(self._workflow_section):
+                # Look for next table
+                for j in range(bi + 1, len(blocks)):
+                    if blocks[j].type == "table":
+                        wf_table = blocks[j].rows
+                        break
+                    if blocks[j].type == "h2":
+                        break
+                break
+
+        if wf_table and len(wf_table) > 1:
+            # Map step number -> description
+            for row in wf_table[1:]:
+                if len(row) >= 3:
+                    section_descriptions[row[0].strip()] = row[2].strip()
+
+        return {
+            num: (entry["title"], entry["description"] if "description" in entry
+                  else section_descriptions.get(entry.get("workflow_step"), ""))
+            for num, entry in self._sections.items()
+        }
+
+
+@functools.lru_cache(maxsize=None)
+def _load_rules(path=None):
+    """
+    Compiled rules: the defaults, with the top-level keys of the JSON file at
+    ``path`` (if given) replacing theirs. Raises ValueError on a bad file.
+    """
+    spec = dict(DEFAULT_RULES)
+    if path is not None:
+        try:
+            overrides = json.loads(Path(path).read_text(encoding="utf-8"))
+        except OSError as exc:
+            raise ValueError(f"{path}: {exc.strerror}") from None
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+        spec = _merge_rules(overrides, path)
+    return RenderRules(spec)
+
+
+def _merge_rules(overrides, source):
+    """The default rule spec with the top-level keys of ``overrides`` replacing theirs."""
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{source}: expected a JSON object")
+    unknown = sorted(set(overrides) - set(DEFAULT_RULES))
+    if unknown:
+        raise ValueError(f"{source}: unknown rule keys: {', '.join(unknown)}")
+    return {**DEFAULT_RULES, **overrides}
+
+
 # ===== Main build logic =====================================================
 
-def _build_document(md_text):
-    """Build the complete DOCX document from markdown text."""
-    doc = Document()
-    blocks = _parse_markdown(md_text)
+def _section_map(blocks, rules=None):
+    """Section number -> (title, card description); see :meth:`RenderRules.section_map`."""
+    return (rules or _load_rules()).section_map(blocks)
 
-    # ---- Workflow descriptions (from section 1 table) for section card use ----
-    section_descriptions = {}
-    # Find the workflow table (it's the first table after ## 1. heading)
-    wf_table = None
-    for bi, b in enumerate(blocks):
-        if b["type"] == "h2" and b["text"].startswith("1."):
-            # Look for next table
-            for j in range(bi + 1, len(blocks)):
-                if blocks[j]["type"] == "table":
-                    wf_table = blocks[j]["rows"]
-                    break
-                if blocks[j]["type"] == "h2":
-                    break
-            break
 
-    if wf_table and len(wf_table) > 1:
-        # Map step number -> description
-        for row in wf_table[1:]:
-            if len(row) >= 3:
-                step_num = row[0].strip()
-                desc = row[2].strip()
-                section_descriptions[step_num] = desc
-
-    # Section mapping: section_number -> (title, description)
-    # Sections 1-6 map to workflow table steps 1-6
-    sec_map = {
-        1: ("\uc804\uccb4 \uc6cc\ud06c\ud50c\ub85c\uc6b0", "\ubcf8 \ud50c\ub7ab\ud3fc\uc758 \ud575\uc2ec \uc6cc\ud06c\ud50c\ub85c\uc6b0\ub97c \ub2e4\uc74c\uacfc \uac19\uc774 \uc815\uc758\ud55c\ub2e4."),
-        2: ("Builder (App \uac1c\ubc1c)", section_descriptions.get("1", "")),
-        3: ("\ucef4\ud3ec\ub10c\ud2b8 \uae00\ub85c\ubc8c \ub77c\uc774\ube0c\ub7ec\ub9ac", "\uc2dc\uc2a4\ud15c \uc804\uc5ed\uc5d0\uc11c \uc7ac\uc0ac\uc6a9 \uac00\ub2a5\ud55c \ucef4\ud3ec\ub10c\ud2b8\ub97c \ub4f1\ub85d\u00b7\uad00\ub9ac\ud558\ub294 \uce74\ud0c8\ub85c\uadf8\uc774\ub2e4."),
-        4: ("Trainer (\ud559\uc2b5 \uc694\uccad)", "\uac1c\ubc1c \uc644\ub8cc\ub41c App\uc5d0 \ub300\ud574 \ud559\uc2b5 \ud30c\ub77c\ubbf8\ud130\uc640 \ub9ac\uc18c\uc2a4\ub97c \uc124\uc815\ud558\uc5ec \ud559\uc2b5 \uc694\uccad\uc744 \uc81c\ucd9c\ud558\ub294 \uc804\uc6a9 \ud654\uba74\uc774\ub2e4."),
-        5: ("\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778", section_descriptions.get("3", "")),
-        6: ("\uc2e4\ud589 \ub300\uae30\uc5f4 \ubc0f \uc6b0\uc120\uc21c\uc704 \uad00\ub9ac", section_descriptions.get("4", "")),
-        7: ("\ub9ac\uc18c\uc2a4 \uad00\ub9ac", section_descriptions.get("5", "")),
-        8: ("\uacb0\uacfc \ubaa8\ub378 \uad00\ub9ac", section_descriptions.get("6", "")),
-        9: ("\uc6cc\ud06c\ub85c\ub4dc \uc2a4\ucf00\uc904\ub9c1 (HPC)", "\uc2b9\uc778\ub41c \uc6cc\ud06c\ub85c\ub4dc\ub97c \uc2e4\uc81c HPC \uc778\ud504\ub77c\uc5d0\uc11c \uc2e4\ud589\ud558\ub294 \uacc4\uce35\uc774\ub2e4."),
-        10: ("\uc800\uc7a5\uc18c", "\uc2a4\ud399 \ud30c\uc77c, \ubaa8\ub378, \ud14c\uc2a4\ud2b8 \uc2e4\ud589 \uacb0\uacfc, \uc2e4\ud589 \ub85c\uadf8 \ub4f1\uc744 \uc800\uc7a5\ud558\uace0 \uad00\ub9ac\ud55c\ub2e4."),
-        11: ("\uad8c\ud55c \uad00\ub9ac \ubc0f \uc778\uc99d", "\uc5ed\ud560 \uae30\ubc18 \uc811\uadfc \uc81c\uc5b4\uc640 \uc0ac\uc6a9\uc790 \uacc4\uc815 \uad00\ub9ac\ub97c \uc81c\uacf5\ud55c\ub2e4."),
-        12: ("\uad8c\uc7a5 \uae30\uc220 \uc2a4\ud0dd \ubc0f \uad6c\ud604 \ub85c\ub4dc\ub9f5", "HPC/ML \uc6cc\ud06c\ub85c\ub4dc \uad00\ub9ac\ub97c \uc704\ud55c \uad8c\uc7a5 \uae30\uc220 \uc2a4\ud0dd\uacfc \uad6c\ud604 \ub85c\ub4dc\ub9f5\uc744 \uc815\uc758\ud55c\ub2e4."),
-    }
+class _RenderState:
+    """Mutable state threaded through the block renderers."""
+
+    __slots__ = ("doc", "sec_map", "rules", "section")
+
+    def __init__(self, doc, sec_map, rules, section):
+        self.doc = doc
+        self.sec_map = sec_map
+        self.rules = rules
+        self.section = section
+
+
+# Each renderer takes (state, blocks, i) and returns the index of the next
+# block to render.
 
+def _render_skipped(state, blocks, i):
+    # h1 is already on the cover; HRs are just section separators
+    return i + 1
+
+
+def _render_h2(state, blocks, i):
+    text = blocks[i].text
+    m = _SECTION_NUM_RE.match(text)
+    if m:
+        num = state.section = int(m.group(1))
+        sec_title = m.group(2).strip()
+        desc = state.sec_map.get(num, (sec_title, ""))[1]
+        _add_section_card(state.doc, num, f"{num}. {sec_title}", desc)
+    else:
+        _add_heading2(state.doc, text)
+    return i + 1
+
+
+def _render_subheading(state, blocks, i):
+    """``###``/``####``: a callout box if the rules say so, else a heading."""
+    b = blocks[i]
+    text = b.text.strip()
+    callout = state.rules.callout(b.type, text)
+    if callout is None:
+        _add_heading2(state.doc, text)
+        return i + 1
+    # The box collects the paragraphs and list items that follow
+    body_parts = []
+    i += 1
+    while i < len(blocks) and blocks[i].type in ("paragraph", "list_item"):
+        if blocks[i].type == "paragraph":
+            body_parts.append(blocks[i].text)
+        else:
+            body_parts.append("- " + blocks[i].text)
+        i += 1
+    title, fill = callout
+    _add_callout_box(state.doc, title, "\n\n".join(body_parts), fill)
+    return i
+
+
+def _render_table(state, blocks, i):
+    # Cover-area tables (before the first ##) are already on the cover
+    if state.section == 0:
+        return i + 1
+    rows = blocks[i].rows
+    if not rows:
+        return i + 1
+    header = [c.strip() for c in rows[0]]
+    if state.rules.is_feature_header(header):
+        _add_feature_table(state.doc, rows)
+    else:
+        _add_generic_table(state.doc, rows, col_widths=state.rules.column_widths(header, rows))
+    return i + 1
+
+
+def _render_code(state, blocks, i):
+    b = blocks[i]
+    _add_code_block(state.doc, b.text, b.lang, state.rules.code_limits)
+    return i + 1
+
+
+def _render_paragraph(state, blocks, i):
+    if state.section != 0:
+        _add_normal_paragraph(state.doc, blocks[i].text)
+    return i + 1
+
+
+def _render_list_item(state, blocks, i):
+    _add_list_item(state.doc, blocks[i].text)
+    return i + 1
+
+
+_BLOCK_RENDERERS = {
+    "h1": _render_skipped,
+    "h2": _render_h2,
+    "h3": _render_subheading,
+    "h4": _render_subheading,
+    "table": _render_table,
+    "code": _render_code,
+    "paragraph": _render_paragraph,
+    "list_item": _render_list_item,
+    "hr": _render_skipped,
+}
+
+
+def _render_blocks(doc, blocks, sec_map, current_section_num=0, flush=None, rules=None):
+    """
+    Render content blocks into ``doc`` according to the section mapping.
+    ``flush``, if given, is called before each top-level block is rendered.
+    Returns: the section number in effect after the last block.
+    """
+    state = _RenderState(doc, sec_map, rules or _load_rules(), current_section_num)
+    renderers = _BLOCK_RENDERERS
+    i = 0
+    while i < len(blocks):
+        if flush is not None:
+            flush()
+        renderer = renderers.get(blocks[i].type)
+        i = renderer(state, blocks, i) if renderer is not None else i + 1
+    return state.section
+
+
+@functools.lru_cache(maxsize=1)
+def _default_template():
+    """python-docx's default template, read from disk once per process."""
+    return (Path(docx.__file__).parent / "templates" / "default.docx").read_bytes()
+
+
+def _new_document():
+    """A fresh document from the in-memory default template."""
+    _import_docx()
+    return Document(io.BytesIO(_default_template()))
+
+
+def _add_front_matter(doc, cover=None):
+    """Cover page, section break and the page-numbered content section."""
     # ===== COVER PAGE =====
-    _add_cover_page(doc)
+    _add_cover_page(doc, cover)
 
     # ===== SECTION BREAK =====
     new_section = doc.add_section()
@@ -705,207 +1739,2404 @@ def _build_document(md_text):
     new_section.right_margin = Twips(1440)
     _add_page_number_footer(new_section)
 
+
+def _build_document(md_text, cache=None, blocks=None, workers=1, rules=None, base_dir=None,
+                    cover=None):
+    """
+    Build the complete DOCX document from markdown text.
+    With a :class:`SectionCache`, unchanged ``##`` sections are spliced in
+    from previously rendered fragments instead of being rebuilt; with
+    ``workers`` > 1 the other sections render in parallel processes.
+    ``blocks`` may pass an existing parse of ``md_text``; ``rules`` a
+    :class:`RenderRules` other than the defaults. ``base_dir`` (the markdown
+    file's directory) enables ``include=`` fences; ``cover`` overrides the
+    cover fields (see :func:`_cover_options`).
+    """
+    doc = _new_document()
+    _register_styles(doc)
+    if blocks is None:
+        blocks = _parse_markdown(md_text)
+    rules = rules or _load_rules()
+    if base_dir is not None:
+        blocks = _resolve_includes(blocks, base_dir, rules.include_max_bytes)
+    sec_map = _section_map(blocks, rules)
+
+    _add_front_matter(doc, _document_cover(blocks, rules, cover))
+
     # ===== CONTENT PAGES =====
-    # We iterate through blocks and build content according to section mapping
-    current_section_num = 0
-    i = 0
+    if cache is None and workers <= 1:
+        _render_blocks(doc, blocks, sec_map, rules=rules)
+    else:
+        _render_sections(doc, blocks, sec_map, cache, workers, rules=rules)
 
-    while i < len(blocks):
-        b = blocks[i]
+    return doc
 
-        # Skip the h1 (cover title) -- already rendered on cover
-        if b["type"] == "h1":
-            i += 1
-            continue
 
-        # Skip cover-area content (paragraphs / tables before first ##)
-        if b["type"] in ("paragraph", "table", "hr") and current_section_num == 0:
-            i += 1
-            continue
+# ===== Incremental section cache ============================================
 
-        # ---- Section heading (##) ----
-        if b["type"] == "h2":
-            m = re.match(r"(\d+)\.\s*(.*)", b["text"])
-            if m:
-                current_section_num = int(m.group(1))
-                sec_title = m.group(2).strip()
-                title_full = f"{current_section_num}. {sec_title}"
-                desc = sec_map.get(current_section_num, (sec_title, ""))[1]
-                _add_section_card(doc, current_section_num, title_full, desc)
+_SECTION_NUM_RE = re.compile(r"(\d+)\.\s*(.*)")
+# "4.2 제목" / "4.2.1. 제목": the ## number, the rest of the number, the title
+_SUBSECTION_NUM_RE = re.compile(r"(\d+)((?:\.\d+)+)\.?\s+(.*)")
+_FRAGMENT_OPEN = b'<w:fragment xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+_FRAGMENT_CLOSE = b"</w:fragment>"
+
+
+class SectionCache:
+    """
+    Persistent store of rendered ``##`` section fragments.
+
+    Each entry is the body XML one section produced, keyed by a hash of the
+    section's blocks, its render context and the renderer version.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.xml"
+
+    def get(self, key):
+        try:
+            data = self._path(key).read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic replace: batch workers may write the same key concurrently
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+@functools.lru_cache(maxsize=1)
+def _renderer_fingerprint():
+    """RENDERER_VERSION plus a digest of this module's source."""
+    digest = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+    return f"{RENDERER_VERSION}:{digest}"
+
+
+def _split_sections(blocks):
+    """
+    Split the block stream at ``##`` headings.
+    Returns: list of (start, end) index ranges; the first range is the
+    preamble before the first ``##`` and may be empty.
+    """
+    bounds = [i for i, b in enumerate(blocks) if b.type == "h2"]
+    return list(zip([0] + bounds, bounds + [len(blocks)]))
+
+
+def _section_key(blocks, context):
+    h = hashlib.sha256(_renderer_fingerprint().encode())
+    h.update(repr(context).encode())
+    for b in blocks:
+        h.update(repr(b.content()).encode())
+    return h.hexdigest()
+
+
+def _splice_fragment(body, data):
+    """Insert a serialized section fragment ahead of the body sectPr."""
+    sect_pr = body.sectPr
+    for el in list(parse_xml(_FRAGMENT_OPEN + data + _FRAGMENT_CLOSE)):
+        sect_pr.addprevious(el)
+
+
+# ===== Parallel section rendering ===========================================
+
+@functools.lru_cache(maxsize=1)
+def _scratch_document():
+    """
+    Per-process document that worker renders go into. It has the same styles
+    and content-section geometry as a real build, so table widths match.
+    """
+    doc = _new_document()
+    _register_styles(doc)
+    _add_front_matter(doc)
+    return doc
+
+
+def _render_fragment(section, sec_map, current, rules):
+    """
+    Worker entry point: render one ``##`` section and return its body XML.
+    Rendered elements stay in the scratch doc: detaching them would make lxml
+    reconcile namespaces over every subtree, which costs about as much as
+    building it. The worker process ends with the build.
+    """
+    doc = _scratch_document()
+    body = doc.element.body
+    n0 = len(body)
+    _render_blocks(doc, section, sec_map, current, rules=rules)
+    return b"".join(etree.tostring(el, encoding="UTF-8") for el in body[n0 - 1:-1])
+
+
+def _render_sections(doc, blocks, sec_map, cache=None, workers=1, flush=None, rules=None):
+    """
+    Render blocks section by section.
+
+    With a cache, unchanged sections are spliced in from stored fragments.
+    With ``workers`` > 1, the sections still to render are rendered in worker
+    processes (largest first) and their fragments merged in document order.
+    ``flush``, if given, is called after each section.
+    """
+    body = doc.element.body
+    ranges = _split_sections(blocks)
+    rules = rules or _load_rules()
+
+    start, end = ranges[0]
+    current = _render_blocks(doc, blocks[start:end], sec_map, flush=flush, rules=rules)
+
+    # Section contexts depend only on the headings, so resolve them up front:
+    # (blocks, section number in effect at its start, cache key, cached fragment)
+    sections = []
+    for start, end in ranges[1:]:
+        section = blocks[start:end]
+        m = _SECTION_NUM_RE.match(section[0].text)
+        if m:
+            num = int(m.group(1))
+            desc = sec_map.get(num, (m.group(2).strip(), ""))[1]
+        else:
+            num, desc = current, None
+        key = data = None
+        if cache is not None:
+            # Render output depends on the card description, on whether the
+            # cover-area skip rule is still active when the section starts
+            # and on the rendering rules.
+            key = _section_key(section, (current == 0, desc, rules.digest))
+            data = cache.get(key)
+        sections.append((section, current, key, data))
+        current = num
+
+    pending = [i for i, (_, _, _, data) in enumerate(sections) if data is None]
+    pool = None
+    futures = {}
+    if workers > 1 and len(pending) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=min(workers, len(pending)))
+        for i in sorted(pending, key=lambda i: -len(sections[i][0])):
+            section, current = sections[i][:2]
+            futures[i] = pool.submit(_render_fragment, section, sec_map, current, rules)
+
+    try:
+        for i, (section, current, key, cached) in enumerate(sections):
+            if cached is not None:
+                _splice_fragment(body, cached)
             else:
-                _add_heading2(doc, b["text"])
-            i += 1
+                if i in futures:
+                    data = futures[i].result()
+                    _splice_fragment(body, data)
+                else:
+                    n0 = len(body)
+                    _render_blocks(doc, section, sec_map, current, rules=rules)
+                    # New content is inserted before the trailing body sectPr
+                    data = b"".join(etree.tostring(el, encoding="UTF-8")
+                                    for el in body[n0 - 1:-1]) if cache is not None else None
+                if cache is not None:
+                    cache.put(key, data)
+            if flush is not None:
+                flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+# ===== Build manifest =======================================================
+
+class BuildManifest:
+    """
+    Record of what each output was built from, for skipping unchanged builds.
+
+    Entries are keyed by resolved output path and hold a build key (input hash,
+    renderer fingerprint and options) plus the hash of the bytes written, so
+    an edited or deleted output is rebuilt too.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        try:
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def build_key(md_bytes, options, includes=()):
+        """``includes``: the :func:`_include_stamps` of the input."""
+        h = hashlib.sha256(_renderer_fingerprint().encode())
+        h.update(json.dumps(options, sort_keys=True).encode())
+        h.update(json.dumps(includes).encode())
+        h.update(md_bytes)
+        return h.hexdigest()
+
+    def is_current(self, docx_path, key):
+        entry = self.entries.get(str(docx_path.resolve()))
+        if entry is None or entry["key"] != key:
+            return False
+        try:
+            data = docx_path.read_bytes()
+        except OSError:
+            return False
+        return hashlib.sha256(data).hexdigest() == entry["output_sha256"]
+
+    def record(self, md_path, docx_path, key, options):
+        self.entries[str(docx_path.resolve())] = {
+            "key": key,
+            "input": str(md_path),
+            "input_sha256": hashlib.sha256(md_path.read_bytes()).hexdigest(),
+            "renderer": _renderer_fingerprint(),
+            "options": options,
+            "output_sha256": hashlib.sha256(docx_path.read_bytes()).hexdigest(),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self.entries, indent=1, sort_keys=True, ensure_ascii=False),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+# ===== Package writer =======================================================
+
+_CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+# Fixed zip entry metadata: identical content gives byte-identical .docx files
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _content_types_xml(parts):
+    """``[Content_Types].xml`` with an explicit override for every part."""
+    types = etree.Element(f"{{{_CT_NS}}}Types", nsmap={None: _CT_NS})
+    for ext, content_type in (
+        ("rels", "application/vnd.openxmlformats-package.relationships+xml"),
+        ("xml", "application/xml"),
+    ):
+        etree.SubElement(types, f"{{{_CT_NS}}}Default", Extension=ext, ContentType=content_type)
+    for part in parts:
+        etree.SubElement(types, f"{{{_CT_NS}}}Override",
+                         PartName=str(part.partname), ContentType=part.content_type)
+    return etree.tostring(types, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def _zip_info(name):
+    """Zip entry header with a fixed timestamp, mode and compression."""
+    import zipfile
+
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.create_system = 3
+    info.external_attr = 0o644 << 16
+    return info
+
+
+def _write_package_head(zf, parts, package):
+    zf.writestr(_zip_info("[Content_Types].xml"), _content_types_xml(parts))
+    zf.writestr(_zip_info("_rels/.rels"), package.rels.xml)
+
+
+def _write_package_parts(zf, parts, skip=None):
+    """Write each part (and its rels) in package graph order."""
+    for part in parts:
+        if part is skip:
             continue
+        zf.writestr(_zip_info(part.partname.membername), part.blob)
+        if len(part.rels):
+            zf.writestr(_zip_info(part.partname.rels_uri.membername), part.rels.xml)
 
-        # ---- Sub-section heading (###) ----
-        if b["type"] == "h3":
-            text = b["text"].strip()
-
-            # Callout boxes for specific subsections
-            if text == "\ud575\uc2ec \uac1c\ub150":
-                # Collect following paragraphs until next heading or table
-                body_parts = []
-                i += 1
-                while i < len(blocks) and blocks[i]["type"] in ("paragraph", "list_item"):
-                    if blocks[i]["type"] == "paragraph":
-                        body_parts.append(blocks[i]["text"])
-                    elif blocks[i]["type"] == "list_item":
-                        body_parts.append("- " + blocks[i]["text"])
-                    i += 1
-                body = "\n\n".join(body_parts)
-                _add_callout_box(doc, "\ud575\uc2ec \uac1c\ub150", body, CLR_LIGHT_YELLOW)
-                continue
 
-            elif text == "\uc6b4\uc601 \ubc94\uc704":
-                body_parts = []
-                i += 1
-                while i < len(blocks) and blocks[i]["type"] in ("paragraph", "list_item"):
-                    if blocks[i]["type"] == "paragraph":
-                        body_parts.append(blocks[i]["text"])
-                    elif blocks[i]["type"] == "list_item":
-                        body_parts.append("- " + blocks[i]["text"])
-                    i += 1
-                body = "\n\n".join(body_parts)
-                _add_callout_box(doc, "\uc6b4\uc601 \ubc94\uc704", body, CLR_LIGHT_BLUE)
-                continue
+def _save_document(doc, out):
+    """
+    Save ``doc`` to ``out`` (path or binary file) deterministically.
+    Replaces ``doc.save``: entry order follows the package graph and every
+    entry gets the same timestamp and attributes.
+    """
+    import zipfile
 
-            elif text == "RL \ud559\uc2b5 \ud30c\ub77c\ubbf8\ud130":
-                body_parts = []
-                i += 1
-                while i < len(blocks) and blocks[i]["type"] in ("paragraph", "list_item"):
-                    if blocks[i]["type"] == "paragraph":
-                        body_parts.append(blocks[i]["text"])
-                    elif blocks[i]["type"] == "list_item":
-                        body_parts.append("- " + blocks[i]["text"])
-                    i += 1
-                body = "\n\n".join(body_parts)
-                _add_callout_box(doc, "RL \ud559\uc2b5 \ud30c\ub77c\ubbf8\ud130", body, CLR_LIGHT_YELLOW)
-                continue
+    package = doc.part.package
+    parts = list(package.iter_parts())
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        _write_package_head(zf, parts, package)
+        _write_package_parts(zf, parts)
+
+
+# ===== Streaming backend ====================================================
+
+def _flush_body(xf, body):
+    """Serialize everything rendered ahead of the body sectPr and drop it from the tree."""
+    sect_pr = body.sectPr
+    el = body[0]
+    while el is not sect_pr:
+        # Detached elements declare only the namespaces they use
+        body.remove(el)
+        xf.write(el)
+        el = body[0]
 
+
+def _build_streaming(md_text, out, cache=None, blocks=None, workers=1, rules=None,
+                     base_dir=None, cover=None):
+    """
+    Build the DOCX for ``md_text`` straight into ``out`` (path or binary file).
+
+    Renders with the same helpers as :func:`_build_document`, but streams
+    ``word/document.xml`` into the zip with an incremental XML writer and
+    drops each block's elements once written. Peak memory is bounded by the
+    largest block (largest section with a cache or workers), not the document.
+    """
+    import zipfile
+
+    doc = _new_document()
+    _register_styles(doc)
+    if blocks is None:
+        blocks = _parse_markdown(md_text)
+    rules = rules or _load_rules()
+    if base_dir is not None:
+        blocks = _resolve_includes(blocks, base_dir, rules.include_max_bytes)
+    sec_map = _section_map(blocks, rules)
+    _add_front_matter(doc, _document_cover(blocks, rules, cover))
+
+    package = doc.part.package
+    main = doc.part
+    parts = list(package.iter_parts())
+    root = doc.element
+    body = root.body
+
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        _write_package_head(zf, parts, package)
+
+        with zf.open(_zip_info(main.partname.membername), "w") as raw, \
+                etree.xmlfile(raw, encoding="UTF-8") as xf:
+            xf.write_declaration(standalone=True)
+            with xf.element(root.tag, attrib=dict(root.attrib), nsmap=root.nsmap):
+                with xf.element(body.tag, attrib=dict(body.attrib)):
+                    flush = functools.partial(_flush_body, xf, body)
+                    if cache is None and workers <= 1:
+                        _render_blocks(doc, blocks, sec_map, flush=flush, rules=rules)
+                    else:
+                        _render_sections(doc, blocks, sec_map, cache, workers, flush, rules)
+                    flush()
+                    sect_pr = body.sectPr
+                    body.remove(sect_pr)
+                    xf.write(sect_pr)
+        if len(main.rels):
+            zf.writestr(_zip_info(main.partname.rels_uri.membername), main.rels.xml)
+        _write_package_parts(zf, parts, skip=main)
+
+
+# ===== Profiling ============================================================
+
+# Construction helper -> block type; these are the _render_blocks dispatch targets
+_PROFILED_BLOCKS = {
+    "_add_section_card": "section_card",
+    "_add_heading2": "heading",
+    "_add_callout_box": "callout",
+    "_add_feature_table": "feature_table",
+    "_add_generic_table": "generic_table",
+    "_add_code_block": "code_block",
+    "_add_normal_paragraph": "paragraph",
+    "_add_list_item": "list_item",
+}
+_PROFILED_HELPERS = (
+    "_cell_format", "_apply_cell_format", "_ppr_proto", "_set_paragraph_format",
+    "_rpr_proto", "_make_run", "_add_bulk_table", "_add_rich_text", "_inline_tokens",
+    "_code_cells_xml", "_content_column_widths", "_set_table_borders", "_set_table_width",
+    "_set_table_grid", "_add_page_number_footer", "_register_styles", "_add_cover_page",
+)
+# Held while a profiler has the module helpers swapped out
+_instrument_lock = threading.Lock()
+
+
+class BuildProfiler:
+    """
+    Per-block-type and per-helper timings for one build.
+
+    While :meth:`instrument` is active, the module-level construction helpers
+    are replaced by timing wrappers, so ``_render_blocks`` dispatches through
+    them unchanged. Block time is attributed to the ``##`` section whose card
+    was rendered last.
+
+    The swap is process-wide, so only one profiler instruments at a time.
+    Builds in other threads (e.g. :func:`convert` calls) still produce the
+    same output while it is active; the wrappers pass them through unrecorded.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.blocks = {}
+        self.helpers = {}
+        self.sections = []
+        self._section = None
+        self._thread = None
+
+    def phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def _record(self, table, name, seconds, elements=None):
+        stat = table.get(name)
+        if stat is None:
+            stat = table[name] = {"calls": 0, "seconds": 0.0}
+            if elements is not None:
+                stat["elements"] = 0
+        stat["calls"] += 1
+        stat["seconds"] += seconds
+        if elements is not None:
+            stat["elements"] += elements
+
+    def _wrap_block(self, fn, kind):
+        @functools.wraps(fn)
+        def wrapper(doc, *args, **kwargs):
+            if threading.get_ident() != self._thread:
+                return fn(doc, *args, **kwargs)
+            body = doc.element.body
+            n0 = len(body)
+            t0 = time.perf_counter()
+            result = fn(doc, *args, **kwargs)
+            seconds = time.perf_counter() - t0
+            # New content lands just before the trailing body sectPr
+            elements = sum(1 for el in body[n0 - 1:-1] for _ in el.iter())
+            self._record(self.blocks, kind, seconds, elements)
+            if kind == "section_card":
+                self._section = {"heading": args[1], "seconds": 0.0, "elements": 0}
+                self.sections.append(self._section)
+            if self._section is not None:
+                self._section["seconds"] += seconds
+                self._section["elements"] += elements
+            return result
+        return wrapper
+
+    def _wrap_helper(self, fn, name):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if threading.get_ident() != self._thread:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record(self.helpers, name, time.perf_counter() - t0)
+        return wrapper
+
+    @contextlib.contextmanager
+    def instrument(self):
+        """
+        Swap the profiled helpers for timing wrappers for the duration,
+        recording calls from the current thread only. Blocks while another
+        profiler is instrumenting.
+        """
+        module = globals()
+        with _instrument_lock:
+            originals = {name: module[name] for name in (*_PROFILED_BLOCKS, *_PROFILED_HELPERS)}
+            self._thread = threading.get_ident()
+            for name, kind in _PROFILED_BLOCKS.items():
+                module[name] = self._wrap_block(originals[name], kind)
+            for name in _PROFILED_HELPERS:
+                module[name] = self._wrap_helper(originals[name], name)
+            try:
+                yield self
+            finally:
+                module.update(originals)
+                self._thread = None
+
+    def report(self, top=10):
+        by_time = lambda item: -item[1]["seconds"]  # noqa: E731
+        return {
+            "phases": self.phases,
+            "blocks": dict(sorted(self.blocks.items(), key=by_time)),
+            "helpers": dict(sorted(self.helpers.items(), key=by_time)),
+            "slowest_sections": sorted(self.sections, key=lambda s: -s["seconds"])[:top],
+        }
+
+
+def _profile_file(md_path, docx_path, backend="docx", top=10, cprofile_path=None,
+                  trace=False, rules=None):
+    """
+    Convert one file uncached under :class:`BuildProfiler` (and optionally
+    cProfile / tracemalloc). Returns: the JSON-ready report.
+    """
+    import cProfile
+    import tracemalloc
+
+    prof = BuildProfiler()
+    cprof = cProfile.Profile() if cprofile_path is not None else None
+    if trace:
+        tracemalloc.start()
+    if cprof is not None:
+        cprof.enable()
+    try:
+        with prof.instrument():
+            t0 = time.perf_counter()
+            md_text = md_path.read_text(encoding="utf-8")
+            blocks = _parse_markdown(md_text)
+            prof.phase("parse", time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            if backend == "stream":
+                # Build and save are interleaved in the streaming backend
+                _build_streaming(md_text, str(docx_path), blocks=blocks, rules=rules,
+                                 base_dir=md_path.parent)
+                prof.phase("build+save", time.perf_counter() - t0)
             else:
-                _add_heading2(doc, text)
-                i += 1
-                continue
+                doc = _build_document(md_text, blocks=blocks, rules=rules,
+                                      base_dir=md_path.parent)
+                prof.phase("build", time.perf_counter() - t0)
+                t0 = time.perf_counter()
+                _save_document(doc, str(docx_path))
+                prof.phase("save", time.perf_counter() - t0)
+    finally:
+        if cprof is not None:
+            cprof.disable()
+        snapshot = tracemalloc.take_snapshot() if trace else None
+        peak = tracemalloc.get_traced_memory()[1] if trace else None
+        if trace:
+            tracemalloc.stop()
+
+    report = {"source": str(md_path), "output": str(docx_path), "backend": backend,
+              "blocks_parsed": len(blocks)}
+    report.update(prof.report(top))
+    if cprof is not None:
+        cprof.dump_stats(str(cprofile_path))
+        report["cprofile"] = str(cprofile_path)
+    if snapshot is not None:
+        report["tracemalloc"] = {
+            "peak_kb": peak // 1024,
+            "top": [{"site": str(stat.traceback), "kb": stat.size // 1024, "count": stat.count}
+                    for stat in snapshot.statistics("lineno")[:top]],
+        }
+    return report
+
+
+# ===== Spec diff ============================================================
+
+_VERSION_IN_NAME_RE = re.compile(r"_v(\d+)[._](\d+)")
+_CHANGE_IN_NAME_RE = re.compile(r"_v(\d+)[._](\d+)_to_v(\d+)[._](\d+)")
+
+
+def _cover_rows(blocks):
+    """
+    (label, value) rows of the cover metadata table, the first table before
+    any ``##`` (its header row is skipped), or None without one.
+    """
+    for b in blocks:
+        if b.type == "h2":
+            break
+        if b.type == "table":
+            rows = [(row[0].strip(), row[1].strip())
+                    for row in map(b.row, range(1, b.nrows)) if len(row) >= 2]
+            return rows or None
+    return None
 
-        # ---- Sub-sub-section heading (####) ----
-        if b["type"] == "h4":
-            text = b["text"].strip()
-
-            # Callout for "테스트 및 승인 프로세스 개요"
-            if "\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778 \ud504\ub85c\uc138\uc2a4 \uac1c\uc694" in text or "\ud504\ub85c\uc138\uc2a4 \uac1c\uc694" in text:
-                body_parts = []
-                i += 1
-                while i < len(blocks) and blocks[i]["type"] in ("paragraph", "list_item"):
-                    if blocks[i]["type"] == "paragraph":
-                        body_parts.append(blocks[i]["text"])
-                    elif blocks[i]["type"] == "list_item":
-                        body_parts.append("- " + blocks[i]["text"])
-                    i += 1
-                body = "\n\n".join(body_parts)
-                _add_callout_box(doc, "\ud14c\uc2a4\ud2b8 \ubc0f \uc2b9\uc778 \ud504\ub85c\uc138\uc2a4 \uac1c\uc694", body, CLR_LIGHT_YELLOW)
-                continue
+
+def _cover_version(blocks):
+    """Version from the cover metadata table ("버전" row), or None."""
+    for label, value in _cover_rows(blocks) or ():
+        if label == "\ubc84\uc804":
+            return value
+    return None
+
+
+def _document_cover(blocks, rules, overrides=None):
+    """
+    ``rules.cover`` with the metadata rows of the document's own cover table,
+    then the :func:`_cover_options` ``overrides`` applied on top.
+    """
+    cover = dict(rules.cover)
+    rows = _cover_rows(blocks)
+    if rows is not None:
+        cover["metadata"] = tuple(rows)
+    for key, value in (overrides or {}).items():
+        if key == "metadata":
+            if isinstance(value, dict):
+                # Set rows by label, keeping their order; new labels go last
+                value = {**dict(cover["metadata"]), **value}.items()
+            value = tuple(tuple(row) for row in value)
+        cover[key] = value
+    return cover
+
+
+def _spec_version(blocks, path):
+    """
+    Version from the cover metadata table, else from the file name. A
+    changelog (``..._v1.5_to_v1.6``) is keyed "1.5→1.6", apart from both specs.
+    """
+    version = _cover_version(blocks)
+    if version is not None:
+        return version
+    m = _CHANGE_IN_NAME_RE.search(Path(path).stem)
+    if m:
+        return f"{m.group(1)}.{m.group(2)}\u2192{m.group(3)}.{m.group(4)}"
+    m = _VERSION_IN_NAME_RE.search(Path(path).stem)
+    return f"{m.group(1)}.{m.group(2)}" if m else Path(path).stem
+
+
+def _subsection_key(text):
+    """
+    (number below the ``##`` section, title) of a ``###``/``####`` heading:
+    "4.2 RL 학습 파라미터" gives (".2", "RL 학습 파라미터").
+    """
+    m = _SUBSECTION_NUM_RE.match(text)
+    return (m.group(2), m.group(3).strip()) if m else ("", text.strip())
+
+
+def _diff_content(b, numbered=True):
+    """
+    Block content for diffing. Subsection headings drop the ``##`` number (so
+    a renumbered section is unchanged), and all of their number unless
+    ``numbered``.
+    """
+    if b.type in ("h3", "h4"):
+        number, title = _subsection_key(b.text)
+        return (b.type, number, title) if numbered else (b.type, title)
+    return b.content()
+
+
+def _blocks_digest(blocks):
+    h = hashlib.blake2b(digest_size=16)
+    for b in blocks:
+        h.update(repr(_diff_content(b)).encode())
+    return h.digest()
+
+
+def _subsections(blocks):
+    """``###``/``####`` headings of a section keyed by (title, occurrence)."""
+    subs = {}
+    seen = {}
+    for b in blocks:
+        if b.type in ("h3", "h4"):
+            title = _subsection_key(b.text)[1]
+            seen[title] = seen.get(title, 0) + 1
+            subs[(title, seen[title])] = b.text
+    return subs
+
+
+class SpecIndex:
+    """
+    Hash indexes over one parsed spec: ``##`` sections keyed by title (number
+    stripped, so renumbered sections still match) and feature-table rows
+    keyed by feature ID.
+    """
+
+    def __init__(self, blocks):
+        self.sections = {}  # key -> (heading, blocks, digest, number or None, title)
+        self.features = {}  # ID -> (header, row, section heading)
+        seen = {}
+        for start, end in _split_sections(blocks)[1:]:
+            section = blocks[start:end]
+            heading = section[0].text
+            m = _SECTION_NUM_RE.match(heading)
+            title = m.group(2).strip() if m else heading.strip()
+            # Repeated titles (e.g. two "변경 개요") are told apart by occurrence
+            seen[title] = seen.get(title, 0) + 1
+            key = (title, seen[title])
+            # The number is left out, so a renumbered section is unchanged
+            digest = hashlib.blake2b(title.encode() + _blocks_digest(section[1:]),
+                                     digest_size=16).digest()
+            self.sections[key] = (heading, section, digest, int(m.group(1)) if m else None,
+                                  title)
+            for b in section:
+                if b.type != "table" or b.nrows < 2:
+                    continue
+                header = b.row(0)
+                if not _is_feature_header(header):
+                    continue
+                for ri in range(1, b.nrows):
+                    row = tuple(b.row(ri))
+                    if row and row[0]:
+                        self.features[row[0]] = (header, row, heading)
+
+
+def _diff_specs(old_blocks, new_blocks):
+    """
+    Structural diff of two parsed specs via :class:`SpecIndex` lookups.
+    Returns: dict of added/removed/modified sections and features.
+    """
+    old, new = SpecIndex(old_blocks), SpecIndex(new_blocks)
+
+    # Match sections by title; a retitled section falls back to its number
+    pairs = {k: k for k in new.sections if k in old.sections}
+    unmatched_old = {old.sections[k][3]: k for k in old.sections
+                     if k not in new.sections and old.sections[k][3] is not None}
+    for key, (_, _, _, num, _) in new.sections.items():
+        if key not in pairs and num in unmatched_old:
+            pairs[key] = unmatched_old.pop(num)
+    matched_old = set(pairs.values())
+
+    sections_added = [new.sections[k][0] for k in new.sections if k not in pairs]
+    sections_removed = [old.sections[k][0] for k in old.sections if k not in matched_old]
+    sections_modified = []
+    for key, (heading, blocks, digest, _, title) in new.sections.items():
+        if key not in pairs:
+            continue
+        prev_heading, prev_blocks, prev_digest, _, prev_title = old.sections[pairs[key]]
+        if prev_digest == digest:
+            continue
+        # Block multisets: counts of added/removed blocks without pairwise diffing;
+        # a renumbered subsection heading is neither
+        before = collections.Counter(_diff_content(b, False) for b in prev_blocks[1:])
+        after = collections.Counter(_diff_content(b, False) for b in blocks[1:])
+        subs_before, subs_after = _subsections(prev_blocks), _subsections(blocks)
+        sections_modified.append({
+            "heading": heading,
+            "old_heading": prev_heading,
+            "title_changed": prev_title != title,
+            "blocks_added": sum((after - before).values()),
+            "blocks_removed": sum((before - after).values()),
+            "subsections_added": [t for k, t in subs_after.items() if k not in subs_before],
+            "subsections_removed": [t for k, t in subs_before.items() if k not in subs_after],
+            "subsections_renumbered": [
+                (subs_before[k], t) for k, t in subs_after.items()
+                if k in subs_before and subs_before[k] != t],
+        })
+
+    features_added = [new.features[f] for f in new.features if f not in old.features]
+    features_removed = [old.features[f] for f in old.features if f not in new.features]
+    features_modified = []
+    for fid, (header, row, heading) in new.features.items():
+        prev = old.features.get(fid)
+        if prev is None or prev[1] == row:
+            continue
+        old_row = prev[1]
+        changes = []
+        for ci in range(max(len(row), len(old_row))):
+            before = old_row[ci] if ci < len(old_row) else ""
+            after = row[ci] if ci < len(row) else ""
+            if before != after:
+                changes.append((header[ci] if ci < len(header) else str(ci + 1), before, after))
+        features_modified.append((fid, heading, changes))
+
+    return {
+        "sections_added": sections_added,
+        "sections_removed": sections_removed,
+        "sections_modified": sections_modified,
+        "features_added": features_added,
+        "features_removed": features_removed,
+        "features_modified": features_modified,
+    }
+
+
+def _md_cell(text):
+    return str(text).replace("|", "\\|").replace("\n", " ")
+
+
+def _md_table(header, rows):
+    lines = ["| " + " | ".join(map(_md_cell, header)) + " |",
+             "|" + "|".join("------" for _ in header) + "|"]
+    lines.extend("| " + " | ".join(map(_md_cell, row)) + " |" for row in rows)
+    return lines
+
+
+def _changelog_markdown(title, old_version, new_version, diff):
+    """Changelog markdown in the layout of the hand-written 변경사항 documents."""
+    out = [f"# {title} \ubcc0\uacbd\uc0ac\ud56d (v{old_version} \u2192 v{new_version})", ""]
+    counts = [
+        ("\ucd94\uac00\ub41c \uc139\uc158", len(diff["sections_added"])),
+        ("\uc0ad\uc81c\ub41c \uc139\uc158", len(diff["sections_removed"])),
+        ("\ubcc0\uacbd\ub41c \uc139\uc158", len(diff["sections_modified"])),
+        ("\ucd94\uac00\ub41c \uae30\ub2a5", len(diff["features_added"])),
+        ("\uc0ad\uc81c\ub41c \uae30\ub2a5", len(diff["features_removed"])),
+        ("\ubcc0\uacbd\ub41c \uae30\ub2a5", len(diff["features_modified"])),
+    ]
+    # Numbered throughout: an unnumbered ## counts as cover area and drops its table
+    out += ["## 1. \ubcc0\uacbd \uac1c\uc694", ""]
+    out += _md_table(["\ud56d\ubaa9", "\uc218\ub7c9"], counts)
+    out += ["", "---", ""]
+
+    # ---- 2. Section changes ----
+    out += ["## 2. \uc139\uc158 \ubcc0\uacbd", ""]
+    rows = [(h, "\ucd94\uac00", "") for h in diff["sections_added"]]
+    rows += [(h, "\uc0ad\uc81c", "") for h in diff["sections_removed"]]
+    for sec in diff["sections_modified"]:
+        details = [f"\ube14\ub85d +{sec['blocks_added']} / -{sec['blocks_removed']}"]
+        if sec["title_changed"]:
+            details.append(f"\uc81c\ubaa9 \ubcc0\uacbd: {sec['old_heading']}")
+        if sec["subsections_added"]:
+            details.append("\ud558\uc704 \ucd94\uac00: " + ", ".join(sec["subsections_added"]))
+        if sec["subsections_removed"]:
+            details.append("\ud558\uc704 \uc0ad\uc81c: " + ", ".join(sec["subsections_removed"]))
+        if sec["subsections_renumbered"]:
+            details.append("\ud558\uc704 \ubc88\ud638 \ubcc0\uacbd: " + ", ".join(
+                f"{before} \u2192 {after}" for before, after in sec["subsections_renumbered"]))
+        rows.append((sec["heading"], "\ubcc0\uacbd", "; ".join(details)))
+    if rows:
+        out += _md_table(["\uc139\uc158", "\ubcc0\uacbd", "\uc0c1\uc138"], rows)
+    else:
+        out.append("\ubcc0\uacbd\ub41c \uc139\uc158\uc774 \uc5c6\uc2b5\ub2c8\ub2e4.")
+    out += ["", "---", ""]
+
+    # ---- 3. Feature changes ----
+    out += ["## 3. \uae30\ub2a5 \ubcc0\uacbd", ""]
+    for sub, label, features in (
+        ("3.1", "\ucd94\uac00\ub41c \uae30\ub2a5", diff["features_added"]),
+        ("3.2", "\uc0ad\uc81c\ub41c \uae30\ub2a5", diff["features_removed"]),
+    ):
+        out += [f"### {sub} {label}", ""]
+        if features:
+            # Feature-table layout, so the docx renders it like the spec itself
+            out += _md_table(features[0][0][:5], [row[:5] for _, row, _ in features])
+        else:
+            out.append("\uc5c6\uc74c")
+        out.append("")
+    out += ["### 3.3 \ubcc0\uacbd\ub41c \uae30\ub2a5", ""]
+    rows = [(fid, column, before, after)
+            for fid, _, changes in diff["features_modified"]
+            for column, before, after in changes]
+    if rows:
+        out += _md_table(["ID", "\ud56d\ubaa9", "\ubcc0\uacbd \uc804", "\ubcc0\uacbd \ud6c4"], rows)
+    else:
+        out.append("\uc5c6\uc74c")
+    out.append("")
+    return "\n".join(out)
+
+
+def _changelog_rules(old_version, new_version, diff):
+    """
+    Rules for rendering a changelog: no spec section descriptions on the cards and
+    a cover naming the two versions instead of the spec's metadata.
+    """
+    spec = _load_rules().spec
+    sections = len(diff["sections_added"]) + len(diff["sections_removed"]) \
+        + len(diff["sections_modified"])
+    features = len(diff["features_added"]) + len(diff["features_removed"]) \
+        + len(diff["features_modified"])
+    cover = {
+        "title": spec["cover"]["title"],
+        "subtitle": "\uae30\ub2a5 \uba85\uc138\uc11c \ubcc0\uacbd\uc0ac\ud56d",
+        "workflow": f"v{old_version} \u2192 v{new_version}",
+        "description": f"\uc139\uc158 \ubcc0\uacbd {sections}\uac74 \u00b7 "
+                       f"\uae30\ub2a5 \ubcc0\uacbd {features}\uac74",
+        "metadata": [["\uc774\uc804 \ubc84\uc804", old_version],
+                     ["\uc2e0\uaddc \ubc84\uc804", new_version]],
+    }
+    return RenderRules({**spec, "sections": {}, "cover": cover})
+
+
+# ===== IR export ============================================================
+# The parsed block IR as JSON for the React demo app: per spec, a small
+# manifest and one compact chunk per ``##`` section, so a page fetches only
+# the section it shows. Written from the same parse as the docx build.
+
+def _write_if_changed(path, data):
+    """Write ``data`` unless ``path`` already holds it (keeps dev-server mtimes)."""
+    try:
+        if path.read_bytes() == data:
+            return
+    except OSError:
+        pass
+    path.write_bytes(data)
+
+
+def _compact_json(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _export_ir(blocks, md_path, out_dir):
+    """
+    Write ``out_dir/<stem>/manifest.json`` and the section chunks ``sNN.json``
+    for ``md_path`` (``s00.json`` is the cover-area preamble before the first
+    ``##``). Blocks are their :meth:`Block.to_dict` form plus source ``line``.
+    Returns: the manifest.
+    """
+    spec_dir = Path(out_dir) / md_path.stem
+    spec_dir.mkdir(parents=True, exist_ok=True)
+    sections = []
+    for si, (start, end) in enumerate(_split_sections(blocks)):
+        chunk = blocks[start:end]
+        data = _compact_json([dict(b.to_dict(), line=b.start) for b in chunk])
+        name = f"s{si:02d}.json"
+        _write_if_changed(spec_dir / name, data)
+        heading = chunk[0].text if si else ""
+        m = _SECTION_NUM_RE.match(heading) if si else None
+        sections.append({
+            "file": name,
+            "number": int(m.group(1)) if m else None,
+            "heading": heading,
+            "line": chunk[0].start if chunk else None,
+            "blocks": len(chunk),
+            "bytes": len(data),
+            "sha256": hashlib.sha256(data).hexdigest()[:16],
+        })
+    names = {s["file"] for s in sections}
+    for stale in spec_dir.glob("s*.json"):
+        if stale.name not in names:
+            stale.unlink()
+
+    manifest = {
+        "source": md_path.name,
+        "title": next((b.text for b in blocks if b.type == "h1"), md_path.stem),
+        "version": _spec_version(blocks, md_path),
+        "sections": sections,
+    }
+    _write_if_changed(spec_dir / "manifest.json", _compact_json(manifest))
+    return manifest
+
+
+def _ir_exported(out_dir, md_path):
+    """True when ``out_dir`` holds the manifest and every section chunk of ``md_path``."""
+    spec_dir = Path(out_dir) / md_path.stem
+    try:
+        manifest = json.loads((spec_dir / "manifest.json").read_bytes())
+        return all((spec_dir / s["file"]).is_file() for s in manifest["sections"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return False
+
+
+def _write_ir_index(out_dir, md_files):
+    """``out_dir/index.json``: the specs whose manifests exist under ``out_dir``."""
+    specs = []
+    for md_file in md_files:
+        try:
+            manifest = json.loads((out_dir / md_file.stem / "manifest.json").read_bytes())
+        except (OSError, ValueError):
+            continue  # failed conversion
+        specs.append({
+            "id": md_file.stem,
+            "title": manifest["title"],
+            "version": manifest["version"],
+            "manifest": f"{md_file.stem}/manifest.json",
+            "sections": len(manifest["sections"]),
+        })
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _write_if_changed(out_dir / "index.json", _compact_json({"specs": specs}))
+
+
+# ===== Search index =========================================================
+# A persistent inverted index over every indexed spec version. Hangul runs
+# are indexed as character bigrams (so 우선순위 is found inside 우선순위별),
+# Latin and digit runs as lowercase words, matched by prefix (so gp finds
+# GPU). Each entry is one block, one table row or one code block, with its
+# version, ## section, block type and, for feature-table rows, the feature
+# ID. Stored in SQLite so a query reads only the postings it needs.
+
+_TERM_RE = re.compile(r"[\uac00-\ud7a3]+|[0-9A-Za-z_]+")
+
+
+def _search_terms(text, query=False):
+    """
+    Index terms of ``text``: Hangul bigrams and lowercase Latin/digit words.
+    A one-syllable Hangul run is its own term when indexing; in a query it
+    has no term and is matched by the substring check alone.
+    """
+    terms = set()
+    for m in _TERM_RE.finditer(text):
+        tok = m.group()
+        if "\uac00" <= tok[0] <= "\ud7a3":
+            if len(tok) == 1:
+                if not query:
+                    terms.add(tok)
             else:
-                _add_heading2(doc, text)
-                i += 1
+                terms.update(tok[i:i + 2] for i in range(len(tok) - 1))
+        else:
+            terms.add(tok.lower())
+    return terms
+
+
+def _search_entries(blocks):
+    """(line, section, block type, feature ID, text) for each searchable unit."""
+    section = ""
+    for b in blocks:
+        if b.type == "h2":
+            section = b.text
+        if b.type == "table":
+            if not b.nrows:
                 continue
+            header = b.row(0)
+            feature = _is_feature_header(header)
+            yield b.start, section, "table", None, " | ".join(header)
+            for ri in range(1, b.nrows):
+                row = b.row(ri)
+                fid = row[0].strip() if feature and row else None
+                # Row ri sits below the header and separator lines
+                yield b.start + ri + 1, section, "table", fid or None, " | ".join(row)
+        elif b.type != "hr" and b.text:
+            yield b.start, section, b.type, None, b.text
+
+
+class _SpecDatabase:
+    """
+    A SQLite store derived from parsed specs. :meth:`update` re-reads only the
+    files whose content (or included files) changed and drops files that no
+    longer exist. Subclasses give their tables in ``SCHEMA``, the statements
+    deleting one file's rows (``file_id`` as the parameter) in ``DROP_SQL``,
+    and store a parsed file's rows in ``_add(file_id, md_file, version,
+    blocks)``. A ``SCHEMA_VERSION`` change rebuilds the store.
+    """
 
-        # ---- Table ----
-        if b["type"] == "table":
-            rows = b["rows"]
-            if not rows:
-                i += 1
-                continue
+    SCHEMA = ""
+    SCHEMA_VERSION = 0
+    DROP_SQL = ()
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        import sqlite3
+
+        self.db = sqlite3.connect(str(self.path))
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            for (table,) in self.db.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                self.db.execute(f"DROP TABLE {table}")
+            self.db.executescript(
+                "CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, digest TEXT, "
+                "version TEXT, title TEXT);" + self.SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.close()
+
+    def _drop(self, file_id):
+        for sql in (*self.DROP_SQL, "DELETE FROM files WHERE id = ?"):
+            self.db.execute(sql, (file_id,))
+
+    def update(self, md_files):
+        """
+        Bring ``md_files`` up to date in the store. Files that cannot be
+        read or are not UTF-8 are skipped (and dropped if stored before).
+        Returns: (updated, unchanged, removed, errors) with errors a list of
+        (file, message).
+        """
+        updated = unchanged = removed = 0
+        errors = []
+        max_bytes = _load_rules().include_max_bytes
+        with self.db:
+            for md_file in md_files:
+                path = str(md_file.resolve())
+                row = self.db.execute("SELECT id, digest FROM files WHERE path = ?",
+                                      (path,)).fetchone()
+                try:
+                    data = md_file.read_bytes()
+                    md_text = data.decode("utf-8")
+                except (OSError, UnicodeDecodeError) as exc:
+                    errors.append((md_file, getattr(exc, "strerror", None) or str(exc)))
+                    if row is not None:
+                        self._drop(row[0])
+                    continue
+                stamps = _include_stamps(md_text, md_file.parent)
+                digest = hashlib.sha256(data + json.dumps(stamps).encode()).hexdigest()
+                if row is not None and row[1] == digest:
+                    unchanged += 1
+                    continue
+                if row is not None:
+                    self._drop(row[0])
+                blocks = _parse_markdown(md_text)
+                try:
+                    blocks = _resolve_includes(blocks, md_file.parent, max_bytes)
+                except ValueError:
+                    pass  # use the fences as written; --check reports them
+                title = next((b.text for b in blocks if b.type == "h1"), md_file.stem)
+                version = _spec_version(blocks, md_file)
+                file_id = self.db.execute(
+                    "INSERT INTO files (path, digest, version, title) VALUES (?, ?, ?, ?)",
+                    (path, digest, version, title)).lastrowid
+                self._add(file_id, md_file, version, blocks)
+                updated += 1
+            for file_id, path in self.db.execute("SELECT id, path FROM files").fetchall():
+                if not os.path.exists(path):
+                    self._drop(file_id)
+                    removed += 1
+        return updated, unchanged, removed, errors
+
+
+class SearchIndex(_SpecDatabase):
+    """SQLite-backed inverted index: entries plus (term, entry) postings."""
+
+    SCHEMA = """
+        CREATE TABLE entries (id INTEGER PRIMARY KEY, file_id INTEGER, line INTEGER,
+                              section TEXT, block_type TEXT, feature_id TEXT, text TEXT);
+        CREATE INDEX entries_file ON entries (file_id);
+        CREATE TABLE postings (term TEXT, entry_id INTEGER,
+                               PRIMARY KEY (term, entry_id)) WITHOUT ROWID;
+        CREATE INDEX postings_entry ON postings (entry_id);
+    """
+    SCHEMA_VERSION = 2
+    DROP_SQL = (
+        "DELETE FROM postings WHERE entry_id IN (SELECT id FROM entries WHERE file_id = ?)",
+        "DELETE FROM entries WHERE file_id = ?",
+    )
+
+    def _add(self, file_id, md_file, version, blocks):
+        next_id = self.db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM entries").fetchone()[0]
+        entries = []
+        postings = []
+        for entry_id, entry in enumerate(_search_entries(blocks), next_id):
+            entries.append((entry_id, file_id, *entry))
+            postings.extend((term, entry_id) for term in _search_terms(entry[4]))
+        self.db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)", entries)
+        self.db.executemany("INSERT INTO postings VALUES (?, ?)", postings)
+
+    def search(self, query, version=None, block_type=None, limit=50):
+        """
+        Entries containing every whitespace-separated word of ``query``
+        (case-insensitive). Hangul matches anywhere in the text; a Latin or
+        digit word matches at the start of a word, so "gp" finds "GPU" but
+        "pu" does not. Returns: list of dicts in file and line order.
+        """
+        words = query.lower().split()
+        terms = sorted(_search_terms(query, query=True))
+        bigrams = [t for t in terms if "\uac00" <= t[0] <= "\ud7a3"]
+        where = []
+        params = []
+        if bigrams:
+            # Candidates hold every bigram; the substring check below removes
+            # entries whose bigrams match out of order.
+            where.append("e.id IN (SELECT entry_id FROM postings WHERE term IN "
+                         f"({', '.join('?' * len(bigrams))}) GROUP BY entry_id "
+                         "HAVING COUNT(*) = ?)")
+            params += [*bigrams, len(bigrams)]
+        for term in terms:
+            if term not in bigrams:
+                # Prefix: a range scan over the (term, entry_id) key
+                where.append("e.id IN (SELECT entry_id FROM postings "
+                             "WHERE term >= ? AND term < ?)")
+                params += [term, term[:-1] + chr(ord(term[-1]) + 1)]
+        if not terms:
+            where.append("e.text LIKE ?")
+            params.append(f"%{words[0] if words else ''}%")
+        if version is not None:
+            where.append("f.version = ?")
+            params.append(version)
+        if block_type is not None:
+            where.append("e.block_type = ?")
+            params.append(block_type)
+        rows = self.db.execute(
+            "SELECT f.path, f.version, e.line, e.section, e.block_type, e.feature_id, e.text "
+            "FROM entries e JOIN files f ON f.id = e.file_id "
+            f"WHERE {' AND '.join(where)} ORDER BY f.path, e.line", params)
+        hits = []
+        for path, ver, line, section, kind, fid, text in rows:
+            lowered = text.lower()
+            if all(w in lowered for w in words):
+                hits.append({"path": path, "version": ver, "line": line, "section": section,
+                             "type": kind, "feature_id": fid, "text": text})
+                if len(hits) >= limit:
+                    break
+        return hits
 
-            header = [c.strip() for c in rows[0]]
 
-            # Detect feature table by header content
-            is_feature = (
-                len(header) >= 5
-                and "ID" in header[0]
-                and ("\uae30\ub2a5\uba85" in header[1] or "\uae30\ub2a5" in header[1])
-            )
+def _snippet(text, word, width=40):
+    """One line of ``text`` around the first occurrence of ``word``."""
+    pos = text.lower().find(word)
+    line_start = text.rfind("\n", 0, pos) + 1
+    line_end = text.find("\n", pos)
+    line = text[line_start:line_end if line_end >= 0 else len(text)]
+    pos -= line_start
+    lo = max(0, pos - width)
+    hi = min(len(line), pos + len(word) + width)
+    return ("\u2026" if lo else "") + line[lo:hi].strip() + ("\u2026" if hi < len(line) else "")
 
-            if is_feature:
-                _add_feature_table(doc, rows)
-            else:
-                # Determine col widths based on number of columns
-                nc = len(header)
-                if nc == 2:
-                    cw = [2400, 6960]
-                elif nc == 3:
-                    if "\ub2e8\uacc4" in header[0]:
-                        cw = [600, 1800, 6960]
-                    elif "\uacc4\uce35" in header[0]:
-                        cw = [2200, 2200, 4960]
-                    else:
-                        cw = [2400, 3480, 3480]
-                elif nc == 5:
-                    cw = [1400, 1600, 2160, 2000, 2200]
-                elif nc == 6:
-                    cw = [1000, 2000, 1400, 1400, 1400, 2160]
-                elif nc == 7:
-                    cw = [600, 1800, 1100, 1600, 1000, 1060, 2200]
-                else:
-                    total = 9360
-                    cw = [total // nc] * nc
-                    cw[-1] = total - sum(cw[:-1])
 
-                _add_generic_table(doc, rows, col_widths=cw)
-            i += 1
-            continue
+# ===== Feature registry =====================================================
+# Every feature-table row (ID/기능명/설명/우선순위/구현단계) of every spec
+# version in one SQLite table keyed by (feature ID, version), for backlog
+# queries and CSV/XLSX export.
 
-        # ---- Code block ----
-        if b["type"] == "code":
-            _add_json_code_block(doc, b["text"])
-            i += 1
-            continue
+_FEATURE_FIELDS = ("name", "description", "priority", "phase")
+_FEATURE_COLUMNS = ("feature_id", "version", "priority", "phase", "name", "description",
+                    "section", "source", "line")
 
-        # ---- Paragraph ----
-        if b["type"] == "paragraph":
-            _add_normal_paragraph(doc, b["text"])
-            i += 1
-            continue
 
-        # ---- List item ----
-        if b["type"] == "list_item":
-            _add_list_item(doc, b["text"])
-            i += 1
-            continue
+def _version_rank(version):
+    """Sortable rank of a "major.minor" version string (0 when not numeric)."""
+    m = re.match(r"(\d+)\.(\d+)", version)
+    return int(m.group(1)) * 10000 + int(m.group(2)) if m else 0
 
-        # ---- HR ----
-        if b["type"] == "hr":
-            # Skip -- HRs are just section separators in the markdown
-            i += 1
+
+class FeatureRegistry(_SpecDatabase):
+    """Feature rows of all indexed specs. Query methods return (header, rows)."""
+
+    SCHEMA = """
+        CREATE TABLE features (feature_id TEXT, version TEXT, version_rank INTEGER,
+                               file_id INTEGER, section TEXT, line INTEGER, name TEXT,
+                               description TEXT, priority TEXT, phase TEXT,
+                               PRIMARY KEY (feature_id, version)) WITHOUT ROWID;
+        CREATE INDEX features_version ON features (version_rank, priority);
+        CREATE INDEX features_file ON features (file_id);
+    """
+    SCHEMA_VERSION = 1
+    DROP_SQL = ("DELETE FROM features WHERE file_id = ?",)
+
+    def _add(self, file_id, md_file, version, blocks):
+        # Only specs (with a cover version): change logs quote rows of two versions
+        if _cover_version(blocks) is None:
+            return
+        rank = _version_rank(version)
+        rows = []
+        section = ""
+        for b in blocks:
+            if b.type == "h2":
+                section = b.text
+            elif b.type == "table" and b.nrows > 1 and _is_feature_header(b.row(0)):
+                for ri in range(1, b.nrows):
+                    cells = [c.strip() for c in _cells_display_text(b.row(ri))] + [""] * 5
+                    if cells[0]:
+                        rows.append((cells[0], version, rank, file_id, section,
+                                     b.start + ri + 1, *cells[1:5]))
+        # A repeated ID within one version keeps its first row
+        self.db.executemany(
+            "INSERT OR IGNORE INTO features VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def select(self, version=None, priority=None, phase=None, feature_id=None):
+        """Matching features in version, then ID order."""
+        where = []
+        params = []
+        for column, value in (("f.version", version), ("f.priority", priority),
+                              ("f.phase", phase), ("f.feature_id", feature_id)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        rows = self.db.execute(
+            "SELECT f.feature_id, f.version, f.priority, f.phase, f.name, f.description, "
+            "f.section, files.path, f.line FROM features f JOIN files ON files.id = f.file_id"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY f.version_rank, f.feature_id", params)
+        return _FEATURE_COLUMNS, rows
+
+    def changed(self, field, old, new, priority=None):
+        """
+        Features in both versions whose ``field`` differs between them;
+        ``priority`` filters on the priority in ``new``.
+        """
+        if field not in _FEATURE_FIELDS:
+            raise ValueError(f"unknown feature field: {field}")
+        sql = (f"SELECT b.feature_id, b.priority, a.{field}, b.{field}, b.name, b.section "
+               "FROM features a JOIN features b ON b.feature_id = a.feature_id "
+               f"WHERE a.version = ? AND b.version = ? AND a.{field} IS NOT b.{field}")
+        params = [old, new]
+        if priority is not None:
+            sql += " AND b.priority = ?"
+            params.append(priority)
+        header = ("feature_id", "priority", f"{field} (v{old})", f"{field} (v{new})",
+                  "name", "section")
+        return header, self.db.execute(sql + " ORDER BY b.feature_id", params)
+
+    def count_by(self, field):
+        """Feature counts per version (rows) and ``field`` value (columns)."""
+        if field not in _FEATURE_FIELDS:
+            raise ValueError(f"unknown feature field: {field}")
+        counts = {}
+        values = set()
+        for version, value, n in self.db.execute(
+                f"SELECT version, {field}, COUNT(*) FROM features "
+                f"GROUP BY version_rank, version, {field} ORDER BY version_rank, version"):
+            counts.setdefault(version, {})[value] = n
+            values.add(value)
+        values = sorted(values)
+        header = ("version", *values, "total")
+        rows = [(version, *(by_value.get(v, 0) for v in values), sum(by_value.values()))
+                for version, by_value in counts.items()]
+        return header, rows
+
+
+# Static parts of an .xlsx workbook with one sheet and a bold header style
+_XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XLSX_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XLSX_PARTS = (
+    ("[Content_Types].xml",
+     f'<Types xmlns="{_CT_NS}">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+     '</Types>'),
+    ("_rels/.rels",
+     f'<Relationships xmlns="{_XLSX_REL_NS}">'
+     f'<Relationship Id="rId1" Type="{_XLSX_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+     '</Relationships>'),
+    ("xl/workbook.xml",
+     f'<workbook xmlns="{_XLSX_MAIN_NS}" xmlns:r="{_XLSX_DOC_REL}">'
+     '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+    ("xl/_rels/workbook.xml.rels",
+     f'<Relationships xmlns="{_XLSX_REL_NS}">'
+     f'<Relationship Id="rId1" Type="{_XLSX_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+     f'<Relationship Id="rId2" Type="{_XLSX_DOC_REL}/styles" Target="styles.xml"/>'
+     '</Relationships>'),
+    ("xl/styles.xml",
+     f'<styleSheet xmlns="{_XLSX_MAIN_NS}">'
+     '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+     '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+     '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+     '<fill><patternFill patternType="gray125"/></fill></fills>'
+     '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+     '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+     '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+     '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/></cellXfs>'
+     '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+     '</styleSheet>'),
+)
+_XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_column(ci):
+    """Spreadsheet column letters for 0-based column ``ci``."""
+    name = ""
+    ci += 1
+    while ci:
+        ci, rem = divmod(ci - 1, 26)
+        name = chr(65 + rem) + name
+    return name
+
+
+def _xlsx_row(ri, row, style=None):
+    cells = []
+    s = f' s="{style}"' if style is not None else ""
+    for ci, value in enumerate(row):
+        ref = f"{_xlsx_column(ci)}{ri}"
+        if value is None:
             continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c r="{ref}"{s}><v>{value}</v></c>')
+        else:
+            text = _xml_text(_XML_ILLEGAL_RE.sub("", str(value)))
+            cells.append(f'<c r="{ref}"{s} t="inlineStr"><is><t xml:space="preserve">'
+                         f'{text}</t></is></c>')
+    return f'<row r="{ri}">{"".join(cells)}</row>'
 
-        i += 1
 
-    return doc
+def _write_xlsx(path, header, rows, sheet="features"):
+    """
+    Stream ``rows`` into a one-sheet workbook: the sheet XML is written to
+    the zip entry in batches while ``rows`` is consumed. Returns: row count.
+    """
+    import zipfile
+
+    n = 0
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in _XLSX_PARTS:
+            zf.writestr(_zip_info(name), '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                        + xml.replace("{sheet}", sheet))
+        with zf.open(_zip_info("xl/worksheets/sheet1.xml"), "w") as out:
+            out.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                f'<worksheet xmlns="{_XLSX_MAIN_NS}"><sheetViews><sheetView workbookViewId="0">'
+                '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                '</sheetView></sheetViews><sheetData>'
+                + _xlsx_row(1, header, style=1)).encode("utf-8"))
+            batch = []
+            for n, row in enumerate(rows, 1):
+                batch.append(_xlsx_row(n + 1, row))
+                if len(batch) >= 1000:
+                    out.write("".join(batch).encode("utf-8"))
+                    batch = []
+            out.write(("".join(batch) + "</sheetData></worksheet>").encode("utf-8"))
+    return n
+
+
+def _export_rows(path, header, rows):
+    """Stream ``rows`` to ``path`` as XLSX (by suffix) or CSV. Returns: row count."""
+    if path.suffix.lower() == ".xlsx":
+        return _write_xlsx(path, header, rows)
+    import csv
+
+    n = 0
+    # BOM so that Excel opens the Korean text as UTF-8
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for n, row in enumerate(rows, 1):
+            writer.writerow(row)
+    return n
+
+
+def _print_rows(header, rows, max_width=48):
+    """Print rows as aligned columns (wide characters count double)."""
+    table = [[str(v) if v is not None else "" for v in header]]
+    for row in rows:
+        cells = []
+        for v in row:
+            text = str(v) if v is not None else ""
+            cells.append(text if len(text) <= max_width else text[:max_width - 1] + "\u2026")
+        table.append(cells)
+    ncols = len(header)
+    flat = [cell for r in table for cell in r]
+    widths = [int(w) for w in _display_widths(flat)]
+    col_widths = [max(widths[ci::ncols]) for ci in range(ncols)]
+    for ri, r in enumerate(table):
+        pads = widths[ri * ncols:(ri + 1) * ncols]
+        print("  ".join(cell + " " * (cw - w) for cell, w, cw in zip(r, pads, col_widths))
+              .rstrip())
+    return len(table) - 1
+
+
+# ===== Library API ==========================================================
+
+_COVER_FIELDS = ("title", "subtitle", "workflow", "description", "metadata")
+
+
+def _convert_rules(rules=None):
+    """Compiled rules for :func:`convert`: a RenderRules, a dict of overrides or None."""
+    if rules is None:
+        return _load_rules()
+    if isinstance(rules, RenderRules):
+        return rules
+    return RenderRules(_merge_rules(rules, "rules"))
+
+
+def _cover_options(cover):
+    """
+    Checked ``cover=`` overrides for :func:`convert`: strings for the text
+    fields, ``metadata`` as a dict (rows set by label) or a list of
+    (label, value) pairs (replacing the table).
+    Raises: ValueError for unknown fields or values of the wrong type.
+    """
+    if cover is None:
+        return None
+    if not isinstance(cover, dict):
+        raise ValueError("cover must be a dict of cover fields")
+    unknown = sorted(set(cover) - set(_COVER_FIELDS))
+    if unknown:
+        raise ValueError(f"unknown cover fields: {', '.join(map(str, unknown))}")
+    options = {}
+    for key, value in cover.items():
+        if key != "metadata":
+            if not isinstance(value, str):
+                raise ValueError(f"cover {key} must be a string")
+            options[key] = value
+        elif isinstance(value, dict):
+            options[key] = {str(label): str(v) for label, v in value.items()}
+        elif isinstance(value, (list, tuple)) and all(
+                isinstance(row, (list, tuple)) and len(row) == 2 for row in value):
+            options[key] = [[str(label), str(v)] for label, v in value]
+        else:
+            raise ValueError("cover metadata must be a dict or a list of (label, value) pairs")
+    return options
+
+
+def convert(source, out=None, *, cover=None, rules=None, backend="docx", base_dir=None):
+    """
+    Render one spec to .docx in memory.
+
+    ``source`` is markdown as str, UTF-8 bytes or a readable file object.
+    The document is written to ``out`` (a writable binary file object) or,
+    without it, returned as bytes. Keyword options:
+
+    - ``cover``: cover page fields: ``title``, ``subtitle``, ``workflow``,
+      ``description`` and ``metadata``. They are applied over the document's
+      own cover table (or the ``cover`` rules without one). A dict for
+      ``metadata`` sets rows by label (``{"버전": "1.6"}``); a list of
+      (label, value) pairs replaces the table.
+    - ``rules``: a :class:`RenderRules`, or a dict of top-level rule keys
+      replacing the defaults (as in a ``--rules`` file).
+    - ``backend``: ``"docx"`` or ``"stream"``, as ``--backend``.
+    - ``base_dir``: directory that ``include=`` fences are read from.
+      Without it nothing but the python-docx template is read from disk,
+      and markdown with an include fence is rejected.
+
+    Each call builds its own document and nothing is written to disk, so
+    calls may run concurrently in threads.
+    Returns: the .docx bytes, or None when writing to ``out``.
+    Raises: ValueError for unknown options, invalid rules, an include fence
+    without ``base_dir`` or an include file that cannot be read.
+    """
+    if hasattr(source, "read"):
+        source = source.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = bytes(source).decode("utf-8")
+    if backend not in ("docx", "stream"):
+        raise ValueError(f"unknown backend: {backend}")
+    if base_dir is None:
+        target = _first_include(source)
+        if target is not None:
+            raise ValueError(f"include={target} needs base_dir to read the file")
+    rules = _convert_rules(rules)
+    cover = _cover_options(cover)
+    target = io.BytesIO() if out is None else out
+    if backend == "stream":
+        _build_streaming(source, target, rules=rules, base_dir=base_dir, cover=cover)
+    else:
+        _save_document(_build_document(source, rules=rules, base_dir=base_dir, cover=cover),
+                       target)
+    return target.getvalue() if out is None else None
+
+
+# ===== Render server ========================================================
+# ``serve``: an HTTP/1.1 service that renders markdown on demand. Builds run
+# in a process pool; finished documents stay in a byte-bounded LRU keyed like
+# the build manifest, and identical requests arriving mid-build share it.
+#
+#     POST /render    markdown body (?backend=stream) -> .docx
+#     POST /render    JSON {"markdown": ..., "cover": {...}, "backend": ...}
+#     GET  /stats     request, cache and latency counters as JSON
+
+_DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+_HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                 411: "Length Required", 413: "Payload Too Large",
+                 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+_MAX_HEADERS = 100
+
+
+class RenderService:
+    """Output cache, in-flight builds and counters behind the HTTP handler."""
+
+    def __init__(self, pool, rules=None, cache_bytes=256 << 20, latency_window=1000):
+        self.pool = pool
+        self.rules = rules or _load_rules()
+        self.cache_bytes = cache_bytes
+        self.counters = collections.Counter()
+        self.started = time.monotonic()
+        self._cache = collections.OrderedDict()  # build key -> .docx bytes
+        self._cached_bytes = 0
+        self._inflight = {}  # build key -> future of the running build
+        self._latencies = collections.deque(maxlen=latency_window)
+
+    async def render(self, md_bytes, cover=None, backend="docx"):
+        """
+        The .docx for one request, from the cache, a running identical
+        build or a new one in the pool.
+        Returns: (build key, bytes, "hit" | "coalesced" | "miss").
+        Raises: ValueError for undecodable markdown or bad options.
+        """
+        import asyncio
+
+        md_text = md_bytes.decode("utf-8")
+        if backend not in ("docx", "stream"):
+            raise ValueError(f"unknown backend: {backend}")
+        target = _first_include(md_text)
+        if target is not None:
+            # Requests carry no directory, and the server reads no client paths
+            raise ValueError(f"include={target}: include fences are not supported here")
+        cover = _cover_options(cover)
+        rules = self.rules
+        key = BuildManifest.build_key(
+            md_bytes, {"backend": backend, "rules": rules.digest, "cover": cover})
+        data = self._cache.get(key)
+        if data is not None:
+            self._cache.move_to_end(key)
+            self.counters["cache_hits"] += 1
+            return key, data, "hit"
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.counters["coalesced"] += 1
+            return key, await asyncio.shield(pending), "coalesced"
+
+        self.counters["cache_misses"] += 1
+        pending = asyncio.get_running_loop().run_in_executor(
+            self.pool, functools.partial(convert, md_text, cover=cover, rules=rules,
+                                         backend=backend))
+        self._inflight[key] = pending
+        # Finish in a callback so the result is cached even if this client leaves
+        pending.add_done_callback(functools.partial(self._build_done, key, time.perf_counter()))
+        return key, await asyncio.shield(pending), "miss"
+
+    def _build_done(self, key, t0, future):
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            self.counters["build_errors"] += 1
+            return
+        self.counters["builds"] += 1
+        self.counters["build_ms"] += round((time.perf_counter() - t0) * 1000)
+        data = future.result()
+        if len(data) > self.cache_bytes:
+            return
+        self._cache[key] = data
+        self._cached_bytes += len(data)
+        while self._cached_bytes > self.cache_bytes:
+            _, old = self._cache.popitem(last=False)
+            self._cached_bytes -= len(old)
+            self.counters["cache_evictions"] += 1
+
+    def record(self, status, seconds=None):
+        self.counters["requests"] += 1
+        self.counters[f"status_{status}"] += 1
+        if seconds is not None:
+            self._latencies.append(seconds * 1000)
+
+    def stats(self):
+        latencies = sorted(self._latencies)
+
+        def percentile(q):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2)
+
+        counters = dict(sorted(self.counters.items()))
+        lookups = counters.get("cache_hits", 0) + counters.get("cache_misses", 0) \
+            + counters.get("coalesced", 0)
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "counters": counters,
+            "cache": {"entries": len(self._cache), "bytes": self._cached_bytes,
+                      "max_bytes": self.cache_bytes,
+                      "hit_rate": round(counters.get("cache_hits", 0) / lookups, 3)
+                      if lookups else None},
+            "inflight": len(self._inflight),
+            # Over the last ``latency_window`` render requests
+            "latency_ms": {"count": len(latencies), "p50": percentile(0.5),
+                           "p90": percentile(0.9), "p99": percentile(0.99),
+                           "max": round(latencies[-1], 2) if latencies else None},
+        }
+
+
+async def _serve_request(service, method, target, headers, body):
+    """Returns: (status, content type, payload, extra headers)."""
+    from urllib.parse import parse_qs, urlsplit
+
+    url = urlsplit(target)
+    if url.path == "/stats":
+        if method != "GET":
+            return 405, "text/plain", b"use GET\n", {}
+        return 200, "application/json", json.dumps(service.stats()).encode(), {}
+    if url.path != "/render":
+        return 404, "text/plain", b"not found\n", {}
+    if method != "POST":
+        return 405, "text/plain", b"use POST\n", {}
+
+    try:
+        if headers.get("content-type", "").split(";")[0].strip() == "application/json":
+            request = json.loads(body)
+            if not isinstance(request, dict) or not isinstance(request.get("markdown"), str):
+                raise ValueError("expected a JSON object with a 'markdown' string")
+            key, data, source = await service.render(
+                request["markdown"].encode("utf-8"), request.get("cover"),
+                request.get("backend", "docx"))
+        else:
+            backend = parse_qs(url.query).get("backend", ["docx"])[0]
+            key, data, source = await service.render(body, None, backend)
+    except ValueError as exc:
+        return 400, "text/plain", f"{exc}\n".encode(), {}
+    except Exception as exc:  # a failed build must not take the server down
+        return 500, "text/plain", f"{type(exc).__name__}: {exc}\n".encode(), {}
+    return 200, _DOCX_TYPE, data, {"X-Cache": source, "ETag": f'"{key[:32]}"'}
+
+
+async def _read_head(reader):
+    """
+    Request line and headers of the next request (an empty request line at
+    the end of the stream).
+    Returns: (request line, headers, None), or (request line, headers read so
+    far, status) for a request line longer than the reader's limit (400), or
+    a longer header line or more than ``_MAX_HEADERS`` headers (431).
+    """
+    try:
+        request_line = await reader.readline()
+    except ValueError:  # readline turns LimitOverrunError into ValueError
+        return b"", {}, 400
+    headers = {}
+    if not request_line.strip():
+        return request_line, headers, None
+    for _ in range(_MAX_HEADERS + 1):
+        try:
+            line = await reader.readline()
+        except ValueError:
+            return request_line, headers, 431
+        if not line.strip():
+            return request_line, headers, None
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return request_line, headers, 431
+
+
+async def _serve_connection(service, max_body, reader, writer):
+    """One client connection: HTTP/1.1 requests with keep-alive."""
+    import asyncio
+
+    try:
+        while True:
+            request_line, headers, error = await _read_head(reader)
+            if error is None and not request_line.strip():
+                break
+            t0 = time.perf_counter()
+            parts = request_line.decode("latin-1").split()
+            keep_alive = (len(parts) == 3 and parts[2] == "HTTP/1.1"
+                          and headers.get("connection", "").lower() != "close")
+            length = headers.get("content-length", "0")
+            if error is not None:
+                # The rest of the head is unread, so the connection cannot go on
+                status, ctype, payload, extra = (
+                    error, "text/plain", b"request head too large\n", {})
+                keep_alive = False
+            elif len(parts) != 3 or not length.isdigit():
+                status, ctype, payload, extra = 400, "text/plain", b"bad request\n", {}
+                keep_alive = False
+            elif "transfer-encoding" in headers:
+                status, ctype, payload, extra = 411, "text/plain", b"send Content-Length\n", {}
+                keep_alive = False
+            elif int(length) > max_body:
+                status, ctype, payload, extra = 413, "text/plain", b"body too large\n", {}
+                keep_alive = False
+            else:
+                body = await reader.readexactly(int(length))
+                status, ctype, payload, extra = await _serve_request(
+                    service, parts[0], parts[1], headers, body)
+            service.record(status, time.perf_counter() - t0 if ctype == _DOCX_TYPE else None)
+
+            head = [f"HTTP/1.1 {status} {_HTTP_REASONS[status]}",
+                    f"Content-Type: {ctype}", f"Content-Length: {len(payload)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            head += [f"{name}: {value}" for name, value in extra.items()]
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(host, port, jobs, cache_bytes, max_body, rules):
+    import asyncio
+    import signal
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Workers import python-docx up front instead of on the first request
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=_import_docx)
+    service = RenderService(pool, rules, cache_bytes)
+    server = await asyncio.start_server(
+        functools.partial(_serve_connection, service, max_body), host, port)
+    print(f"Serving on http://{host}:{port}/render ({jobs} build process(es), "
+          f"{cache_bytes >> 20} MB cache; stats at /stats)")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):  # no signal handlers on Windows
+            loop.add_signal_handler(signum, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        pool.shutdown(cancel_futures=True)
+    print("Stopped; " + ", ".join(f"{k} {v}" for k, v in sorted(service.counters.items())))
 
 
 # ===== Entry point ==========================================================
 
-def main():
-    base_dir = Path(__file__).parent.parent
-    md_file = base_dir / "docs/AVATAR_OnE_\ud50c\ub7ab\ud3fc_\uae30\ub2a5\uba85\uc138\uc11c_v1_5.md"
-    docx_file = base_dir / "docs/AVATAR_OnE_\ud50c\ub7ab\ud3fc_\uae30\ub2a5\uba85\uc138\uc11c_v1_5.docx"
+BASE_DIR = Path(__file__).parent.parent
+DEFAULT_MD = BASE_DIR / "docs/AVATAR_OnE_\ud50c\ub7ab\ud3fc_\uae30\ub2a5\uba85\uc138\uc11c_v1_5.md"
+DEFAULT_CACHE_DIR = BASE_DIR / ".cache/md_to_docx"
+DEFAULT_MANIFEST = BASE_DIR / ".cache/md_to_docx_manifest.json"
+DEFAULT_INDEX = BASE_DIR / ".cache/md_to_docx_index.sqlite"
+DEFAULT_FEATURES = BASE_DIR / ".cache/md_to_docx_features.sqlite"
 
-    if not md_file.exists():
-        print(f"Error: markdown file not found: {md_file}")
-        return 1
 
-    md_text = md_file.read_text(encoding="utf-8")
-    doc = _build_document(md_text)
-    doc.save(str(docx_file))
+def _expand_inputs(patterns):
+    """
+    Resolve CLI inputs (files, directories or glob patterns) to markdown paths.
+    Directories contribute their ``*.md`` files. Order is stable and de-duplicated.
+    """
+    paths = []
+    seen = set()
+    for pat in patterns:
+        p = Path(pat)
+        if p.is_dir():
+            found = sorted(p.glob("*.md"))
+        elif glob.has_magic(pat):
+            found = sorted(Path(x) for x in glob.glob(pat))
+        else:
+            found = [p]
+        for f in found:
+            key = f.resolve()
+            if key not in seen:
+                seen.add(key)
+                paths.append(f)
+    return paths
+
+
+def _convert_file(md_path, docx_path, cache_dir=None, backend="docx", section_jobs=1,
+                  rules=None, export_dir=None):
+    """
+    Convert one markdown file. Runs in a worker process in batch mode.
+    ``section_jobs`` > 1 renders its ``##`` sections in parallel processes;
+    ``export_dir`` also exports the block IR there (see :func:`_export_ir`).
+    Returns: (md_path, docx_path, exit_code, seconds, message).
+    """
+    t0 = time.perf_counter()
+    if not md_path.exists():
+        return md_path, docx_path, 1, 0.0, "markdown file not found"
+    cache = SectionCache(cache_dir) if cache_dir is not None else None
+    rules = rules or _load_rules()
+    try:
+        md_text = md_path.read_text(encoding="utf-8")
+        # One parse feeds both the docx build and the IR export
+        blocks = _resolve_includes(_parse_markdown(md_text), md_path.parent,
+                                   rules.include_max_bytes)
+        if backend == "stream":
+            _build_streaming(md_text, str(docx_path), cache=cache, blocks=blocks,
+                             workers=section_jobs, rules=rules)
+        else:
+            doc = _build_document(md_text, cache=cache, blocks=blocks, workers=section_jobs,
+                                  rules=rules)
+            _save_document(doc, str(docx_path))
+        manifest = _export_ir(blocks, md_path, export_dir) if export_dir is not None else None
+    except Exception as exc:  # report and keep the batch going
+        return md_path, docx_path, 1, time.perf_counter() - t0, f"{type(exc).__name__}: {exc}"
+    elapsed = time.perf_counter() - t0
+    if not docx_path.exists():
+        return md_path, docx_path, 1, elapsed, "failed to create output file"
+    message = f"{docx_path.stat().st_size / 1024:.1f} KB"
+    if cache is not None:
+        message += f", {cache.hits}/{cache.hits + cache.misses} sections cached"
+    if manifest is not None:
+        message += f", IR {len(manifest['sections'])} chunks"
+    return md_path, docx_path, 0, elapsed, message
+
+
+def _run_batch(jobs_list, workers, cache_dir=None, backend="docx", section_jobs=1,
+               rules=None, export_dir=None):
+    """Convert (md, docx) pairs, in a process pool when more than one."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    if workers <= 1 or len(jobs_list) <= 1:
+        for md_path, docx_path in jobs_list:
+            yield _convert_file(md_path, docx_path, cache_dir, backend, section_jobs, rules,
+                                export_dir)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs_list))) as pool:
+        futures = [pool.submit(_convert_file, md, dx, cache_dir, backend, section_jobs, rules,
+                               export_dir)
+                   for md, dx in jobs_list]
+        for fut in as_completed(futures):
+            yield fut.result()
+
 
-    if docx_file.exists():
-        size_kb = docx_file.stat().st_size / 1024
-        print(f"Created: {docx_file}")
-        print(f"Size: {size_kb:.1f} KB")
+def _watch(jobs_list, cache_dir=None, backend="docx", interval=0.2, debounce=0.3,
+           rules=None, export_dir=None):
+    """
+    Rebuild each (md, docx) pair whenever its content changes, until interrupted.
+
+    Inputs and the files they include are polled by (mtime, size); a change is
+    built once the file has been quiet for ``debounce`` seconds, and only if
+    its content hash or include stamps differ from the last build. Imports, the
+    default template and the section cache stay warm in this process, so a
+    rebuild re-renders only the edited sections.
+    """
+    signatures = {}
+    digests = {}
+    included = {}  # md path -> include paths as of its last build
+    pending = {}  # md path -> (first, last) monotonic time a change was seen
+    print(f"Watching {len(jobs_list)} file(s); Ctrl+C to stop")
+    try:
+        while True:
+            now = time.monotonic()
+            for md_path, _ in jobs_list:
+                try:
+                    st = md_path.stat()
+                except OSError:
+                    continue  # editors may delete and recreate on save
+                include_sigs = []
+                for path in included.get(md_path, ()):
+                    try:
+                        ist = path.stat()
+                    except OSError:
+                        include_sigs.append(None)
+                    else:
+                        include_sigs.append((ist.st_mtime_ns, ist.st_size))
+                sig = (st.st_mtime_ns, st.st_size, tuple(include_sigs))
+                if signatures.get(md_path) != sig:
+                    signatures[md_path] = sig
+                    pending[md_path] = (pending.get(md_path, (now,))[0], now)
+
+            for md_path, docx_path in jobs_list:
+                first_seen, last_seen = pending.get(md_path, (None, None))
+                if first_seen is None or now - last_seen < debounce:
+                    continue
+                del pending[md_path]
+                try:
+                    md_bytes = md_path.read_bytes()
+                except OSError:
+                    continue
+                stamps = _include_stamps(md_bytes.decode("utf-8", errors="replace"),
+                                         md_path.parent)
+                included[md_path] = [Path(path) for path, _, _ in stamps]
+                digest = hashlib.sha256(md_bytes + json.dumps(stamps).encode()).hexdigest()
+                if digests.get(md_path) == digest:
+                    continue  # saved without content changes
+                digests[md_path] = digest
+                _, _, code, elapsed, message = _convert_file(
+                    md_path, docx_path, cache_dir, backend, rules=rules, export_dir=export_dir)
+                if code == 0 and export_dir is not None:
+                    _write_ir_index(export_dir, [md for md, _ in jobs_list])
+                latency = time.monotonic() - first_seen
+                stamp = time.strftime("%H:%M:%S")
+                if code == 0:
+                    print(f"[{stamp}] Rebuilt: {docx_path} ({message}, render {elapsed:.2f}s, "
+                          f"time-to-docx {latency:.2f}s)")
+                else:
+                    print(f"[{stamp}] Error: {md_path}: {message}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
         return 0
-    else:
-        print("Failed to create output file")
+
+
+def _build_arg_parser():
+    parser = argparse.ArgumentParser(
+        description="Convert AVATAR OnE \uae30\ub2a5\uba85\uc138\uc11c markdown to DOCX.")
+    parser.add_argument(
+        "inputs", nargs="*",
+        help="markdown files, directories or glob patterns (default: the v1.5 spec)")
+    parser.add_argument(
+        "-o", "--out-dir", type=Path,
+        help="directory for generated .docx files (default: next to each input)")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="number of worker processes for batch conversion (default: CPU count)")
+    parser.add_argument(
+        "--section-jobs", type=int, default=1, metavar="N",
+        help="render the ## sections of each file in N worker processes and merge "
+             "them in order; for single large specs, usually with -j 1 (default: %(default)s)")
+    parser.add_argument(
+        "--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+        help="section render cache directory (default: %(default)s)")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="re-render every section without reading or writing the cache")
+    parser.add_argument(
+        "--backend", choices=("docx", "stream"), default="docx",
+        help="docx: build the python-docx tree and save it; stream: write "
+             "word/document.xml incrementally with bounded memory (default: %(default)s)")
+    parser.add_argument(
+        "--manifest", type=Path, default=DEFAULT_MANIFEST,
+        help="build manifest used to skip unchanged outputs (default: %(default)s)")
+    parser.add_argument(
+        "-f", "--force", action="store_true",
+        help="rebuild every output even if the manifest says it is up to date")
+    parser.add_argument(
+        "--rules", type=Path, metavar="JSON",
+        help="rendering rules (callouts, section cards, feature-table detection, "
+             "column widths, code block limits) whose top-level keys replace the "
+             "built-in ones")
+    parser.add_argument(
+        "--export-ir", type=Path, metavar="DIR",
+        help="also write the parsed blocks as JSON for the demo app: DIR/index.json, "
+             "DIR/<spec>/manifest.json and one chunk per ## section")
+    parser.add_argument(
+        "--check", action="store_true",
+        help="only parse and check document structure (no python-docx import); "
+             "prints file:line problems and exits 1 on errors")
+    watch = parser.add_argument_group("watch mode")
+    watch.add_argument(
+        "-w", "--watch", action="store_true",
+        help="keep running and rebuild inputs whenever their content changes")
+    watch.add_argument(
+        "--poll-interval", type=float, default=0.2, metavar="SECONDS",
+        help="how often to check inputs for changes (default: %(default)s)")
+    watch.add_argument(
+        "--debounce", type=float, default=0.3, metavar="SECONDS",
+        help="wait until an input has been quiet this long before rebuilding "
+             "(default: %(default)s)")
+    prof = parser.add_argument_group("profiling")
+    prof.add_argument(
+        "--profile", type=Path, metavar="REPORT",
+        help="convert sequentially without the cache and write a JSON timing report "
+             "(per block type, per helper, slowest sections)")
+    prof.add_argument(
+        "--profile-top", type=int, default=10, metavar="N",
+        help="slowest sections / allocation sites to report (default: %(default)s)")
+    prof.add_argument(
+        "--profile-cprofile", action="store_true",
+        help="also dump cProfile stats next to the report (REPORT.<input>.prof)")
+    prof.add_argument(
+        "--profile-tracemalloc", action="store_true",
+        help="also record tracemalloc peak and top allocation sites")
+    return parser
+
+
+def _check_main(md_files, rules=None):
+    """``--check``: parse and structurally check inputs without python-docx."""
+    worst = 0
+    for md_file in md_files:
+        try:
+            md_text = md_file.read_text(encoding="utf-8")
+        except OSError as exc:
+            print(f"{md_file}: error: {exc.strerror}")
+            worst = 1
+            continue
+        problems = _check_structure(md_text, _parse_markdown(md_text), rules, md_file.parent)
+        for line, severity, message in problems:
+            print(f"{md_file}:{line}: {severity}: {message}")
+            if severity == "error":
+                worst = 1
+    return worst
+
+
+def _profile_main(args, jobs_list, rules=None):
+    """``--profile``: convert each input in-process and write one JSON report."""
+    reports = []
+    for md_file, docx_file in jobs_list:
+        if not md_file.exists():
+            print(f"Error: {md_file}: markdown file not found (exit 1)")
+            return 1
+        cprofile_path = None
+        if args.profile_cprofile:
+            cprofile_path = args.profile.with_name(f"{args.profile.stem}.{md_file.stem}.prof")
+        report = _profile_file(md_file, docx_file, args.backend, args.profile_top,
+                               cprofile_path, args.profile_tracemalloc, rules)
+        reports.append(report)
+        total = sum(report["phases"].values())
+        print(f"Profiled: {docx_file} ({total:.2f}s)")
+        for kind, stat in list(report["blocks"].items())[:5]:
+            print(f"  {kind:<14} {stat['calls']:>6} calls {stat['seconds']:>8.3f}s "
+                  f"{stat['elements']:>8} elements")
+    args.profile.parent.mkdir(parents=True, exist_ok=True)
+    args.profile.write_text(json.dumps({"files": reports}, indent=2, ensure_ascii=False),
+                            encoding="utf-8")
+    print(f"Profile report: {args.profile}")
+    return 0
+
+
+def _diff_main(argv):
+    """``diff OLD NEW``: changelog markdown (and docx) from two spec versions."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py diff",
+        description="Generate a \ubcc0\uacbd\uc0ac\ud56d changelog from two spec versions.")
+    parser.add_argument("old", type=Path, help="previous spec markdown")
+    parser.add_argument("new", type=Path, help="new spec markdown")
+    parser.add_argument(
+        "-o", "--output", type=Path,
+        help="changelog markdown path (default: "
+             "\uae30\ub2a5\uba85\uc138\uc11c_\ubcc0\uacbd\uc0ac\ud56d_vOLD_to_vNEW.md "
+             "next to NEW)")
+    parser.add_argument("--no-docx", action="store_true", help="skip rendering the .docx")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="overwrite an existing changelog")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    max_bytes = _load_rules().include_max_bytes
+    try:
+        # Included files count as content, so a changed App spec shows up
+        old_blocks = _resolve_includes(_parse_markdown(args.old.read_text(encoding="utf-8")),
+                                       args.old.parent, max_bytes)
+        new_blocks = _resolve_includes(_parse_markdown(args.new.read_text(encoding="utf-8")),
+                                       args.new.parent, max_bytes)
+    except OSError as exc:
+        print(f"Error: {exc.filename}: {exc.strerror}")
+        return 1
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+    old_version = _spec_version(old_blocks, args.old)
+    new_version = _spec_version(new_blocks, args.new)
+    title = next((b.text for b in new_blocks if b.type == "h1"), args.new.stem)
+
+    diff = _diff_specs(old_blocks, new_blocks)
+    md_path = args.output or args.new.parent / (
+        f"\uae30\ub2a5\uba85\uc138\uc11c_\ubcc0\uacbd\uc0ac\ud56d_v{old_version}_to_v{new_version}.md")
+    if md_path.exists() and not args.force:
+        print(f"Error: {md_path} exists (use -f to overwrite)")
+        return 1
+    md_text = _changelog_markdown(title, old_version, new_version, diff)
+    md_path.parent.mkdir(parents=True, exist_ok=True)
+    md_path.write_text(md_text, encoding="utf-8")
+    print(f"Created: {md_path}")
+    if not args.no_docx:
+        docx_path = md_path.with_suffix(".docx")
+        rules = _changelog_rules(old_version, new_version, diff)
+        _save_document(_build_document(md_text, rules=rules), str(docx_path))
+        print(f"Created: {docx_path}")
+    print(f"Sections +{len(diff['sections_added'])} -{len(diff['sections_removed'])} "
+          f"~{len(diff['sections_modified'])}, features +{len(diff['features_added'])} "
+          f"-{len(diff['features_removed'])} ~{len(diff['features_modified'])} "
+          f"({time.perf_counter() - t0:.2f}s)")
+    return 0
+
+
+def _index_main(argv):
+    """``index [INPUTS]``: add or refresh specs in the search index."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py index",
+        description="Build or incrementally update the full-text search index.")
+    parser.add_argument(
+        "inputs", nargs="*", default=[str(BASE_DIR / "docs")],
+        help="markdown files, directories or glob patterns (default: docs/)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_INDEX,
+                        help="index database (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    md_files = _expand_inputs(args.inputs)
+    missing = [str(f) for f in md_files if not f.is_file()]
+    if not md_files or missing:
+        print(f"Error: no such markdown file: {', '.join(missing) or ' '.join(args.inputs)}")
+        return 1
+    t0 = time.perf_counter()
+    index = SearchIndex(args.db)
+    try:
+        indexed, unchanged, removed, errors = index.update(md_files)
+    finally:
+        index.close()
+    for md_file, message in errors:
+        print(f"{md_file}: error: {message} (skipped)")
+    print(f"Indexed {indexed} file(s), {unchanged} unchanged, {removed} removed "
+          f"in {time.perf_counter() - t0:.2f}s ({args.db})")
+    return 1 if errors else 0
+
+
+def _search_main(argv):
+    """``search QUERY``: look a phrase up in the search index."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py search",
+        description="Search every indexed spec version (run 'index' first).")
+    parser.add_argument(
+        "query", nargs="+",
+        help="words that must all appear; Hangul matches anywhere, a Latin or digit "
+             "word at the start of a word")
+    parser.add_argument("--db", type=Path, default=DEFAULT_INDEX,
+                        help="index database (default: %(default)s)")
+    parser.add_argument("--version",
+                        help="only this spec version, e.g. 1.6 (a changelog: 1.5\u21921.6)")
+    parser.add_argument(
+        "--type", dest="block_type",
+        choices=("h1", "h2", "h3", "h4", "paragraph", "list_item", "table", "code"),
+        help="only this block type")
+    parser.add_argument("-n", "--limit", type=int, default=50,
+                        help="maximum number of hits (default: %(default)s)")
+    parser.add_argument("--json", action="store_true", help="print hits as JSON lines")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"Error: {args.db} not found (run 'md_to_docx.py index' first)")
         return 1
+    query = " ".join(args.query)
+    t0 = time.perf_counter()
+    index = SearchIndex(args.db)
+    try:
+        hits = index.search(query, args.version, args.block_type, args.limit)
+    finally:
+        index.close()
+    elapsed = time.perf_counter() - t0
+    word = query.lower().split()[0]
+    for hit in hits:
+        if args.json:
+            print(json.dumps(hit, ensure_ascii=False))
+            continue
+        where = f"v{hit['version']}"
+        if hit["section"]:
+            where += f" {hit['section']}"
+        kind = hit["type"] + (f" {hit['feature_id']}" if hit["feature_id"] else "")
+        print(f"{os.path.relpath(hit['path'])}:{hit['line']}: [{where}] {kind}: "
+              f"{_snippet(hit['text'], word)}")
+    if not args.json:
+        print(f"{len(hits)} hit(s) in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+def _features_main(argv):
+    """``features [INPUTS]``: query or export the feature registry."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py features",
+        description="Query the feature rows of every spec version (the registry is "
+                    "refreshed incrementally first).")
+    parser.add_argument(
+        "inputs", nargs="*", default=[str(BASE_DIR / "docs")],
+        help="markdown files, directories or glob patterns (default: docs/)")
+    parser.add_argument("--db", type=Path, default=DEFAULT_FEATURES,
+                        help="registry database (default: %(default)s)")
+    parser.add_argument("--version", help="only this spec version, e.g. 1.6")
+    parser.add_argument("--priority", help="only this priority, e.g. P0")
+    parser.add_argument("--phase", help="only this implementation phase")
+    parser.add_argument("--id", dest="feature_id", help="only this feature ID")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--changed", choices=_FEATURE_FIELDS,
+                       help="features whose FIELD differs between --from and --to")
+    query.add_argument("--count-by", choices=_FEATURE_FIELDS,
+                       help="feature count per version and FIELD value")
+    parser.add_argument("--from", dest="from_version", help="old version for --changed")
+    parser.add_argument("--to", dest="to_version", help="new version for --changed")
+    parser.add_argument("--export", type=Path,
+                        help="write the result to a .csv or .xlsx file instead of printing")
+    args = parser.parse_args(argv)
+
+    if args.changed and not (args.from_version and args.to_version):
+        parser.error("--changed needs --from and --to")
+    md_files = _expand_inputs(args.inputs)
+    missing = [str(f) for f in md_files if not f.is_file()]
+    if not md_files or missing:
+        print(f"Error: no such markdown file: {', '.join(missing) or ' '.join(args.inputs)}")
+        return 1
+    registry = FeatureRegistry(args.db)
+    try:
+        for md_file, message in registry.update(md_files)[3]:
+            print(f"{md_file}: error: {message} (skipped)")
+        t0 = time.perf_counter()
+        if args.changed:
+            header, rows = registry.changed(args.changed, args.from_version,
+                                            args.to_version, args.priority)
+        elif args.count_by:
+            header, rows = registry.count_by(args.count_by)
+        else:
+            header, rows = registry.select(args.version, args.priority, args.phase,
+                                           args.feature_id)
+        if args.export:
+            args.export.parent.mkdir(parents=True, exist_ok=True)
+            n = _export_rows(args.export, header, rows)
+            elapsed = time.perf_counter() - t0
+        else:
+            rows = list(rows)
+            elapsed = time.perf_counter() - t0
+            n = _print_rows(header, rows)
+    finally:
+        registry.close()
+    target = f" to {args.export}" if args.export else ""
+    print(f"{n} row(s){target} in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+def _lint_main(argv):
+    """``lint [INPUTS]``: structure and feature checks, without python-docx."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py lint",
+        description="Check specs for problems that would only show in the docx: "
+                    "structure (as --check), feature table widths, duplicate feature "
+                    "IDs and references to undefined IDs. Fast enough for a pre-commit hook.")
+    parser.add_argument(
+        "inputs", nargs="*", default=[str(BASE_DIR / "docs")],
+        help="markdown files, directories or glob patterns (default: docs/)")
+    parser.add_argument("--rules", type=Path, default=None,
+                        help="JSON render rules (as for a build)")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    parser.add_argument("-q", "--quiet", action="store_true", help="report errors only")
+    args = parser.parse_args(argv)
+
+    try:
+        rules = _load_rules(str(args.rules) if args.rules is not None else None)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+    t0 = time.perf_counter()
+    md_files = _expand_inputs(args.inputs)
+    counts = {"error": 0, "warning": 0}
+    for md_file in md_files:
+        try:
+            md_text = md_file.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as exc:
+            print(f"{md_file}:1: error: {getattr(exc, 'strerror', None) or exc}")
+            counts["error"] += 1
+            continue
+        blocks = _parse_markdown(md_text)
+        problems = sorted(_check_structure(md_text, blocks, rules, md_file.parent)
+                          + _lint_features(blocks, rules))
+        for line, severity, message in problems:
+            counts[severity] += 1
+            if severity == "error" or not args.quiet:
+                print(f"{md_file}:{line}: {severity}: {message}")
+    if not args.quiet:
+        print(f"{len(md_files)} file(s): {counts['error']} error(s), "
+              f"{counts['warning']} warning(s) in {(time.perf_counter() - t0) * 1000:.0f} ms")
+    return 1 if counts["error"] or (args.strict and counts["warning"]) else 0
+
+
+def _serve_main(argv):
+    """``serve``: run the HTTP render service until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="md_to_docx.py serve",
+        description="Render markdown POSTed to /render into .docx, with an output cache, "
+                    "coalescing of identical requests and counters at /stats.")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8765, help="port (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="build processes (default: CPU count)")
+    parser.add_argument("--cache-mb", type=int, default=256,
+                        help="rendered output kept in memory (default: %(default)s MB)")
+    parser.add_argument("--max-body-mb", type=int, default=16,
+                        help="largest accepted request body (default: %(default)s MB)")
+    parser.add_argument("--rules", type=Path, default=None,
+                        help="JSON render rules (as for a build)")
+    args = parser.parse_args(argv)
+
+    try:
+        rules = _load_rules(str(args.rules) if args.rules is not None else None)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+    import asyncio
+
+    try:
+        asyncio.run(_serve(args.host, args.port, max(1, args.jobs), args.cache_mb << 20,
+                           args.max_body_mb << 20, rules))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# Subcommands, dispatched on the first argument; anything else is a build
+_SUBCOMMANDS = {
+    "diff": _diff_main,
+    "index": _index_main,
+    "search": _search_main,
+    "features": _features_main,
+    "lint": _lint_main,
+    "serve": _serve_main,
+}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in _SUBCOMMANDS:
+        return _SUBCOMMANDS[argv[0]](argv[1:])
+    args = _build_arg_parser().parse_args(argv)
+
+    md_files = _expand_inputs(args.inputs) if args.inputs else [DEFAULT_MD]
+    if not md_files:
+        print("Error: no markdown files matched")
+        return 1
+    try:
+        rules = _load_rules(str(args.rules) if args.rules is not None else None)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 1
+    if args.check:
+        return _check_main(md_files, rules)
+    if args.out_dir is not None:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs_list = []
+    for md_file in md_files:
+        out_dir = args.out_dir if args.out_dir is not None else md_file.parent
+        jobs_list.append((md_file, out_dir / (md_file.stem + ".docx")))
+
+    if args.profile is not None:
+        return _profile_main(args, jobs_list, rules)
+    if args.watch:
+        return _watch(jobs_list, None if args.no_cache else args.cache_dir, args.backend,
+                      args.poll_interval, args.debounce, rules, args.export_ir)
+
+    t0 = time.perf_counter()
+    manifest = BuildManifest(args.manifest)
+    options = {"backend": args.backend, "rules": rules.digest}
+    if args.export_ir is not None:
+        options["export_ir"] = str(args.export_ir.resolve())
+    keys = {}
+    todo = []
+    for md_file, docx_file in jobs_list:
+        try:
+            md_bytes = md_file.read_bytes()
+            includes = _include_stamps(md_bytes.decode("utf-8", errors="replace"),
+                                       md_file.parent)
+            keys[docx_file] = BuildManifest.build_key(md_bytes, options, includes)
+        except OSError:
+            pass  # _convert_file reports the missing input
+        else:
+            # A deleted IR export needs a rebuild even if the docx is current
+            if (not args.force and manifest.is_current(docx_file, keys[docx_file])
+                    and (args.export_ir is None or _ir_exported(args.export_ir, md_file))):
+                print(f"Up to date: {docx_file}")
+                continue
+        todo.append((md_file, docx_file))
+
+    worst = 0
+    failed = 0
+    cache_dir = None if args.no_cache else args.cache_dir
+    results = _run_batch(todo, args.jobs, cache_dir, args.backend, args.section_jobs, rules,
+                         args.export_ir)
+    for md_file, docx_file, code, elapsed, message in results:
+        worst = max(worst, code)
+        if code == 0:
+            manifest.record(md_file, docx_file, keys[docx_file], options)
+            print(f"Created: {docx_file} ({message}, {elapsed:.2f}s)")
+        else:
+            failed += 1
+            print(f"Error: {md_file}: {message} (exit {code})")
+    if todo:
+        manifest.save()
+    if args.export_ir is not None:
+        _write_ir_index(args.export_ir, md_files)
+
+    if len(jobs_list) > 1:
+        print(f"Converted {len(todo) - failed}/{len(todo)} files "
+              f"({len(jobs_list) - len(todo)} up to date) in {time.perf_counter() - t0:.2f}s")
+    return worst
 
 
 if __name__ == "__main__":
@@ -0,0 +1,366 @@
+"""Tests for scripts/md_to_docx.py (run with pytest)."""
+
+import asyncio
+import io
+import json
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import md_to_docx  # noqa: E402
+
+
+def _render_json(payload):
+    """POST /render with a JSON body, without a build pool (none is reached)."""
+    service = md_to_docx.RenderService(pool=None)
+    status, _, body, _ = asyncio.run(md_to_docx._serve_request(
+        service, "POST", "/render", {"content-type": "application/json"},
+        json.dumps(payload).encode("utf-8")))
+    return status, body.decode("utf-8")
+
+
+@pytest.mark.parametrize("cover", [
+    {"metadata": 5},
+    {"metadata": [["버전"], ["대상", "x", "y"]]},
+    {"metadata": ["ab", "cd"]},
+    {"title": 3},
+    {"version": "1.6"},
+    ["metadata"],
+])
+def test_render_rejects_bad_cover_with_400(cover):
+    status, body = _render_json({"markdown": "# T\n", "cover": cover})
+    assert status == 400
+    assert "cover" in body
+
+
+def test_convert_rejects_bad_cover_with_value_error():
+    with pytest.raises(ValueError, match="metadata"):
+        md_to_docx.convert("# T\n", cover={"metadata": 5})
+
+
+def test_cover_options_accepts_dict_and_pairs():
+    assert md_to_docx._cover_options({"metadata": {"버전": 1.6}}) == {
+        "metadata": {"버전": "1.6"}}
+    assert md_to_docx._cover_options({"title": "T", "metadata": [("a", "b")]}) == {
+        "title": "T", "metadata": [["a", "b"]]}
+
+
+SPEC_MD = """# 플랫폼 기능명세서
+
+| 항목 | 내용 |
+|------|------|
+| 버전 | 1.5 |
+
+## 1. 개요
+
+GPU 자원 관리와 우선순위 정책.
+
+| ID | 기능명 | 설명 | 우선순위 | 구현단계 |
+|----|--------|------|----------|----------|
+| F-001 | 자원 관리 | GPU 할당 | P0 | 1단계 |
+"""
+
+CHANGELOG_MD = """# 플랫폼 기능명세서 변경사항 (v1.5 → v1.6)
+
+## 1. 변경 개요
+
+GPU 할당 우선순위 변경.
+"""
+
+
+def _write_specs(tmp_path):
+    spec = tmp_path / "플랫폼_기능명세서_v1_5.md"
+    spec.write_text(SPEC_MD, encoding="utf-8")
+    changelog = tmp_path / "기능명세서_변경사항_v1.5_to_v1.6.md"
+    changelog.write_text(CHANGELOG_MD, encoding="utf-8")
+    return spec, changelog
+
+
+def test_index_keys_changelog_apart_from_spec_versions(tmp_path):
+    spec, changelog = _write_specs(tmp_path)
+    index = md_to_docx.SearchIndex(tmp_path / "search.sqlite")
+    try:
+        assert index.update([spec, changelog])[0] == 2
+        hits = index.search("GPU")
+        assert {(Path(h["path"]).name, h["version"]) for h in hits} == {
+            (spec.name, "1.5"), (changelog.name, "1.5→1.6")}
+        assert {Path(h["path"]).name for h in index.search("GPU", version="1.5")} == {
+            spec.name}
+    finally:
+        index.close()
+
+
+def test_feature_registry_skips_changelogs(tmp_path):
+    spec, changelog = _write_specs(tmp_path)
+    registry = md_to_docx.FeatureRegistry(tmp_path / "features.sqlite")
+    try:
+        registry.update([spec, changelog])
+        _, rows = registry.select()
+        assert [(r[0], r[1]) for r in rows] == [("F-001", "1.5")]
+    finally:
+        registry.close()
+
+
+def _diff(old_md, new_md):
+    return md_to_docx._diff_specs(md_to_docx._parse_markdown(old_md),
+                                  md_to_docx._parse_markdown(new_md))
+
+
+def test_diff_ignores_renumbered_sections_and_subsections():
+    diff = _diff("## 4. 학습\n\n### 4.1 파라미터\n\n본문\n",
+                 "## 5. 학습\n\n### 5.1 파라미터\n\n본문\n")
+    assert not any(diff[k] for k in ("sections_added", "sections_removed", "sections_modified"))
+
+
+def test_diff_lists_subsection_renumbers_apart_from_additions():
+    diff = _diff("## 4. 학습\n\n### 4.1 흐름\n\n### 4.2 RL 파라미터\n\n본문\n",
+                 "## 4. 학습\n\n### 4.1 흐름\n\n### 4.2 사전 테스트\n\n"
+                 "### 4.3 RL 파라미터\n\n본문\n")
+    [sec] = diff["sections_modified"]
+    assert sec["subsections_added"] == ["4.2 사전 테스트"]
+    assert sec["subsections_removed"] == []
+    assert sec["subsections_renumbered"] == [("4.2 RL 파라미터", "4.3 RL 파라미터")]
+    assert (sec["blocks_added"], sec["blocks_removed"]) == (1, 0)
+
+
+def test_search_matches_latin_prefixes_and_hangul_substrings(tmp_path):
+    spec, _ = _write_specs(tmp_path)
+    index = md_to_docx.SearchIndex(tmp_path / "search.sqlite")
+    try:
+        index.update([spec])
+        assert index.search("gp")
+        assert index.search("GPU 우선순")
+        assert index.search("선순위")
+        assert not index.search("pu")
+        assert not index.search("GPU 삭제")
+    finally:
+        index.close()
+
+
+def test_changelog_pipe_cells_round_trip():
+    row = "## 1. 기능\n\n| ID | 기능명 | 설명 | 우선순위 | 구현단계 |\n|----|----|----|----|----|\n"
+    diff = _diff(row + "| F-001 | 관리 | 조회 \\| 다운로드 | P0 | 1단계 |\n",
+                 row + "| F-001 | 관리 | 조회 \\| 삭제 | P0 | 1단계 |\n")
+    md = md_to_docx._changelog_markdown("T", "1.0", "1.1", diff)
+    [table] = [b for b in md_to_docx._parse_markdown(md)
+               if b.type == "table" and b.row(0)[0] == "ID"]
+    assert table.rows == [["ID", "항목", "변경 전", "변경 후"],
+                          ["F-001", "설명", "조회 | 다운로드", "조회 | 삭제"]]
+
+
+PARSER_MD = """# 제목
+
+첫 줄
+둘째 줄
+- 항목 하나
+## 1. 개요
+
+| A | B |
+|---|---|
+| 1 | 2 | 3 |
+
+---
+```python
+x = 1
+```
+#### 세부
+```
+열린 펜스
+"""
+
+
+def test_parse_markdown_blocks_and_line_ranges():
+    blocks = md_to_docx._parse_markdown(PARSER_MD)
+    assert [(b.type, b.start, b.end) for b in blocks] == [
+        ("h1", 1, 1), ("paragraph", 3, 4), ("list_item", 5, 5), ("h2", 6, 6),
+        ("table", 8, 10), ("hr", 12, 12), ("code", 13, 15), ("h4", 16, 16),
+        ("code", 17, 19)]
+    assert [b.to_dict() for b in blocks] == [
+        {"type": "h1", "text": "제목"},
+        {"type": "paragraph", "text": "첫 줄 둘째 줄"},
+        {"type": "list_item", "text": "항목 하나"},
+        {"type": "h2", "text": "1. 개요"},
+        {"type": "table", "rows": [["A", "B"], ["1", "2", "3"]]},
+        {"type": "hr"},
+        {"type": "code", "lang": "python", "text": "x = 1"},
+        {"type": "h4", "text": "세부"},
+        {"type": "code", "lang": "", "text": "열린 펜스\n"},
+    ]
+
+
+def test_parse_markdown_table_rows_are_ragged_views():
+    [table] = [b for b in md_to_docx._parse_markdown(PARSER_MD) if b.type == "table"]
+    assert table.nrows == 2
+    assert table.row_ends == (2, 5)
+    assert table.row(1) == ["1", "2", "3"]
+
+
+def test_lint_reports_duplicate_and_undefined_feature_ids():
+    # Two-letter prefixes: TR-01 is a feature ID, UTF-8 is not
+    md = SPEC_MD.replace("F-001", "TR-01") + (
+        "| TR-01 | 중복 | 설명 | P1 | 2단계 |\n\n"
+        "TR-02 기능과 연동하며 TR-01 결과를 UTF-8 로 저장한다.\n")
+    blocks = md_to_docx._parse_markdown(md)
+    assert md_to_docx._lint_features(blocks) == [
+        (14, "error", "duplicate feature ID TR-01 (first defined on line 13)"),
+        (16, "warning", "reference to undefined feature ID TR-02"),
+    ]
+
+
+def test_lint_flags_wide_feature_table_and_ragged_rows():
+    md = ("## 1. 기능\n\n| ID | 기능명 | 설명 | 우선순위 | 구현단계 | 비고 |\n"
+          "|----|----|----|----|----|----|\n| F-001 | 관리 | 설명 | P0 | 1단계 |\n")
+    blocks = md_to_docx._parse_markdown(md)
+    assert md_to_docx._lint_features(blocks) == [
+        (3, "error", "feature table has 6 columns; columns after 5 are dropped")]
+    assert md_to_docx._check_structure(md, blocks) == [
+        (1, "warning", "no '# ' title for the cover page"),
+        (5, "error", "table row has 5 cells, header has 6")]
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_content_column_widths(monkeypatch, numpy):
+    if not numpy:
+        monkeypatch.setattr(md_to_docx, "_numpy", lambda: None)
+    assert list(md_to_docx._display_widths(["ab", "가나", "**", "a가"])) == [2, 4, 2, 3]
+    rows = [["ID", "설명"], ["1", "**긴** 설명 텍스트가 들어가는 칸"]]
+    widths = md_to_docx._content_column_widths(rows)
+    assert sum(widths) == 9360
+    assert widths[1] > widths[0] >= md_to_docx._MIN_COL_TWIPS
+    # Too wide to fit: headers stay unbroken, the long column takes the rest
+    rows = [["번호", "내용"], ["1", "가" * 200]]
+    widths = md_to_docx._content_column_widths(rows)
+    assert sum(widths) == 9360
+    assert widths[0] >= 4 * md_to_docx._HALF_WIDTH_TWIPS + md_to_docx._CELL_PAD_TWIPS
+
+
+def test_export_ir_writes_section_chunks(tmp_path):
+    md_path = tmp_path / "플랫폼_기능명세서_v1_5.md"
+    blocks = md_to_docx._parse_markdown(SPEC_MD)
+    manifest = md_to_docx._export_ir(blocks, md_path, tmp_path / "ir")
+    spec_dir = tmp_path / "ir" / md_path.stem
+    assert manifest["version"] == "1.5"
+    assert [(s["file"], s["number"], s["heading"]) for s in manifest["sections"]] == [
+        ("s00.json", None, ""), ("s01.json", 1, "1. 개요")]
+    chunk = json.loads((spec_dir / "s01.json").read_bytes())
+    assert chunk[0] == {"type": "h2", "text": "1. 개요", "line": 7}
+    assert md_to_docx._ir_exported(tmp_path / "ir", md_path)
+    (spec_dir / "s01.json").unlink()
+    assert not md_to_docx._ir_exported(tmp_path / "ir", md_path)
+
+
+def test_feature_registry_changed_and_count_by(tmp_path):
+    old, _ = _write_specs(tmp_path)
+    new = tmp_path / "플랫폼_기능명세서_v1_6.md"
+    new.write_text(SPEC_MD.replace("| 1.5 |", "| 1.6 |").replace("| P0 |", "| P1 |"),
+                   encoding="utf-8")
+    registry = md_to_docx.FeatureRegistry(tmp_path / "features.sqlite")
+    try:
+        registry.update([old, new])
+        _, rows = registry.changed("priority", "1.5", "1.6")
+        assert [tuple(r[:4]) for r in rows] == [("F-001", "P1", "P0", "P1")]
+        header, rows = registry.count_by("priority")
+        assert header == ("version", "P0", "P1", "total")
+        assert rows == [("1.5", 1, 0, 1), ("1.6", 0, 1, 1)]
+        with pytest.raises(ValueError):
+            registry.count_by("version")
+    finally:
+        registry.close()
+
+
+INCLUDE_MD = "# T\n\n```json include=app_spec.json\n```\n"
+
+
+def test_convert_rejects_include_fence_without_base_dir():
+    with pytest.raises(ValueError, match="base_dir"):
+        md_to_docx.convert(INCLUDE_MD)
+
+
+def test_convert_reads_include_fence_from_base_dir(tmp_path):
+    (tmp_path / "app_spec.json").write_text('{"name": "demo-app"}', encoding="utf-8")
+    data = md_to_docx.convert(INCLUDE_MD, base_dir=tmp_path)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert "demo-app" in zf.read("word/document.xml").decode("utf-8")
+
+
+def test_render_rejects_include_fence_with_400():
+    status, body = _render_json({"markdown": INCLUDE_MD})
+    assert status == 400
+    assert "include" in body
+
+
+def test_index_update_replaces_and_drops_file_rows(tmp_path):
+    spec, changelog = _write_specs(tmp_path)
+    index = md_to_docx.SearchIndex(tmp_path / "search.sqlite")
+    try:
+        index.update([spec, changelog])
+        spec.write_text(SPEC_MD.replace("GPU", "NPU"), encoding="utf-8")
+        assert index.update([spec, changelog])[:3] == (1, 1, 0)
+        assert [Path(h["path"]).name for h in index.search("GPU")] == [changelog.name]
+        changelog.unlink()
+        assert index.update([spec])[:3] == (0, 1, 1)
+        assert not index.search("GPU")
+        assert not index.db.execute("SELECT COUNT(*) FROM postings WHERE entry_id NOT IN "
+                                    "(SELECT id FROM entries)").fetchone()[0]
+    finally:
+        index.close()
+
+
+class _Writer:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _serve_raw(raw, limit=1024):
+    """Status line of the first response to ``raw`` on one connection."""
+    async def run():
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(raw)
+        reader.feed_eof()
+        writer = _Writer()
+        await md_to_docx._serve_connection(
+            md_to_docx.RenderService(pool=None), 1 << 20, reader, writer)
+        return writer.data.split(b"\r\n", 1)[0].decode()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GET /stats HTTP/1.1\r\nHost: x\r\n\r\n", "200 OK"),
+    (b"GET /" + b"a" * 2000 + b" HTTP/1.1\r\n\r\n", "400 Bad Request"),
+    (b"GET /stats HTTP/1.1\r\nX-Big: " + b"a" * 2000 + b"\r\n\r\n",
+     "431 Request Header Fields Too Large"),
+    (b"GET /stats HTTP/1.1\r\n" + b"X-H: 1\r\n" * 101 + b"\r\n",
+     "431 Request Header Fields Too Large"),
+])
+def test_serve_limits_request_head(raw, status):
+    assert _serve_raw(raw) == f"HTTP/1.1 {status}"
+
+
+def test_profiler_records_only_its_own_thread():
+    import threading
+
+    expected = md_to_docx.convert(SPEC_MD)
+    original = md_to_docx._make_run
+    prof = md_to_docx.BuildProfiler()
+    results = []
+    with prof.instrument():
+        worker = threading.Thread(target=lambda: results.append(md_to_docx.convert(SPEC_MD)))
+        worker.start()
+        worker.join()
+        assert not prof.helpers and not prof.blocks
+        md_to_docx._build_document(SPEC_MD)
+    assert results == [expected]
+    assert prof.helpers["_make_run"]["calls"] > 0
+    assert md_to_docx._make_run is original